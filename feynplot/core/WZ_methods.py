@@ -1,12 +1,13 @@
 import numpy as np
 import math
 
-# 假设 cubic_bezier 和 bezier_tangent 定义在 feynplot.core.bezier 中
-from feynplot.core.bezier import cubic_bezier, bezier_tangent
+# 假设 cubic_bezier_with_tangents 定义在 feynplot.core.bezier 中
+from feynplot.core.bezier import cubic_bezier_with_tangents
 from feynplot.core.circle import oval_circle
+from feynplot.core.base_path import BasePath
 
 
-def generate_WZ_zigzag(line):
+def generate_WZ_zigzag(line, points: int = 2000):
     from feynplot.core.line import WMinusLine, WPlusLine, ZBosonLine
 
     if not isinstance(line, (WMinusLine, WPlusLine, ZBosonLine)):
@@ -24,7 +25,7 @@ def generate_WZ_zigzag(line):
     zigzag_amplitude = getattr(line, 'zigzag_amplitude', 0.2)
     zigzag_frequency = getattr(line, 'zigzag_frequency', 2.0)
     
-    num_bezier_points = 2000 
+    num_bezier_points = points
     
     A = np.array(start_point_coords)
     B = np.array(end_point_coords)
@@ -38,98 +39,88 @@ def generate_WZ_zigzag(line):
             getattr(line, 'b', 0.5), 
             points=num_bezier_points
         )
-        xs, ys = results[:, 0], results[:, 1]
+        # 椭圆路径：切线由 BasePath 通过相邻点差值近似
+        base_path = BasePath(results)
     else:
-        xs, ys = cubic_bezier(A, B, angle_out, angle_in, offset_ratio=bezier_offset, points=num_bezier_points)
-    
-    base_path = np.column_stack((xs, ys))
-
-
-    # --- 使用相邻点计算切线和法线 ---
-    # dx, dy 是相邻两点的差值，即切线向量
-    dxdt = np.diff(xs)
-    dydt = np.diff(ys)
-    
-    # 数组的长度会减1，为了保持长度一致，可以对最后一个点使用前一个点的切线
-    dxdt = np.append(dxdt, dxdt[-1])
-    dydt = np.append(dydt, dydt[-1])
+        # 贝塞尔路径直接给出采样点处的精确切线
+        xs, ys, dxdt, dydt = cubic_bezier_with_tangents(
+            A, B, angle_out, angle_in, offset_ratio=bezier_offset, points=num_bezier_points
+        )
+        base_path = BasePath(np.column_stack((xs, ys)), tangents=np.column_stack((dxdt, dydt)))
 
-    # 计算法线向量
-    tangent_len = np.sqrt(dxdt**2 + dydt**2)
-    tangent_len[tangent_len == 0] = 1e-10 
-    
-    nx = dydt / tangent_len
-    ny = -dxdt / tangent_len
-    
     # 计算弧长
-    seg_len = np.sqrt(np.diff(xs)**2 + np.diff(ys)**2)
-    arc_len = np.concatenate(([0], np.cumsum(seg_len)))
-    total_arc_length = arc_len[-1]
+    arc_len = base_path.cumulative_length
+    total_arc_length = base_path.length
 
     # ---- 自动微调频率以匹配自然闭合 ----
-    raw_n_cycles = getattr(line, 'zigzag_frequency', 2.0) * total_arc_length
-    n_half_cycles = round(raw_n_cycles * 2) 
-    if getattr(line, 'initial_phase', 0) == 0:
-        n_half_cycles += 1
-    if getattr(line, 'final_phase', 0) == 0:
-        n_half_cycles += 1
-    
-    if total_arc_length > 1e-6:
-        adjusted_frequency = (n_half_cycles / 2.0) / total_arc_length
-    else:
-        adjusted_frequency = 0.0
-
-    actual_zigzag_wavelength = 1.0 / adjusted_frequency if adjusted_frequency > 0 else total_arc_length
+    actual_zigzag_wavelength = wz_wavelength(
+        total_arc_length, zigzag_frequency,
+        getattr(line, 'initial_phase', 0), getattr(line, 'final_phase', 0),
+    )
     # ------------------------------------
     
     # 计算位移：波浪线（正弦）或折线（锯齿），默认波浪线
     use_wavy = getattr(line, 'wz_use_wavy', True)
     start_up = (getattr(line, 'initial_phase', 0) == 0)
-    displacement = np.zeros(num_bezier_points)
-    for i in range(num_bezier_points):
-        if use_wavy:
-            displacement[i] = find_wavy_y(zigzag_amplitude, actual_zigzag_wavelength, arc_len[i], start_up)
-        else:
-            displacement[i] = find_zigzag_y(zigzag_amplitude, actual_zigzag_wavelength, arc_len[i], start_up)
-
-    # 生成路径
-    xs_zigzag_path = xs + nx * displacement
-    ys_zigzag_path = ys + ny * displacement
-    zigzag_path = np.column_stack((xs_zigzag_path, ys_zigzag_path))
-    
+    if use_wavy:
+        displacement = wavy_displacement(arc_len, zigzag_amplitude, actual_zigzag_wavelength, start_up)
+    else:
+        displacement = zigzag_displacement(arc_len, zigzag_amplitude, actual_zigzag_wavelength, start_up)
+
+    # 生成路径：沿法线方向叠加位移
+    zigzag_path = BasePath(base_path.offset(displacement))
+
     return zigzag_path, base_path
 
 
+def wz_wavelength(total_arc_length, zigzag_frequency, initial_phase=0, final_phase=0):
+    """
+    微调 W/Z 线的波长，使整条线上的半周期数为整数并与起止相位相符（自然闭合）。
+    参数可以是标量，也可以是每条线一个值的数组（批量计算）。
+    """
+    total_arc_length = np.asarray(total_arc_length, dtype=float)
+    n_half_cycles = np.round(np.asarray(zigzag_frequency, dtype=float) * total_arc_length * 2)
+    n_half_cycles = n_half_cycles + (np.asarray(initial_phase) == 0) + (np.asarray(final_phase) == 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adjusted_frequency = np.where(total_arc_length > 1e-6, (n_half_cycles / 2.0) / total_arc_length, 0.0)
+        return np.where(adjusted_frequency > 0, 1.0 / adjusted_frequency, total_arc_length)
+
+
+def wavy_displacement(arc_len, amplitude, wavelength, start_up=True) -> np.ndarray:
+    """
+    正弦波浪线位移，对整条弧长数组一次计算。
+    amplitude、wavelength、start_up 可以是与 arc_len 广播的数组，用于多条线同时计算。
+    """
+    arc_len = np.asarray(arc_len, dtype=float)
+    amplitude = np.asarray(amplitude, dtype=float)
+    wavelength = np.asarray(wavelength, dtype=float)
+    phase_offset = np.where(start_up, 0.0, np.pi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = amplitude * np.sin(2 * np.pi * arc_len / wavelength + phase_offset)
+    return np.where((amplitude == 0) | (wavelength == 0), 0.0, y)
+
+
+def zigzag_displacement(arc_len, amplitude, wavelength, start_up=True) -> np.ndarray:
+    """
+    三角波（折线）位移，对整条弧长数组一次计算。
+    闭式表达 A·(1 - |mod(4x/λ + 1, 4) - 2|)：x=0 处为 0，x=λ/4 处达到 +A（start_up 为 False 时取反）。
+    参数的广播规则同 wavy_displacement。
+    """
+    arc_len = np.asarray(arc_len, dtype=float)
+    amplitude = np.asarray(amplitude, dtype=float)
+    wavelength = np.asarray(wavelength, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = amplitude * (1 - np.abs(np.mod(4 * arc_len / wavelength + 1, 4) - 2))
+    y = np.where(start_up, y, -y)
+    return np.where((amplitude == 0) | (wavelength == 0), 0.0, y)
+
+
 def find_wavy_y(amplitude: float, wavelength: float, x: float, start_up: bool = True) -> float:
-    """正弦波浪线位移。"""
-    if amplitude == 0 or wavelength == 0:
-        return 0.0
-    phase_offset = 0.0 if start_up else math.pi
-    return amplitude * math.sin(2 * math.pi * x / wavelength + phase_offset)
+    """正弦波浪线位移（单点版本）。"""
+    return float(wavy_displacement(x, amplitude, wavelength, start_up))
 
 
 def find_zigzag_y(amplitude: float, wavelength: float, x: float, start_up: bool = True) -> float:
-    #... (保持不变)
-    if amplitude == 0 or wavelength == 0:
-        return 0.0
-
-    current_phase = math.fmod(x / wavelength, 1.0)
-    
-    if start_up:
-        if current_phase < 0.25:
-            return amplitude * (current_phase * 4)
-        elif current_phase < 0.5:
-            return amplitude * (1 - (current_phase - 0.25) * 4)
-        elif current_phase < 0.75:
-            return -amplitude * ((current_phase - 0.5) * 4)
-        else:
-            return -amplitude * (1 - (current_phase - 0.75) * 4)
-    else: # start_down
-        if current_phase < 0.25:
-            return -amplitude * (current_phase * 4)
-        elif current_phase < 0.5:
-            return -amplitude * (1 - (current_phase - 0.25) * 4)
-        elif current_phase < 0.75:
-            return amplitude * ((current_phase - 0.5) * 4)
-        else:
-            return amplitude * (1 - (current_phase - 0.75) * 4)
\ No newline at end of file
+    """三角波（折线）位移（单点版本）。"""
+    return float(zigzag_displacement(x, amplitude, wavelength, start_up))
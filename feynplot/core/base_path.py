@@ -0,0 +1,299 @@
+from functools import cached_property
+from typing import Optional, Tuple
+
+import numpy as np
+from matplotlib.path import Path
+
+from feynplot.core.bezier import (
+    bezier_arc_length_samples, bezier_length_table, bezier_parameter_at_length,
+    bezier_eval, bezier_derivative, bezier_bbox, bezier_closest_point,
+)
+
+
+class BasePath:
+    """
+    一条折线路径 (N, 2) 及其按需计算、计算后缓存的几何量：
+    累积弧长、单位切线、法线与包围盒，以及按弧长取点的查询。
+
+    生成函数返回 BasePath 并由几何缓存保存，因此同一条线在几何不变时
+    这些量只计算一次。BasePath 支持 path[:, 0]、len(path)、np.asarray(path)
+    等数组式用法，可以直接替代原来的 (N, 2) 数组。
+    """
+
+    def __init__(self, points, tangents: Optional[np.ndarray] = None,
+                 cumulative_length: Optional[np.ndarray] = None):
+        """
+        参数:
+            points: 路径点 (N, 2)。
+            tangents: 可选，各点处的精确切向量（不要求单位长度），例如贝塞尔曲线的 dB/dt；
+                      未提供时由相邻点差分得到。
+            cumulative_length: 可选，已知的累积弧长 (N,)，用于子路径复用父路径的结果。
+        """
+        points = np.array(points, dtype=float).reshape(-1, 2)
+        points.setflags(write=False)
+        self.points = points
+        self._raw_tangents = None if tangents is None else np.asarray(tangents, dtype=float).reshape(-1, 2)
+        if cumulative_length is not None:
+            self.__dict__['cumulative_length'] = _readonly(cumulative_length)
+
+    def __setstate__(self, state):
+        # 从进程池等处反序列化时数组会变为可写，恢复只读标记
+        self.__dict__.update(state)
+        for value in self.__dict__.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+
+    # --- 数组式访问 ---
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, item):
+        return self.points[item]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.points if dtype is None else self.points.astype(dtype)
+
+    def __repr__(self):
+        return f"BasePath(n_points={len(self.points)}, length={self.length:.4g})"
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.points.shape
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.points[:, 0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.points[:, 1]
+
+    # --- 按需计算的几何量 ---
+    @cached_property
+    def segment_lengths(self) -> np.ndarray:
+        """相邻两点之间的线段长度 (N-1,)。"""
+        seg = np.diff(self.points, axis=0)
+        return _readonly(np.sqrt(seg[:, 0]**2 + seg[:, 1]**2))
+
+    @cached_property
+    def cumulative_length(self) -> np.ndarray:
+        """各点到起点的弧长 (N,)，cumulative_length[0] = 0。"""
+        return _readonly(np.concatenate(([0.0], np.cumsum(self.segment_lengths))))
+
+    @property
+    def length(self) -> float:
+        """路径总长。"""
+        return float(self.cumulative_length[-1]) if len(self.points) else 0.0
+
+    @cached_property
+    def tangents(self) -> np.ndarray:
+        """各点处的单位切线 (N, 2)；长度为零处为零向量。"""
+        if self._raw_tangents is not None:
+            t = self._raw_tangents
+        elif len(self.points) < 2:
+            t = np.zeros_like(self.points)
+        else:
+            t = np.gradient(self.points, axis=0)
+        norm = np.sqrt(t[:, 0]**2 + t[:, 1]**2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            unit = np.where(norm[:, None] > 0, t / norm[:, None], 0.0)
+        return _readonly(unit)
+
+    @cached_property
+    def normals(self) -> np.ndarray:
+        """各点处的单位法线 (N, 2)：切线顺时针旋转 90 度。"""
+        t = self.tangents
+        return _readonly(np.column_stack((t[:, 1], -t[:, 0])))
+
+    @cached_property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """包围盒 (xmin, ymin, xmax, ymax)。"""
+        mins = self.points.min(axis=0)
+        maxs = self.points.max(axis=0)
+        return float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1])
+
+    # --- 查询 ---
+    def _locate(self, s):
+        """返回弧长 s 所在线段的索引 j（线段 j-1 → j）与段内插值权重。"""
+        cum = self.cumulative_length
+        s = np.clip(np.asarray(s, dtype=float), 0.0, cum[-1])
+        j = np.clip(np.searchsorted(cum, s, side='right'), 1, len(cum) - 1)
+        seg_len = cum[j] - cum[j - 1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = np.where(seg_len > 0, (s - cum[j - 1]) / seg_len, 0.0)
+        return j, w
+
+    def point_at_length(self, s):
+        """弧长 s 处的点；s 可以是标量或数组，超出 [0, length] 时取端点。"""
+        if len(self.points) < 2:
+            return self.points[0].copy()
+        j, w = self._locate(s)
+        p0 = self.points[j - 1]
+        p1 = self.points[j]
+        return p0 + np.asarray(w)[..., None] * (p1 - p0)
+
+    def point_at_fraction(self, fraction):
+        """弧长比例 fraction（0~1）处的点。"""
+        return self.point_at_length(np.asarray(fraction, dtype=float) * self.length)
+
+    def tangent_at_length(self, s):
+        """弧长 s 处所在线段的单位方向向量。"""
+        if len(self.points) < 2:
+            return np.zeros(2)
+        j, _ = self._locate(s)
+        seg = self.points[j] - self.points[j - 1]
+        seg_len = self.segment_lengths[j - 1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(np.asarray(seg_len)[..., None] > 0, seg / np.asarray(seg_len)[..., None], 0.0)
+
+    def distance_to(self, point) -> float:
+        """点到折线的最短距离。"""
+        point = np.asarray(point, dtype=float)
+        if len(self.points) < 2:
+            return float(np.linalg.norm(self.points[0] - point)) if len(self.points) else float('inf')
+        p0 = self.points[:-1]
+        seg = self.points[1:] - p0
+        seg_len_sq = np.sum(seg**2, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = np.where(seg_len_sq > 0, np.sum((point - p0) * seg, axis=1) / seg_len_sq, 0.0)
+        closest = p0 + np.clip(w, 0.0, 1.0)[:, None] * seg
+        return float(np.sqrt(np.min(np.sum((closest - point)**2, axis=1))))
+
+    def circle_intersection(self, center, radius, from_end=False):
+        """
+        折线与圆 |p - center| = radius 的交点：从起点（from_end 为 True 时从终点）出发，
+        第一次到达圆周所在的线段上解二次方程得到精确交点。
+        返回 (pos, point)，pos 为交点在采样序列中的小数索引，可直接用于 between()；没有交点时返回 None。
+        """
+        n = len(self.points)
+        if n < 2 or radius <= 0:
+            return None
+        points = self.points[::-1] if from_end else self.points
+        center = np.asarray(center, dtype=float)
+        rel = points - center
+        outside = np.sum(rel**2, axis=1) >= float(radius) ** 2
+        if outside[0] or not outside.any():
+            return None
+        j = int(np.argmax(outside))
+        # |rel[j-1] + u·seg|² = r²，rel[j-1] 在圆内，u ∈ (0, 1] 内只有一个根
+        seg = points[j] - points[j - 1]
+        a = float(seg @ seg)
+        b = 2.0 * float(rel[j - 1] @ seg)
+        c = float(rel[j - 1] @ rel[j - 1]) - float(radius) ** 2
+        u = min(1.0, (-b + np.sqrt(max(b * b - 4.0 * a * c, 0.0))) / (2.0 * a))
+        pos = j - 1 + u
+        point = points[j - 1] + u * seg
+        return (n - 1 - pos if from_end else pos), point
+
+    def offset(self, displacement) -> np.ndarray:
+        """沿法线方向平移各点：points + normals * displacement，返回 (N, 2) 数组。"""
+        return self.points + self.normals * np.asarray(displacement, dtype=float)[:, None]
+
+    def sub_path(self, start: int, stop: int) -> "BasePath":
+        """取索引 [start, stop] 的子路径，复用已计算的弧长与切线。"""
+        sub = BasePath(
+            self.points[start:stop + 1],
+            tangents=None if self._raw_tangents is None else self._raw_tangents[start:stop + 1],
+        )
+        if 'cumulative_length' in self.__dict__:
+            cum = self.cumulative_length[start:stop + 1]
+            sub.__dict__['cumulative_length'] = _readonly(cum - cum[0])
+        return sub
+
+    def between(self, start: float, stop: float, start_point=None, stop_point=None) -> "BasePath":
+        """
+        取小数索引 [start, stop] 之间的子路径：中间保留原采样点，两端为线性插值点，
+        或调用方给出的精确端点（例如曲线与圆的解析交点）。
+        """
+        n = len(self.points)
+        if n < 2:
+            return BasePath(self.points, tangents=self._raw_tangents)
+        start = float(np.clip(start, 0, n - 1))
+        stop = float(np.clip(stop, start, n - 1))
+        inner = slice(int(np.floor(start)) + 1, max(int(np.ceil(stop)), int(np.floor(start)) + 1))
+
+        def interpolate(array, position):
+            j = min(int(position), n - 2)
+            return array[j] + (position - j) * (array[j + 1] - array[j])
+
+        first = interpolate(self.points, start) if start_point is None else np.asarray(start_point, dtype=float)
+        last = interpolate(self.points, stop) if stop_point is None else np.asarray(stop_point, dtype=float)
+        tangents = None
+        if self._raw_tangents is not None:
+            tangents = np.vstack((interpolate(self._raw_tangents, start), self._raw_tangents[inner],
+                                  interpolate(self._raw_tangents, stop)))
+        return BasePath(np.vstack((first, self.points[inner], last)), tangents=tangents)
+
+    def translated(self, offset) -> "BasePath":
+        """平移 offset 后的路径；弧长、切线与法线不随平移改变，已计算的结果直接复用。"""
+        path = BasePath(self.points + np.asarray(offset, dtype=float), tangents=self._raw_tangents)
+        for name in ('segment_lengths', 'cumulative_length', 'tangents', 'normals'):
+            if name in self.__dict__:
+                path.__dict__[name] = self.__dict__[name]
+        return path
+
+
+class BezierPath(BasePath):
+    """
+    单条三次贝塞尔曲线。除弧长等距的采样点外还保存 4 个控制点：
+    长度、按弧长取点、切线、包围盒和点到曲线的距离都由控制点解析计算，
+    绘制时可直接输出带 CURVE4 指令的 matplotlib.path.Path，不必交给 Matplotlib 一串折线点。
+    """
+
+    _CODES = np.array([Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.CURVE4], dtype=Path.code_type)
+
+    def __init__(self, control_points, points: int = 2000,
+                 positions: Optional[np.ndarray] = None, tangents: Optional[np.ndarray] = None):
+        """
+        参数:
+            control_points: 控制点 (4, 2)。
+            points: 采样点数（未给出 positions 时按弧长等距采样）。
+            positions, tangents: 可选，已经算好的采样点与切向量（例如批量生成的结果）。
+        """
+        control_points = _readonly(np.array(control_points, dtype=float).reshape(4, 2))
+        if positions is None:
+            positions, tangents = bezier_arc_length_samples(control_points, points)
+        super().__init__(positions, tangents=tangents)
+        self.control_points = control_points
+
+    def __repr__(self):
+        return f"BezierPath(n_points={len(self.points)}, length={self.length:.4g})"
+
+    @cached_property
+    def length(self) -> float:
+        """曲线的精确弧长。"""
+        return float(bezier_length_table(self.control_points)[1][-1])
+
+    @cached_property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """曲线的精确包围盒 (xmin, ymin, xmax, ymax)。"""
+        return bezier_bbox(self.control_points)
+
+    def point_at_length(self, s):
+        """弧长 s 处曲线上的点（解析反查参数 t）。"""
+        t = bezier_parameter_at_length(self.control_points, s)
+        points = bezier_eval(self.control_points, t)
+        return points if np.ndim(s) else points[0]
+
+    def tangent_at_length(self, s):
+        """弧长 s 处的单位切线。"""
+        t = bezier_parameter_at_length(self.control_points, s)
+        d = bezier_derivative(self.control_points, t)
+        norm = np.linalg.norm(d, axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            unit = np.where(norm > 0, d / norm, 0.0)
+        return unit if np.ndim(s) else unit[0]
+
+    def distance_to(self, point) -> float:
+        """点到曲线的精确最短距离。"""
+        return bezier_closest_point(self.control_points, point)[1]
+
+    def to_mpl_path(self) -> Path:
+        """MOVETO + 3 个 CURVE4 控制点组成的 Matplotlib 路径。"""
+        return Path(self.control_points, self._CODES)
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,211 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feynplot.core.base_path import BasePath, BezierPath
+from feynplot.core.bezier import bezier_control_points, bezier_arc_length_samples
+from feynplot.core.photon_methods import generate_photon_wave, photon_wave_displacement
+from feynplot.core.WZ_methods import generate_WZ_zigzag, wz_wavelength, wavy_displacement, zigzag_displacement
+from feynplot.core.fermion_methods import generate_fermion_line
+from feynplot.core.gluon_methods import (
+    generate_gluon_helix, gluon_helix_template, gluon_helix_template_key, place_helix_template, helix_template_cache
+)
+from feynplot.core.geometry_cache import GeometryCache, geometry_cache, geometry_cache_key, current_line_geometry
+from feynplot.core.geometry_executor import GeometryExecutor, geometry_executor
+
+# 批量生成：同一风格、同一采样点数的多条（非自环）线一次性计算，
+# 结果为 (n_lines, n_points, 2) 的数组；每条线的参数（端点、角度、振幅、波长等）组成 (n_lines,) 数组。
+# 逐条计算与批量计算使用相同的公式，结果与单条生成函数一致。
+
+
+def _line_attribute_array(lines: Sequence, name: str, default: float) -> np.ndarray:
+    """把每条线的某个属性收集为 (n_lines,) 的浮点数组。"""
+    return np.array([getattr(line, name, default) for line in lines], dtype=float)
+
+
+def batch_control_points(lines: Sequence, relative: bool = False) -> np.ndarray:
+    """所有线的贝塞尔控制点 (n_lines, 4, 2)；relative 为 True 时以各线起点为原点。"""
+    starts = np.array([(line.v_start.x, line.v_start.y) for line in lines], dtype=float).reshape(-1, 2)
+    ends = np.array([(line.v_end.x, line.v_end.y) for line in lines], dtype=float).reshape(-1, 2)
+    if relative:
+        starts, ends = np.zeros_like(starts), ends - starts
+    return bezier_control_points(
+        starts, ends,
+        _line_attribute_array(lines, 'angleOut', 0.0),
+        _line_attribute_array(lines, 'angleIn', 0.0),
+        _line_attribute_array(lines, 'bezier_offset', 0.0),
+    )
+
+
+def _unit_normals(tangents: np.ndarray) -> np.ndarray:
+    """(..., N, 2) 切向量对应的单位法线（切线顺时针旋转 90 度），长度为零处为零向量。"""
+    norm = np.sqrt(tangents[..., 0]**2 + tangents[..., 1]**2)[..., None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        unit = np.where(norm > 0, tangents / norm, 0.0)
+    return np.stack((unit[..., 1], -unit[..., 0]), axis=-1)
+
+
+def _cumulative_length(positions: np.ndarray) -> np.ndarray:
+    """(..., N, 2) 路径的累积弧长 (..., N)。"""
+    seg = np.diff(positions, axis=-2)
+    seg_len = np.sqrt(seg[..., 0]**2 + seg[..., 1]**2)
+    return np.concatenate((np.zeros(seg_len.shape[:-1] + (1,)), np.cumsum(seg_len, axis=-1)), axis=-1)
+
+
+def batch_fermion_lines(lines: Sequence, points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量生成费米子线（贝塞尔曲线）。
+
+    返回:
+        (positions, tangents)：弧长等间距的坐标与精确切向量，均为 (n_lines, points, 2)。
+    """
+    return bezier_arc_length_samples(batch_control_points(lines), points)
+
+
+def batch_photon_waves(lines: Sequence, points: int = 2000) -> np.ndarray:
+    """批量生成光子波浪线，返回 (n_lines, points, 2)。"""
+    positions, tangents = bezier_arc_length_samples(batch_control_points(lines), points)
+    displacement = photon_wave_displacement(
+        _cumulative_length(positions),
+        _line_attribute_array(lines, 'amplitude', 0.1)[:, None],
+        _line_attribute_array(lines, 'wavelength', 0.5)[:, None],
+        _line_attribute_array(lines, 'initial_phase', 0)[:, None],
+        _line_attribute_array(lines, 'final_phase', 0)[:, None],
+    )
+    return positions + _unit_normals(tangents) * displacement[..., None]
+
+
+def batch_WZ_zigzags(lines: Sequence, points: int = 2000) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量生成 W/Z 线。
+
+    返回:
+        (zigzag, base, base_tangents)：波浪/折线坐标、基础贝塞尔曲线坐标及其精确切向量，
+        均为 (n_lines, points, 2)。
+    """
+    positions, tangents = bezier_arc_length_samples(batch_control_points(lines), points)
+    arc_len = _cumulative_length(positions)
+    initial_phase = _line_attribute_array(lines, 'initial_phase', 0)
+    wavelength = wz_wavelength(
+        arc_len[:, -1],
+        _line_attribute_array(lines, 'zigzag_frequency', 2.0),
+        initial_phase,
+        _line_attribute_array(lines, 'final_phase', 0),
+    )[:, None]
+    amplitude = _line_attribute_array(lines, 'zigzag_amplitude', 0.2)[:, None]
+    start_up = (initial_phase == 0)[:, None]
+    use_wavy = np.array([bool(getattr(line, 'wz_use_wavy', True)) for line in lines])[:, None]
+
+    displacement = np.where(
+        use_wavy,
+        wavy_displacement(arc_len, amplitude, wavelength, start_up),
+        zigzag_displacement(arc_len, amplitude, wavelength, start_up),
+    )
+    return positions + _unit_normals(tangents) * displacement[..., None], positions, tangents
+
+
+def batch_gluon_helices(lines: Sequence, points: int = 2000) -> List[Optional[Tuple[BasePath, BasePath]]]:
+    """
+    批量生成胶子线：相对几何相同的线共享同一螺旋模板（见 gluon_methods.helix_template_cache），
+    缺失模板的基础贝塞尔曲线一次性按弧长采样，螺旋则逐个模板生成
+    （截断后的点数因线而异，无法堆叠），最后平移到各线起点。生成失败的线对应 None。
+    """
+    keys = [gluon_helix_template_key(line, points) for line in lines]
+    templates = {key: helix_template_cache.get(key) for key in set(keys) if key in helix_template_cache}
+    missing = {}
+    for line, key in zip(lines, keys):
+        if key not in templates:
+            missing.setdefault(key, line)
+
+    if missing:
+        control_points = batch_control_points(list(missing.values()), relative=True)
+        positions, tangents = bezier_arc_length_samples(control_points, points)
+        for (key, line), P, pos, tan in zip(missing.items(), control_points, positions, tangents):
+            try:
+                templates[key] = helix_template_cache.put(key, gluon_helix_template(line, points, (P, pos, tan)))
+            except ValueError:
+                templates[key] = None
+
+    return [None if templates[key] is None else place_helix_template(templates[key], line)
+            for line, key in zip(lines, keys)]
+
+
+def _fermion_results(lines, points):
+    control_points = batch_control_points(lines)
+    positions, tangents = bezier_arc_length_samples(control_points, points)
+    return [BezierPath(P, positions=p, tangents=t) for P, p, t in zip(control_points, positions, tangents)]
+
+
+def _photon_results(lines, points):
+    return [BasePath(p) for p in batch_photon_waves(lines, points)]
+
+
+def _WZ_results(lines, points):
+    zigzag, base, tangents = batch_WZ_zigzags(lines, points)
+    return [(BasePath(z), BasePath(b, tangents=t)) for z, b, t in zip(zigzag, base, tangents)]
+
+
+def _batch_style(line) -> Optional[Tuple[Callable, Dict, Callable]]:
+    """
+    返回 (单条生成函数, 其关键字参数, 批量生成函数)，与绘图函数中调用 cached_line_geometry 的方式一致；
+    自环线或没有批量实现的线返回 None。
+    """
+    from feynplot.core.line import (
+        GluonLine, PhotonLine, WPlusLine, WMinusLine, ZBosonLine, FermionLine, AntiFermionLine
+    )
+
+    if getattr(line, 'loop', False) or line.v_start is None or line.v_end is None:
+        return None
+    if isinstance(line, GluonLine):
+        return generate_gluon_helix, {}, batch_gluon_helices
+    if isinstance(line, PhotonLine):
+        return generate_photon_wave, {'loop': False}, _photon_results
+    if isinstance(line, (WPlusLine, WMinusLine, ZBosonLine)):
+        return generate_WZ_zigzag, {}, _WZ_results
+    if isinstance(line, (FermionLine, AntiFermionLine)):
+        return generate_fermion_line, {}, _fermion_results
+    return None
+
+
+def prefetch_line_geometry(lines: Sequence, point_counts: Dict[int, int], cache: Optional[GeometryCache] = None,
+                           executor: Optional[GeometryExecutor] = None) -> int:
+    """
+    把缓存中缺失的线条几何（版本号未变化的线条直接跳过）按 (风格, 采样点数) 分组批量生成，并以单条生成函数的缓存键写入几何缓存，
+    之后逐条绘制时的 cached_line_geometry 调用直接命中。
+
+    参数:
+        lines: 待绘制的线条。
+        point_counts: id(line) -> 采样点数。
+        cache: 几何缓存，默认使用全局 geometry_cache。
+        executor: 几何执行器，默认使用全局 geometry_executor；缺失的线条较多时各组分块并行生成。
+
+    返回:
+        新写入缓存的线条数。
+    """
+    cache = geometry_cache if cache is None else cache
+    executor = geometry_executor if executor is None else executor
+    groups = defaultdict(list)
+    for line in lines:
+        style = _batch_style(line)
+        points = point_counts.get(id(line))
+        if style is None or points is None:
+            continue
+        generator, kwargs, batch = style
+        # 这里只是预先判断；结果表的复用由随后逐条绘制的 cached_line_geometry 计入 memo_hits
+        if current_line_geometry(line, generator, points=points, **kwargs) is not None:
+            continue
+        key = geometry_cache_key(line, generator, points=points, **kwargs)
+        if key not in cache:
+            groups[(batch, points)].append((line, key))
+
+    jobs = [(batch, [line for line, _ in members], points) for (batch, points), members in groups.items()]
+    filled = 0
+    for members, results in zip(groups.values(), executor.run_batches(jobs)):
+        for (_, key), result in zip(members, results):
+            if result is not None:
+                # 预取替代了逐条绘制时的缓存查找，未命中在这里计数
+                cache.record_miss()
+                cache.put(key, result)
+                filled += 1
+    return filled
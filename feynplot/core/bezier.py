@@ -33,6 +33,273 @@ import numpy as np
 #     return xs, ys
 
 
+def bezier_control_points(A, B, angleA_deg, angleB_deg, offset_ratio=0.3):
+    """
+    返回三次贝塞尔曲线的四个控制点 (4, 2)：A, C1, C2, B。
+    C1、C2 沿起点/终点切线方向偏移 offset_ratio * |AB|。
+    A、B 也可以是 (..., 2)，角度与偏移比例为标量或 (...) 数组，此时返回 (..., 4, 2)。
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    dist = np.linalg.norm(B - A, axis=-1)[..., None]
+    offset_ratio = np.asarray(offset_ratio, dtype=float)[..., None]
+
+    angleA_rad = np.deg2rad(angleA_deg)
+    angleB_rad = np.deg2rad(angleB_deg)
+
+    C1 = A + offset_ratio * dist * np.stack((np.cos(angleA_rad), np.sin(angleA_rad)), axis=-1)
+    C2 = B + offset_ratio * dist * np.stack((np.cos(angleB_rad), np.sin(angleB_rad)), axis=-1)
+    return np.stack((A, C1, C2, B), axis=-2)
+
+
+# 弧长计算：把 [0, 1] 等分为若干子区间，每个子区间用 Gauss–Legendre 求积建立长度表；
+# 牛顿迭代只需积分子区间内很短的一段，用低阶求积即可
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(5)
+_GL_NODES_NEWTON, _GL_WEIGHTS_NEWTON = np.polynomial.legendre.leggauss(3)
+_GL_SEGMENTS = 32
+_NEWTON_STEPS = 2
+
+
+def bezier_eval(control_points, t):
+    """
+    计算三次贝塞尔曲线在参数 t 处的坐标。
+    control_points 形状 (..., 4, 2)，t 形状 (..., N)，返回 (..., N, 2)。
+    """
+    P = np.asarray(control_points, dtype=float)
+    t = np.asarray(t, dtype=float)[..., None]
+    mt = 1 - t
+    P0, P1, P2, P3 = (P[..., i, None, :] for i in range(4))
+    return mt**3 * P0 + 3 * mt**2 * t * P1 + 3 * mt * t**2 * P2 + t**3 * P3
+
+
+def bezier_derivative(control_points, t):
+    """三次贝塞尔曲线在参数 t 处的导数 dB/dt，形状约定同 bezier_eval。"""
+    P = np.asarray(control_points, dtype=float)
+    t = np.asarray(t, dtype=float)[..., None]
+    mt = 1 - t
+    D0, D1, D2 = (P[..., i + 1, None, :] - P[..., i, None, :] for i in range(3))
+    return 3 * mt**2 * D0 + 6 * mt * t * D1 + 3 * t**2 * D2
+
+
+def _speed_coefficients(P):
+    """
+    |dB/dt|² 是 t 的四次多项式；返回其系数（从高次到低次），每个形状 (..., 1)。
+    记 Di = P(i+1) - Pi，则 dB/dt = a t² + b t + c，其中 a = 3(D0 - 2D1 + D2)、b = 6(D1 - D0)、c = 3D0。
+    """
+    D0, D1, D2 = (P[..., i + 1, :] - P[..., i, :] for i in range(3))
+    a = 3 * (D0 - 2 * D1 + D2)
+    b = 6 * (D1 - D0)
+    c = 3 * D0
+    dot = lambda u, v: np.sum(u * v, axis=-1)[..., None]
+    return dot(a, a), 2 * dot(a, b), dot(b, b) + 2 * dot(a, c), 2 * dot(b, c), dot(c, c)
+
+
+def _bezier_speed(coeffs, t):
+    """由 _speed_coefficients 的结果计算 |dB/dt|，t 形状 (..., N)。"""
+    q4, q3, q2, q1, q0 = coeffs
+    sq = (((q4 * t + q3) * t + q2) * t + q1) * t + q0
+    return np.sqrt(np.maximum(sq, 0.0))
+
+
+def _partial_length(coeffs, a, b, nodes=_GL_NODES, weights=_GL_WEIGHTS):
+    """Gauss–Legendre 求积计算参数区间 [a, b] 上的弧长，a、b 形状 (..., N)。"""
+    half = (b - a) / 2
+    t = ((a + b) / 2)[..., None] + half[..., None] * nodes
+    speed = _bezier_speed(coeffs, t.reshape(*t.shape[:-2], -1)).reshape(t.shape)
+    return half * (speed @ weights)
+
+
+def bezier_length_table(control_points):
+    """
+    返回 (knots, cum)：子区间端点参数 knots (M+1,) 与对应的累积弧长 cum (..., M+1)。
+    cum[..., -1] 即曲线总长。
+    """
+    P = np.asarray(control_points, dtype=float)
+    knots = np.linspace(0.0, 1.0, _GL_SEGMENTS + 1)
+    batch = P.shape[:-2]
+    a = np.broadcast_to(knots[:-1], batch + (_GL_SEGMENTS,))
+    b = np.broadcast_to(knots[1:], batch + (_GL_SEGMENTS,))
+    seg_lengths = _partial_length(_speed_coefficients(P), a, b)
+    cum = np.concatenate((np.zeros(batch + (1,)), np.cumsum(seg_lengths, axis=-1)), axis=-1)
+    return knots, cum
+
+
+def _invert_arc_length(coeffs, knots, cum, targets):
+    """
+    由弧长反查参数 t：先在长度表上线性插值得到初值，再对所有目标弧长同时做若干步牛顿迭代。
+    cum 形状 (..., M+1)，targets 形状 (..., N)。
+    """
+    # 目标弧长所在的子区间
+    if cum.ndim == 1:
+        k = np.searchsorted(cum[1:-1], targets, side='right')
+    else:
+        k = np.sum(cum[..., None, 1:-1] <= targets[..., None], axis=-1)
+    cum_k = np.take_along_axis(cum, k, axis=-1)
+    seg = np.take_along_axis(cum, k + 1, axis=-1) - cum_k
+    lo, hi = knots[k], knots[k + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = lo + np.where(seg > 0, (targets - cum_k) / seg, 0.0) * (hi - lo)
+
+    for _ in range(_NEWTON_STEPS):
+        s = cum_k + _partial_length(coeffs, lo, t, _GL_NODES_NEWTON, _GL_WEIGHTS_NEWTON)
+        speed = np.maximum(_bezier_speed(coeffs, t), 1e-12)
+        t = np.clip(t - (s - targets) / speed, lo, hi)
+    return t
+
+
+def bezier_arc_length_parameters(control_points, points=2000):
+    """
+    求使曲线按弧长等分为 points-1 段的参数 t (..., points)。
+    先在长度表上线性插值得到初值，再对所有目标弧长同时做若干步牛顿迭代。
+    """
+    P = np.asarray(control_points, dtype=float)
+    coeffs = _speed_coefficients(P)
+    knots, cum = bezier_length_table(P)
+    total = cum[..., -1:]
+    targets = np.linspace(0.0, 1.0, points) * total
+    t = _invert_arc_length(coeffs, knots, cum, targets)
+
+    # 总长为零（起终点与控制点重合）时退化为均匀参数
+    t = np.where(total > 0, t, np.linspace(0.0, 1.0, points))
+    t[..., 0], t[..., -1] = 0.0, 1.0
+    return t
+
+
+def bezier_parameter_at_length(control_points, lengths):
+    """单条曲线上弧长 lengths 处的参数 t；lengths 为标量或一维数组，超出 [0, 总长] 时取端点。"""
+    P = np.asarray(control_points, dtype=float)
+    knots, cum = bezier_length_table(P)
+    targets = np.clip(np.atleast_1d(np.asarray(lengths, dtype=float)), 0.0, cum[-1])
+    if cum[-1] <= 0:
+        return np.zeros_like(targets)
+    return _invert_arc_length(_speed_coefficients(P), knots, cum, targets)
+
+
+def bezier_straight_mask(control_points, rtol=1e-9):
+    """
+    曲线是否退化为直线段：C1、C2 到弦 AB 的距离相对弦长可以忽略（bezier_offset 为 0，
+    或两端角度都沿弦方向），且沿弦方向单调地从 A 走到 B（不回折、不越过端点）。
+    此时按弧长等距采样就是弦上的等距点。control_points 形状 (..., 4, 2)，返回 (...) 布尔数组。
+    """
+    P = np.asarray(control_points, dtype=float)
+    chord = P[..., 3, :] - P[..., 0, :]
+    chord_sq = np.sum(chord**2, axis=-1)
+    rel = P[..., 1:3, :] - P[..., :1, :]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        along = np.sum(rel * chord[..., None, :], axis=-1) / chord_sq[..., None]
+        across = (rel[..., 0] * chord[..., None, 1] - rel[..., 1] * chord[..., None, 0]) / chord_sq[..., None]
+    collinear = np.all(np.abs(across) <= rtol, axis=-1)
+    # 沿弦方向的坐标是 Bernstein 系数为 (0, p1, p2, 1) 的三次多项式，
+    # 其导数的二次 Bernstein 系数 (p1, p2 - p1, 1 - p2) 在 [0, 1] 上非负即单调
+    a, b, c = along[..., 0], along[..., 1] - along[..., 0], 1.0 - along[..., 1]
+    monotone = (a >= 0) & (c >= 0) & ((b >= 0) | (b * b <= a * c))
+    return (chord_sq > 0) & collinear & monotone
+
+
+def bezier_arc_length_samples(control_points, points=2000):
+    """
+    按弧长等间距采样三次贝塞尔曲线。
+    返回 (positions, tangents)：坐标 (..., points, 2) 与该处的精确切向量 dB/dt。
+    退化为直线段的曲线（见 bezier_straight_mask）直接取弦上的等距点，切向量取弦向量，不建立弧长表。
+    """
+    P = np.asarray(control_points, dtype=float)
+    straight = bezier_straight_mask(P)
+    if not np.any(straight):
+        t = bezier_arc_length_parameters(P, points)
+        return bezier_eval(P, t), bezier_derivative(P, t)
+
+    chord = P[..., 3:, :] - P[..., :1, :]
+    positions = P[..., :1, :] + np.linspace(0.0, 1.0, points)[:, None] * chord
+    positions[..., -1, :] = P[..., 3, :]
+    tangents = np.broadcast_to(chord, positions.shape).copy()
+    if not np.all(straight):
+        positions[~straight], tangents[~straight] = bezier_arc_length_samples(P[~straight], points)
+    return positions, tangents
+
+
+def bezier_arc_length_at(control_points, t):
+    """单条三次贝塞尔曲线从 0 到参数 t 的弧长；t 可以是标量或一维数组。"""
+    P = np.asarray(control_points, dtype=float)
+    t = np.clip(np.atleast_1d(np.asarray(t, dtype=float)), 0.0, 1.0)
+    knots, cum = bezier_length_table(P)
+    k = np.minimum((t * _GL_SEGMENTS).astype(int), _GL_SEGMENTS - 1)
+    return cum[k] + _partial_length(_speed_coefficients(P), knots[k], t)
+
+
+def _power_basis(control_points, origin=(0.0, 0.0)):
+    """B(t) - origin 的幂基系数 (4, 2)，从高次到低次：c3 t³ + c2 t² + c1 t + c0。"""
+    P = np.asarray(control_points, dtype=float)
+    c3 = P[3] - 3 * P[2] + 3 * P[1] - P[0]
+    c2 = 3 * (P[2] - 2 * P[1] + P[0])
+    c1 = 3 * (P[1] - P[0])
+    c0 = P[0] - np.asarray(origin, dtype=float)
+    return np.stack((c3, c2, c1, c0))
+
+
+def _unit_interval_roots(poly):
+    """多项式（系数从高次到低次）在 [0, 1] 内的实根，并做两步牛顿修正。"""
+    # 去掉（数值上）为零的高次项，否则 np.roots 会给出无穷大的根
+    poly = np.asarray(poly, dtype=float)
+    scale = np.abs(poly).max() if len(poly) else 0.0
+    leading = np.flatnonzero(np.abs(poly) > 1e-14 * scale) if scale > 0 else []
+    if len(leading) == 0 or leading[0] == len(poly) - 1:
+        return np.empty(0)
+    poly = poly[leading[0]:]
+    roots = np.roots(poly)
+    roots = roots.real[np.abs(roots.imag) < 1e-7]
+    roots = roots[(roots >= -1e-9) & (roots <= 1 + 1e-9)]
+
+    derivative = np.polyder(poly)
+    for _ in range(2):
+        slope = np.polyval(derivative, roots)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roots = np.where(slope != 0, roots - np.polyval(poly, roots) / slope, roots)
+    return np.clip(roots, 0.0, 1.0)
+
+
+def bezier_circle_intersection(control_points, center, radius, from_end=False):
+    """
+    三次贝塞尔曲线与圆 |B(t) - center| = radius 的交点参数 t。
+    |B(t) - center|² - radius² 是 t 的六次多项式：用 np.roots 求出全部根，
+    取 [0, 1] 内最靠近起点（from_end 为 True 时最靠近终点）的实根。没有交点时返回 None。
+    """
+    c = _power_basis(control_points, center)
+    poly = np.convolve(c[:, 0], c[:, 0]) + np.convolve(c[:, 1], c[:, 1])
+    poly[-1] -= float(radius) ** 2
+    roots = _unit_interval_roots(poly)
+    if len(roots) == 0:
+        return None
+    return float(roots.max() if from_end else roots.min())
+
+
+def bezier_closest_point(control_points, point):
+    """
+    曲线上距离 point 最近的点。(B(t) - p)·B'(t) = 0 是 t 的五次多项式，
+    在其 [0, 1] 内的实根与两个端点中取距离最小者。返回 (t, distance)。
+    """
+    P = np.asarray(control_points, dtype=float)
+    point = np.asarray(point, dtype=float)
+    c = _power_basis(P, point)
+    d = np.stack((3 * c[0], 2 * c[1], c[2]))
+    poly = np.convolve(c[:, 0], d[:, 0]) + np.convolve(c[:, 1], d[:, 1])
+    candidates = np.concatenate(([0.0, 1.0], _unit_interval_roots(poly)))
+    distances = np.linalg.norm(bezier_eval(P, candidates) - point, axis=-1)
+    k = int(np.argmin(distances))
+    return float(candidates[k]), float(distances[k])
+
+
+def bezier_bbox(control_points):
+    """曲线的精确包围盒 (xmin, ymin, xmax, ymax)：在端点与各坐标分量导数的零点处取极值。"""
+    P = np.asarray(control_points, dtype=float)
+    c = _power_basis(P)
+    candidates = [np.array([0.0, 1.0])]
+    for axis in range(2):
+        candidates.append(_unit_interval_roots([3 * c[0, axis], 2 * c[1, axis], c[2, axis]]))
+    extremes = bezier_eval(P, np.concatenate(candidates))
+    mins = extremes.min(axis=0)
+    maxs = extremes.max(axis=0)
+    return float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1])
+
 
 def cubic_bezier(A, B, angleA_deg, angleB_deg, offset_ratio=0.3, points=2000):
     """
@@ -48,34 +315,20 @@ def cubic_bezier(A, B, angleA_deg, angleB_deg, offset_ratio=0.3, points=2000):
     返回:
         xs, ys: 曲线的 x 和 y 坐标数组。
     """
-    A = np.array(A, dtype=float)
-    B = np.array(B, dtype=float)
-    dist = np.linalg.norm(B - A)
-
-    angleA_rad = np.deg2rad(angleA_deg)
-    angleB_rad = np.deg2rad(angleB_deg)
+    xs, ys, _, _ = cubic_bezier_with_tangents(A, B, angleA_deg, angleB_deg, offset_ratio, points)
+    return xs, ys
 
-    C1 = A + offset_ratio * dist * np.array([np.cos(angleA_rad), np.sin(angleA_rad)])
-    C2 = B + offset_ratio * dist * np.array([np.cos(angleB_rad), np.sin(angleB_rad)])
 
-    # 先生成高密度曲线
-    t_dense = np.linspace(0, 1, 5000)
-    xs_dense = (1 - t_dense)**3 * A[0] + 3*(1 - t_dense)**2 * t_dense * C1[0] + \
-               3*(1 - t_dense)*t_dense**2 * C2[0] + t_dense**3 * B[0]
-    ys_dense = (1 - t_dense)**3 * A[1] + 3*(1 - t_dense)**2 * t_dense * C1[1] + \
-               3*(1 - t_dense)*t_dense**2 * C2[1] + t_dense**3 * B[1]
-    curve_dense = np.column_stack((xs_dense, ys_dense))
-
-    # 弧长重采样
-    deltas = np.diff(curve_dense, axis=0)
-    segment_lengths = np.sqrt((deltas**2).sum(axis=1))
-    arc_lengths = np.concatenate([[0], np.cumsum(segment_lengths)])
-    total_length = arc_lengths[-1]
-    target_lengths = np.linspace(0, total_length, points)
-    xs = np.interp(target_lengths, arc_lengths, xs_dense)
-    ys = np.interp(target_lengths, arc_lengths, ys_dense)
+def cubic_bezier_with_tangents(A, B, angleA_deg, angleB_deg, offset_ratio=0.3, points=2000):
+    """
+    同 cubic_bezier，额外返回各采样点处的精确切线向量。
 
-    return xs, ys
+    返回:
+        xs, ys, dxdt, dydt: 弧长等间距的坐标以及对应参数 t 处的 (dx/dt, dy/dt)。
+    """
+    P = bezier_control_points(A, B, angleA_deg, angleB_deg, offset_ratio)
+    positions, tangents = bezier_arc_length_samples(P, points)
+    return positions[:, 0], positions[:, 1], tangents[:, 0], tangents[:, 1]
 
 
 
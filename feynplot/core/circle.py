@@ -1,32 +1,57 @@
 import numpy as np
+from functools import lru_cache
 from typing import Tuple
-from scipy.interpolate import interp1d
 
-def oval_circle(
-    start_point: Tuple[float, float],
-    angular_direction: float,
-    a: float,  # 长半轴
-    b: float,  # 短半轴
-    points: int = 2000
-) -> np.ndarray:
+# 单位椭圆 (cos t, r·sin t) 弧长表：[0, 2π] 等分为 _TABLE_SEGMENTS 段，每段用 Gauss–Legendre 求积
+_TABLE_SEGMENTS = 512
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(5)
+# 反查参数后的牛顿修正：段内弧长用低阶求积
+_GL_NODES_NEWTON, _GL_WEIGHTS_NEWTON = np.polynomial.legendre.leggauss(3)
+_NEWTON_STEPS = 2
+
+
+def _unit_ellipse_speed(t, ratio):
+    return np.sqrt(np.sin(t)**2 + (ratio * np.cos(t))**2)
+
+
+@lru_cache(maxsize=64)
+def _ellipse_arc_length_table(ratio: float) -> Tuple[np.ndarray, np.ndarray]:
     """
-    生成一个完整的椭圆形路径的点，且点之间沿路径的间距近似相等。
-    通过线性距离近似弧长来提高计算速度。
+    返回长半轴为 1、短半轴为 ratio 的椭圆的参数节点 t (M+1,) 与累积弧长 s (M+1,)。
+    按 b/a 比例缓存，同一比例的椭圆只需缩放即可复用。
+    """
+    t = np.linspace(0.0, 2 * np.pi, _TABLE_SEGMENTS + 1)
+    half = (t[1] - t[0]) / 2
+    nodes = (t[:-1] + half)[:, None] + half * _GL_NODES
+    speed = _unit_ellipse_speed(nodes, ratio)
+    s = np.concatenate(([0.0], np.cumsum(half * (speed @ _GL_WEIGHTS))))
+    t.setflags(write=False)
+    s.setflags(write=False)
+    return t, s
 
-    参数:
-        start_point: 椭圆的起点坐标 (x, y)。此点位于椭圆的短轴上。
-        angular_direction: 椭圆短轴相对于x轴的角度（从起点指向中心的方向），以度为单位。
-                           长轴方向垂直于此方向。
-        a: 椭圆的长半轴长度。
-        b: 椭圆的短半轴长度。
-        points: 生成路径上的采样点数量。
 
-    返回:
-        一个 N x 2 的 numpy 数组，包含椭圆路径上近似等间距的 x 和 y 坐标。
+def _invert_arc_length(s_targets, t_table, s_table, ratio):
     """
-    if a <= 0 or b <= 0:
-        raise ValueError("长半轴和短半轴长度必须为正数。")
+    由弧长反查单位椭圆的参数 t：先在弧长表上线性插值，再做少量牛顿修正，
+    使长短轴相差悬殊时各点间距仍然均匀。
+    """
+    k = np.clip(np.searchsorted(s_table, s_targets, side='right') - 1, 0, len(t_table) - 2)
+    lo, hi = t_table[k], t_table[k + 1]
+    t = np.interp(s_targets, s_table, t_table)
+    for _ in range(_NEWTON_STEPS):
+        half = (t - lo) / 2
+        nodes = (lo + half)[:, None] + half[:, None] * _GL_NODES_NEWTON
+        s = s_table[k] + half * (_unit_ellipse_speed(nodes, ratio) @ _GL_WEIGHTS_NEWTON)
+        speed = np.maximum(_unit_ellipse_speed(t, ratio), 1e-12)
+        t = np.clip(t - (s - s_targets) / speed, lo, hi)
+    return t
+
 
+def _oval_frame(start_point, angular_direction, a, b):
+    """
+    返回 oval_circle 椭圆的 (center, major_axis_direction_rad, t_start)：
+    中心点、长轴方向（弧度）以及起点在标准椭圆 (a cos t, b sin t) 下的参数 t_start。
+    """
     # 将角度转换为弧度
     angular_direction_rad = np.deg2rad(angular_direction)
 
@@ -38,60 +63,163 @@ def oval_circle(
     # 2. 长轴方向 (弧度)
     major_axis_direction_rad = angular_direction_rad + np.pi / 2
 
-    # 3. 在高分辨率下生成参数 t 和对应的点
-    # 使用比最终点数多得多的点来计算近似弧长
-    high_res_factor = 20 # 可根据需要调整，越大越精确但越慢
-    high_res_points = points * high_res_factor
-    
-    # 起始点相对于中心的向量
+    # 3. 计算起点在标准椭圆坐标系 (长轴为x轴) 下的参数 t_start
     dx_start = start_point[0] - center[0]
     dy_start = start_point[1] - center[1]
-    
-    # 将起点 (dx_start, dy_start) 旋转到标准椭圆坐标系 (长轴为x轴)
     rot_angle_to_standard = -major_axis_direction_rad
     cos_rot = np.cos(rot_angle_to_standard)
     sin_rot = np.sin(rot_angle_to_standard)
     rotated_start_x = dx_start * cos_rot - dy_start * sin_rot
     rotated_start_y = dx_start * sin_rot + dy_start * cos_rot
-    
-    # 计算起点在标准椭圆坐标系下的参数 t_start
-    t_start_standard = np.arctan2(rotated_start_y / b, rotated_start_x / a)
-    
-    # 生成高分辨率的参数 t，覆盖一个完整的椭圆周期
-    t_high_res = np.linspace(t_start_standard, t_start_standard + 2 * np.pi, high_res_points)
-    
-    # 4. 计算高分辨率下的标准椭圆点
-    xs_standard_high_res = a * np.cos(t_high_res)
-    ys_standard_high_res = b * np.sin(t_high_res)
+    t_start_standard = np.arctan2(rotated_start_y / b, rotated_start_x / a) % (2 * np.pi)
+    return center, major_axis_direction_rad, t_start_standard
+
+
+def _ellipse_arc_length_at(t, t_table, s_table, ratio):
+    """单位椭圆从参数 0 到 t（t 在 [0, 2π] 内）的弧长：弧长表加段内 Gauss–Legendre 求积。"""
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+    k = np.clip(np.searchsorted(t_table, t, side='right') - 1, 0, len(t_table) - 2)
+    lo = t_table[k]
+    half = (t - lo) / 2
+    nodes = (lo + half)[:, None] + half[:, None] * _GL_NODES
+    return s_table[k] + half * (_unit_ellipse_speed(nodes, ratio) @ _GL_WEIGHTS)
+
+
+# 求顶点圆与椭圆交点时，先在一圈上取若干个参数值确定变号区间，再在区间内做牛顿/二分迭代
+_INTERSECTION_GRID = 64
+_INTERSECTION_STEPS = 40
+
+
+def oval_circle_intersections(start_point, angular_direction, a, b, radius, points=2000):
+    """
+    以起点为圆心、半径为 radius 的圆与 oval_circle 椭圆的两个交点：
+    沿路径方向离开起点后的第一个交点，以及回到起点前的最后一个交点。
+
+    返回:
+        ((pos_front, point_front), (pos_back, point_back))：pos 为交点在 oval_circle(..., points)
+        采样序列中的小数索引，point 为交点坐标；求解失败时返回 None。
+    """
+    if a <= 0 or b <= 0 or radius <= 0:
+        return None
+    center, major_axis_direction_rad, t_start = _oval_frame(start_point, angular_direction, a, b)
+    start_standard = np.array([a * np.cos(t_start), b * np.sin(t_start)])
+
+    def residual(u):
+        dx = a * np.cos(t_start + u) - start_standard[0]
+        dy = b * np.sin(t_start + u) - start_standard[1]
+        return dx**2 + dy**2 - radius**2
+
+    def slope(u):
+        dx = a * np.cos(t_start + u) - start_standard[0]
+        dy = b * np.sin(t_start + u) - start_standard[1]
+        return 2 * (-dx * a * np.sin(t_start + u) + dy * b * np.cos(t_start + u))
+
+    def solve(lo, hi):
+        # g(lo) 与 g(hi) 异号：牛顿迭代，越出区间时退回二分
+        g_lo = residual(lo)
+        u = 0.5 * (lo + hi)
+        for _ in range(_INTERSECTION_STEPS):
+            g = residual(u)
+            if abs(g) <= 1e-14 * radius**2:
+                break
+            if (g < 0) == (g_lo < 0):
+                lo, g_lo = u, g
+            else:
+                hi = u
+            d = slope(u)
+            u_next = u - g / d if d != 0 else lo - 1.0
+            u = u_next if lo < u_next < hi else 0.5 * (lo + hi)
+        return u
+
+    # g(0) = g(2π) = -radius² < 0：第一个 g >= 0 的网格点之前为离开圆的交点，最后一个之后为回到圆内的交点
+    grid = np.linspace(0.0, 2 * np.pi, _INTERSECTION_GRID + 1)
+    outside = np.flatnonzero(residual(grid) >= 0)
+    if len(outside) == 0:
+        return None
+    u_front = solve(grid[outside[0] - 1], grid[outside[0]])
+    u_back = solve(grid[outside[-1]], grid[outside[-1] + 1])
+
+    ratio = float(b) / float(a)
+    t_table, s_table = _ellipse_arc_length_table(ratio)
+    perimeter = s_table[-1]
+    s_start = np.interp(t_start, t_table, s_table)
+    t_hits = (t_start + np.array([u_front, u_back])) % (2 * np.pi)
+    fractions = ((_ellipse_arc_length_at(t_hits, t_table, s_table, ratio) - s_start) % perimeter) / perimeter
+    if not fractions[0] < fractions[1]:
+        return None
 
-    # 5. 旋转并平移高分辨率点
+    xs_standard = a * np.cos(t_hits)
+    ys_standard = b * np.sin(t_hits)
     cos_major = np.cos(major_axis_direction_rad)
     sin_major = np.sin(major_axis_direction_rad)
-    # 向量化操作提高速度
-    xs_rotated_high_res = xs_standard_high_res * cos_major - ys_standard_high_res * sin_major
-    ys_rotated_high_res = xs_standard_high_res * sin_major + ys_standard_high_res * cos_major
-    xs_high_res_final = xs_rotated_high_res + center[0]
-    ys_high_res_final = ys_rotated_high_res + center[1]
-
-    # 6. 计算近似的累积弦长 (线性距离)
-    dx = np.diff(xs_high_res_final)
-    dy = np.diff(ys_high_res_final)
-    distances = np.sqrt(dx**2 + dy**2)
-    s_cumulative = np.concatenate(([0], np.cumsum(distances)))
-    total_arc_length_approx = s_cumulative[-1]
-
-    # 7. 在累积弦长上进行等间距采样
-    s_equal = np.linspace(0, total_arc_length_approx, points)
-
-    # 8. 使用插值找到与等间距弧长 s_equal 对应的坐标点
-    # 对 x 和 y 坐标分别进行插值
-    x_interpolator = interp1d(s_cumulative, xs_high_res_final, kind='linear')
-    y_interpolator = interp1d(s_cumulative, ys_high_res_final, kind='linear')
-    
-    xs_final_equal = x_interpolator(s_equal)
-    ys_final_equal = y_interpolator(s_equal)
+    hits = np.column_stack((
+        xs_standard * cos_major - ys_standard * sin_major + center[0],
+        xs_standard * sin_major + ys_standard * cos_major + center[1],
+    ))
+    positions = fractions * (points - 1)
+    return (positions[0], hits[0]), (positions[1], hits[1])
+
+
+def oval_circle_bbox(start_point, angular_direction, a, b) -> Tuple[float, float, float, float]:
+    """
+    oval_circle 椭圆的精确包围盒 (xmin, ymin, xmax, ymax)。
+    长轴方向为 θ 的椭圆在 x、y 方向的半宽分别为 sqrt(a²cos²θ + b²sin²θ)、sqrt(a²sin²θ + b²cos²θ)。
+    """
+    center, major_axis_direction_rad, _ = _oval_frame(start_point, angular_direction, a, b)
+    cos_major = np.cos(major_axis_direction_rad)
+    sin_major = np.sin(major_axis_direction_rad)
+    half_width = float(np.hypot(a * cos_major, b * sin_major))
+    half_height = float(np.hypot(a * sin_major, b * cos_major))
+    return (float(center[0]) - half_width, float(center[1]) - half_height,
+            float(center[0]) + half_width, float(center[1]) + half_height)
+
+
+def oval_circle(
+    start_point: Tuple[float, float],
+    angular_direction: float,
+    a: float,  # 长半轴
+    b: float,  # 短半轴
+    points: int = 2000
+) -> np.ndarray:
+    """
+    生成一个完整的椭圆形路径的点，且点之间沿路径的间距相等。
+    弧长由按 b/a 缓存的弧长表给出，np.interp 反查各等分弧长对应的参数 t。
+
+    参数:
+        start_point: 椭圆的起点坐标 (x, y)。此点位于椭圆的短轴上。
+        angular_direction: 椭圆短轴相对于x轴的角度（从起点指向中心的方向），以度为单位。
+                           长轴方向垂直于此方向。
+        a: 椭圆的长半轴长度。
+        b: 椭圆的短半轴长度。
+        points: 生成路径上的采样点数量。
+
+    返回:
+        一个 N x 2 的 numpy 数组，包含椭圆路径上等间距的 x 和 y 坐标。
+    """
+    if a <= 0 or b <= 0:
+        raise ValueError("长半轴和短半轴长度必须为正数。")
+
+    center, major_axis_direction_rad, t_start_standard = _oval_frame(start_point, angular_direction, a, b)
+
+    # 4. 从起点出发按弧长等分一整圈，反查对应的参数 t（弧长表以 a 为单位长度）
+    ratio = float(b) / float(a)
+    t_table, s_table = _ellipse_arc_length_table(ratio)
+    perimeter = s_table[-1]
+    s_start = np.interp(t_start_standard, t_table, s_table)
+    s_targets = (s_start + np.linspace(0.0, perimeter, points)) % perimeter
+    t_samples = _invert_arc_length(s_targets, t_table, s_table, ratio)
+    # 终点与起点重合：取模会把它映射回 0 附近，这里直接闭合
+    t_samples[-1] = t_samples[0]
+
+    # 5. 计算标准椭圆点，再旋转并平移
+    xs_standard = a * np.cos(t_samples)
+    ys_standard = b * np.sin(t_samples)
+    cos_major = np.cos(major_axis_direction_rad)
+    sin_major = np.sin(major_axis_direction_rad)
+    xs_final = xs_standard * cos_major - ys_standard * sin_major + center[0]
+    ys_final = xs_standard * sin_major + ys_standard * cos_major + center[1]
 
-    return np.column_stack((xs_final_equal, ys_final_equal))
+    return np.column_stack((xs_final, ys_final))
 
 # --- 示例用法 ---
 if __name__ == '__main__':
@@ -3,10 +3,11 @@ import numpy as np
 import math
 
 # 假设 cubic_bezier 定义在 feynplot.core.bezier 中
-from feynplot.core.bezier import cubic_bezier
+from feynplot.core.bezier import bezier_control_points
 from feynplot.core.circle import oval_circle
+from feynplot.core.base_path import BasePath, BezierPath
 
-def generate_fermion_line(line):
+def generate_fermion_line(line, points: int = 2000):
     """
     根据 FermionLine 实例生成费米子线的平滑贝塞尔曲线路径点。
     
@@ -14,9 +15,10 @@ def generate_fermion_line(line):
         line: 一个 FermionLine 实例，必须已设置 v_start, v_end, angleOut, angleIn。
               Line 实例应包含以下用于贝塞尔曲线的属性（或默认值）：
               - bezier_offset: 控制点相对于起点-终点直线长度的偏移比例。
+        points: 采样点数，通常由 feynplot.core.sampling.line_sample_count 给出。
     
     返回:
-        一个 NumPy 数组 (N, 2)，包含费米子线的 (x, y) 坐标点序列。
+        BasePath，包含费米子线的 (x, y) 坐标点序列 (N, 2)；非自环时为 BezierPath。
         
     异常:
         TypeError: 如果传入的 'line' 不是 Line 实例。
@@ -39,8 +41,7 @@ def generate_fermion_line(line):
     bezier_offset = getattr(line, 'bezier_offset', 0.0) # 获取 bezier_offset，默认为0.0
     # print(f"angle_out: {angle_out}, angle_in: {angle_in}, bezier_offset: {bezier_offset}")
     # input()
-    # 费米子线只需要高分辨率的平滑曲线，所以我们直接定义点数
-    num_points = 2000 # 可以根据需要调整平滑度
+    num_points = points
     
     A = np.array(start_point_coords)
     B = np.array(end_point_coords)
@@ -55,10 +56,7 @@ def generate_fermion_line(line):
             line.b,
             points=num_points
         )
-        xs, ys = result[:, 0], result[:, 1]
+        return BasePath(result)
 
-    else:
-        xs, ys = cubic_bezier(A, B, angle_out, angle_in, offset_ratio=bezier_offset, points=num_points)
-    
-    # 返回 (N, 2) 形状的路径数组
-    return np.column_stack((xs, ys))
\ No newline at end of file
+    # 非自环的费米子线就是一条三次贝塞尔曲线：BezierPath 同时保存控制点，可直接绘制为 CURVE4 路径
+    return BezierPath(bezier_control_points(A, B, angle_out, angle_in, bezier_offset), points=num_points)
\ No newline at end of file
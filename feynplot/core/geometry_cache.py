@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from feynplot.default_settings.default_settings import renderer_default_settings
+
+# 影响线条几何形状的属性；任一属性变化都会得到不同的缓存键
+LINE_GEOMETRY_ATTRS = (
+    'loop', 'angleOut', 'angleIn', 'bezier_offset',
+    'a', 'b', 'angular_direction',
+    'amplitude', 'wavelength', 'n_cycles', 'initial_phase', 'final_phase',
+    'clockwise', 'squash_ratio', 'start_straight_ratio', 'end_straight_ratio',
+    'zigzag_amplitude', 'zigzag_frequency', 'wz_use_wavy',
+)
+
+
+def _hashable(value: Any) -> Hashable:
+    """把 numpy 标量/数组等转换为可哈希的值，用于组成缓存键。"""
+    if isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """将缓存结果中的数组设为只读，防止调用方就地修改缓存内容。"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+def line_geometry_key(line) -> Tuple:
+    """
+    根据线条的几何输入（端点坐标、角度、贝塞尔偏移、波形/自环参数等）生成缓存键。
+    线宽、颜色、标签等纯样式属性不参与键的计算。
+    """
+    key = [
+        float(line.v_start.x), float(line.v_start.y),
+        float(line.v_end.x), float(line.v_end.y),
+    ]
+    for name in LINE_GEOMETRY_ATTRS:
+        key.append(_hashable(getattr(line, name, None)))
+    return tuple(key)
+
+
+class GeometryCache:
+    """
+    有界的 LRU 几何缓存：键为线条几何参数，值为生成器返回的路径点。
+    hits / misses 计数可通过 stats() 查询，用于确认平移、缩放时缓存是否命中；
+    memo_hits / memo_misses 记录 cached_line_geometry 对线条自身几何结果表（_geometry_memo）的复用情况。
+    读写加锁，并行生成几何的工作线程可以共享同一个缓存。
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = int(maxsize)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def record_miss(self):
+        """记一次未命中：供绕过 get() 直接批量生成并 put() 的调用方（如 prefetch_line_geometry）使用。"""
+        with self._lock:
+            self.misses += 1
+
+    def record_memo(self, hit: bool):
+        """记一次线条几何结果表的查找：hit 为 True 时表示直接复用了线条上次的结果。"""
+        with self._lock:
+            if hit:
+                self.memo_hits += 1
+            else:
+                self.memo_misses += 1
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        if self.maxsize <= 0:
+            return value
+        with self._lock:
+            self._data[key] = _freeze(value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.memo_hits = 0
+            self.memo_misses = 0
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = int(maxsize)
+            while len(self._data) > max(self.maxsize, 0):
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._data)
+            memo_hits, memo_misses = self.memo_hits, self.memo_misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'size': size,
+            'maxsize': self.maxsize,
+            'hit_rate': hits / total if total else 0.0,
+            'memo_hits': memo_hits,
+            'memo_misses': memo_misses,
+        }
+
+
+# 全局默认几何缓存，所有绘图函数共享
+geometry_cache = GeometryCache(renderer_default_settings['GEOMETRY_CACHE_SIZE'])
+
+
+def geometry_cache_key(line, generator: Callable, *args, **kwargs) -> Tuple:
+    """cached_line_geometry 使用的缓存键：生成函数 + 线条几何参数 + 调用参数。"""
+    return (generator.__module__, generator.__qualname__) + line_geometry_key(line) \
+        + _hashable(args) + _hashable(tuple(sorted(kwargs.items())))
+
+
+def line_geometry_stamp(line) -> Optional[Tuple[int, int, int]]:
+    """
+    线条及其两端顶点的几何版本号 (line, v_start, v_end)。
+    任一对象没有 geometry_version（不支持脏标记）时返回 None。
+    """
+    try:
+        return line.geometry_version, line.v_start.geometry_version, line.v_end.geometry_version
+    except AttributeError:
+        return None
+
+
+def _call_signature(generator: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple:
+    return (generator.__module__, generator.__qualname__) + _hashable(args) + _hashable(tuple(sorted(kwargs.items())))
+
+
+# 每条线保留的最近几何结果数：对应粗/中/细三个细节层级的路径，缩放时在层级之间切换不必重新查找缓存
+LINE_MEMO_SIZE = 3
+
+
+def current_line_geometry(line, generator: Callable, *args, **kwargs) -> Any:
+    """
+    线条与两端顶点自上次生成以来都未修改、且以相同调用参数（含采样点数）生成过时，返回该结果；否则返回 None。
+    只比较版本号，不计算完整的缓存键。
+    """
+    memo = getattr(line, '_geometry_memo', None)
+    if not memo:
+        return None
+    entry = memo.get(_call_signature(generator, args, kwargs))
+    if entry is None or entry[0] != line_geometry_stamp(line):
+        return None
+    return entry[1]
+
+
+def _remember_line_geometry(line, signature: Tuple, stamp: Tuple, result: Any) -> None:
+    """记入线条自己的几何结果表：丢弃版本号已过期的条目，最多保留 LINE_MEMO_SIZE 条。"""
+    memo = getattr(line, '_geometry_memo', None)
+    if not isinstance(memo, dict):
+        memo = line._geometry_memo = {}
+    for key in [k for k, (s, _) in memo.items() if s != stamp]:
+        del memo[key]
+    memo.pop(signature, None)
+    memo[signature] = (stamp, result)
+    while len(memo) > LINE_MEMO_SIZE:
+        del memo[next(iter(memo))]
+
+
+def cached_line_geometry(line, generator: Callable, *args, cache: Optional[GeometryCache] = None, **kwargs):
+    """
+    以线条几何参数为键调用 generator(line, *args, **kwargs)，命中时直接复用之前的结果。
+    线条与端点的版本号未变化时直接返回该线条上次的结果，不再计算缓存键。
+    返回值中的数组为只读；需要修改时请先复制。
+    """
+    cache = geometry_cache if cache is None else cache
+    result = current_line_geometry(line, generator, *args, **kwargs)
+    cache.record_memo(result is not None)
+    if result is not None:
+        return result
+    key = geometry_cache_key(line, generator, *args, **kwargs)
+    result = cache.get_or_compute(key, lambda: generator(line, *args, **kwargs))
+    stamp = line_geometry_stamp(line)
+    if stamp is not None:
+        _remember_line_geometry(line, _call_signature(generator, args, kwargs), stamp, result)
+    return result
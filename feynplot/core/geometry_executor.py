@@ -0,0 +1,97 @@
+import math
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from feynplot.default_settings.default_settings import renderer_default_settings
+
+# 一个批量任务：(批量生成函数, 线条列表, 采样点数)，与 batch_paths 中 batch_fn(lines, points) 的调用方式一致
+GeometryJob = Tuple[Callable, Sequence, int]
+
+
+def default_worker_count() -> int:
+    """默认工作线程数：CPU 核数，最多 4 个（更多线程在 GIL 下收益很小）。"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class GeometryExecutor:
+    """
+    线条几何的并行执行器：把批量生成任务按线条分块，交给线程池（或进程池）并发计算，按原顺序返回结果。
+
+    NumPy 内核在数组运算中释放 GIL，GUI 中使用线程池即可并行；进程池（use_processes=True）
+    适合不在 GUI 线程上的批量导出，线条与结果需要在进程间序列化。
+    线条总数少于 min_batch_size 或 max_workers <= 1 时直接在当前线程串行计算，不启动任何线程。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_batch_size: int = 64, use_processes: bool = False):
+        """
+        参数:
+            max_workers: 工作线程/进程数；None 或 0 表示 default_worker_count()。
+            min_batch_size: 启用并行的最少线条数，小图串行计算更快。
+            use_processes: 使用进程池而不是线程池。
+        """
+        self.max_workers = max_workers or default_worker_count()
+        self.min_batch_size = int(min_batch_size)
+        self.use_processes = bool(use_processes)
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers: Optional[int] = None, min_batch_size: Optional[int] = None,
+                  use_processes: Optional[bool] = None):
+        """修改配置；工作线程数或池类型变化时关闭现有的池，下次使用时按新配置重建。"""
+        workers = (max_workers or default_worker_count()) if max_workers is not None else self.max_workers
+        processes = self.use_processes if use_processes is None else bool(use_processes)
+        if workers != self.max_workers or processes != self.use_processes:
+            self.shutdown()
+        self.max_workers = workers
+        self.use_processes = processes
+        if min_batch_size is not None:
+            self.min_batch_size = int(min_batch_size)
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                self._pool = pool_class(max_workers=self.max_workers)
+            return self._pool
+
+    def is_parallel(self, n_lines: int) -> bool:
+        """n_lines 条线是否会并行计算。"""
+        return self.max_workers > 1 and n_lines >= self.min_batch_size
+
+    def run_batches(self, jobs: Sequence[GeometryJob]) -> List[list]:
+        """
+        计算所有批量任务，返回与 jobs 一一对应的结果列表（每个列表与该任务的线条一一对应）。
+        并行时每个任务按 ceil(总线条数 / 工作数) 条线分块，分块结果按原顺序拼接。
+        """
+        total = sum(len(lines) for _, lines, _ in jobs)
+        if not self.is_parallel(total):
+            return [list(batch(lines, points)) for batch, lines, points in jobs]
+
+        pool = self._get_pool()
+        chunk = max(1, math.ceil(total / self.max_workers))
+        futures = []
+        for index, (batch, lines, points) in enumerate(jobs):
+            lines = list(lines)
+            for start in range(0, len(lines), chunk):
+                futures.append((index, pool.submit(batch, lines[start:start + chunk], points)))
+
+        results = [[] for _ in jobs]
+        for index, future in futures:
+            results[index].extend(future.result())
+        return results
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+# 全局默认执行器，prefetch_line_geometry 使用
+geometry_executor = GeometryExecutor(
+    renderer_default_settings['GEOMETRY_WORKERS'],
+    renderer_default_settings['GEOMETRY_PARALLEL_MIN_LINES'],
+    renderer_default_settings['GEOMETRY_USE_PROCESSES'],
+)
@@ -1,16 +1,105 @@
 from feynplot.core.bezier import *
 from feynplot.core.special_curves import *
 
-from feynplot.core.circle import oval_circle
+from feynplot.core.circle import oval_circle, oval_circle_intersections
+from feynplot.core.base_path import BasePath
+from feynplot.core.geometry_cache import GeometryCache
+from feynplot.default_settings.default_settings import renderer_default_settings
 
+# 螺旋模板缓存：以起点为原点生成的胶子线 (truncated_path, full_trajectory)，键为相对几何与螺旋参数。
+# 螺旋偏移在全局坐标系中计算，只与相对几何有关，因此只差一个平移的胶子线共享同一模板，放置时只需平移坐标。
+helix_template_cache = GeometryCache(renderer_default_settings['HELIX_TEMPLATE_CACHE_SIZE'])
 
-def _cumulative_path_length(path):
-    """路径各点到起点的弧长，path 形状 (N,2)，返回长度 N，cum[0]=0。"""
-    diffs = np.diff(path, axis=0)
-    seg_lens = np.linalg.norm(diffs, axis=1)
-    cum = np.zeros(len(path))
-    cum[1:] = np.cumsum(seg_lens)
-    return cum
+
+def _trim_path_to_vertex_circles(path: BasePath, radius, loop=False, intersections=None):
+    """
+    用起点/终点处半径为 radius 的圆截断路径（自环时两端都以起点为圆心）。
+    intersections 为解析求得的 ((pos_start, point_start), (pos_end, point_end))，pos 为交点在 path
+    采样序列中的小数索引；未提供时退回逐点扫描 find_closest_intersection_point。
+    返回 (truncated_path, vec_start, vec_end)，truncated_path 为 BasePath，vec 为交点指向圆心的向量。
+    """
+    path_points = path.points
+    A = path_points[0]
+    B = path_points[-1]
+
+    if intersections is not None:
+        (pos_start, point_start), (pos_end, point_end) = intersections
+        vec_start = A - point_start
+        vec_end = (A if loop else B) - point_end
+        if pos_start > pos_end:
+            (pos_start, point_start), (pos_end, point_end) = (pos_end, point_end), (pos_start, point_start)
+        return path.between(pos_start, pos_end, point_start, point_end), vec_start, vec_end
+
+    if not loop:
+        idx_start, vec_start = find_closest_intersection_point(A, radius, path_points)
+        idx_end, vec_end = find_closest_intersection_point(B, radius, path_points)
+    else:
+        (idx_start, vec_start), (idx_end, vec_end) = find_closest_intersection_point(A, radius, path_points, loop=True)
+
+    if idx_start > idx_end:
+        idx_start, idx_end = idx_end, idx_start
+
+    return path.sub_path(idx_start, idx_end), vec_start, vec_end
+
+
+def bezier_vertex_circle_intersections(control_points, radius, points):
+    """
+    起点、终点处半径为 radius 的圆与贝塞尔曲线的解析交点，换算为 points 个弧长等距采样中的小数索引。
+    返回值可直接作为 _trim_path_to_vertex_circles 的 intersections；求解失败时返回 None。
+    """
+    P = np.asarray(control_points, dtype=float)
+    if bezier_straight_mask(P):
+        # 直线段：交点就在弦上距两端 radius 处
+        length = float(np.linalg.norm(P[3] - P[0]))
+        if 0 < radius < length:
+            direction = (P[3] - P[0]) / length
+            positions = np.array([radius, length - radius]) / length * (points - 1)
+            return (positions[0], P[0] + radius * direction), (positions[1], P[3] - radius * direction)
+    t_start = bezier_circle_intersection(P, P[0], radius)
+    t_end = bezier_circle_intersection(P, P[3], radius, from_end=True)
+    if t_start is None or t_end is None:
+        return None
+    s_start, s_end, total = bezier_arc_length_at(P, [t_start, t_end, 1.0])
+    if total <= 0:
+        return None
+    positions = np.array([s_start, s_end]) / total * (points - 1)
+    hits = bezier_eval(P, [t_start, t_end])
+    return (positions[0], hits[0]), (positions[1], hits[1])
+
+
+def _direction_angle(vec) -> float:
+    """
+    向量的方向角。相对长度可以忽略的分量（舍入噪声）视为 +0：水平/竖直方向上噪声的正负
+    会让 arctan2 在 ±π 之间跳变，从而使螺旋总圈数随线条位置相差一圈。
+    """
+    x, y = float(vec[0]), float(vec[1])
+    tol = 1e-9 * np.hypot(x, y)
+    return np.arctan2(0.0 if abs(y) <= tol else y, 0.0 if abs(x) <= tol else x)
+
+
+def _helix_along_path(path: BasePath, vec_start, vec_end, radius, n_cycles, v, clockwise, squash_ratio):
+    """
+    一次性计算绕 path 旋转的点 D 的轨迹：D_i = C_i + R·(cos φ_i, squash·sin φ_i)。
+    相位 φ 按沿 path 的弧长比例线性变化（与采样点数无关，两端能对准解析交点），首尾分别对准 vec_start、vec_end 的方向并多转 n_cycles 圈。
+    """
+    path_length = path.length
+    if path_length == 0 or v == 0:
+        raise ValueError(
+            "Path length ({}) and speed (v) must be greater than zero to compute helix trajectory. "
+            "Please check the amplitude and wavelength of the gluon line.".format(path_length)
+        )
+
+    vec_start_angle = _direction_angle(vec_start)
+    vec_end_angle = _direction_angle(vec_end)
+    total_phase = 2 * np.pi * n_cycles + vec_end_angle - vec_start_angle
+    if clockwise:
+        total_phase = -total_phase
+
+    # 匀速 v 下 ω·t = total_phase · s / L（s 为弧长），与 v 本身无关；
+    # 等距采样时即 total_phase · i / (N - 1)，两端为解析交点时按实际弧长分配相位
+    phase = vec_start_angle + total_phase * path.cumulative_length / path_length
+    offsets = np.column_stack((np.cos(phase), float(squash_ratio) * np.sin(phase)))
+    return path.points + radius * offsets
 
 
 def generate_helix_curve_points_based_on_bezier_path(
@@ -23,32 +112,25 @@ def generate_helix_curve_points_based_on_bezier_path(
     squash_ratio: float = 1.0,
     start_straight_ratio: float = 0.0,
     end_straight_ratio: float = 0.0,
+    intersections=None,
 ):
     """
     根据给定的贝塞尔路径点，生成沿路径运动且绕路径旋转的点 D 轨迹。
-    若 start_straight_ratio 或 end_straight_ratio 不为 0：按比例截出中间段，将两比例置 0 后递归，
-    再拼接 [A,P1] + 递归得到的螺旋轨迹 + [P2,B] 返回。
-    返回: (truncated_path, full_trajectory)。
+    若 start_straight_ratio 或 end_straight_ratio 不为 0：按比例截出中间段并再次按顶点圆截断，
+    在其上生成螺旋轨迹，再拼接 [A,P1] + 螺旋轨迹 + [P2,B] 返回。
+    path_points 可以是 (N,2) 数组或 BasePath；intersections 为顶点圆的解析交点（见 _trim_path_to_vertex_circles）。
+    返回: (truncated_path, full_trajectory)，均为 BasePath。
     """
-    path_points = np.array(path_points)
-    A = path_points[0]
-    B = path_points[-1]
-
-    if not loop:
-        idx_start, vec_start = find_closest_intersection_point(A, radius, path_points)
-        idx_end, vec_end = find_closest_intersection_point(B, radius, path_points)
-    else:
-        (idx_start, vec_start), (idx_end, vec_end) = find_closest_intersection_point(A, radius, path_points, loop=True)
-
-    if idx_start > idx_end:
-        idx_start, idx_end = idx_end, idx_start
+    base_path = path_points if isinstance(path_points, BasePath) else BasePath(path_points)
+    A = base_path.points[0]
+    B = base_path.points[-1]
 
-    truncated_path = path_points[idx_start:idx_end + 1]
+    truncated_path, vec_start, vec_end = _trim_path_to_vertex_circles(base_path, radius, loop, intersections)
     num_steps = len(truncated_path)
     if num_steps < 2:
-        return truncated_path, truncated_path.copy()
+        return truncated_path, BasePath(truncated_path.points)
 
-    path_length = float(compute_path_length(truncated_path))
+    path_length = truncated_path.length
     if path_length == 0 or v == 0:
         raise ValueError(
             "Path length ({}) and speed (v) must be greater than zero to compute helix trajectory. "
@@ -60,75 +142,98 @@ def generate_helix_curve_points_based_on_bezier_path(
     if start_ratio + end_ratio >= 1.0:
         start_ratio, end_ratio = 0.0, 0.0
 
-    if start_ratio > 0 or end_ratio > 0:
-        cum = _cumulative_path_length(truncated_path)
-        L = path_length
-        s_start = start_ratio * L
-        s_end = (1.0 - end_ratio) * L
-        idx_spiral_start = np.searchsorted(cum, s_start, side="left")
-        idx_spiral_start = min(idx_spiral_start, num_steps - 2)
-        idx_spiral_end = np.searchsorted(cum, s_end, side="right") - 1
-        idx_spiral_end = max(idx_spiral_end, idx_spiral_start + 1)
-        # 只有一端非零时，螺旋路径延伸到该端顶点，不在该端截断贝塞尔
-        mid_segment = truncated_path[idx_spiral_start : idx_spiral_end + 1]
-        if start_ratio == 0 and end_ratio > 0:
-            spiral_path = np.vstack([np.atleast_2d(A), mid_segment])
-        elif start_ratio > 0 and end_ratio == 0:
-            spiral_path = np.vstack([mid_segment, np.atleast_2d(B)])
-        else:
-            spiral_path = mid_segment
-        P1 = np.asarray(spiral_path[0])
-        P2 = np.asarray(spiral_path[-1])
-        _, full_inner = generate_helix_curve_points_based_on_bezier_path(
-            spiral_path,
-            radius=radius,
-            n_cycles=n_cycles,
-            v=v,
-            loop=loop,
-            clockwise=clockwise,
-            squash_ratio=squash_ratio,
-            start_straight_ratio=0.0,
-            end_straight_ratio=0.0,
-        )
-        parts = []
-        if start_ratio > 0:
-            parts.append(np.atleast_2d(A))
-            parts.append(np.atleast_2d(P1))
-        else:
-            parts.append(np.atleast_2d(A))
-        parts.append(full_inner)
-        if end_ratio > 0:
-            parts.append(np.atleast_2d(P2))
-            parts.append(np.atleast_2d(B))
-        elif end_ratio == 0:
-            # 末端未设直线比例时仍要连到顶点 B
-            parts.append(np.atleast_2d(B))
-        full_trajectory = np.vstack(parts)
-        return truncated_path, full_trajectory
-
-    vec_start_angle = np.arctan2(vec_start[1], vec_start[0])
-    vec_end_angle = np.arctan2(vec_end[1], vec_end[0])
-    total_phase = 2 * np.pi * n_cycles + vec_end_angle - vec_start_angle
-    if clockwise:
-        total_phase = -total_phase
-    total_time = path_length / v
-    omega = total_phase / total_time
-    dt = total_time / (num_steps - 1) if num_steps > 1 else 0.0
+    helix_args = (radius, n_cycles, v, clockwise, squash_ratio)
+    if start_ratio == 0 and end_ratio == 0:
+        return truncated_path, BasePath(_helix_along_path(truncated_path, vec_start, vec_end, *helix_args))
 
-    D_trajectory = np.zeros_like(truncated_path)
-    for i, point_C in enumerate(truncated_path):
-        t_i = i * dt
-        phase_D_rel_C = vec_start_angle + omega * t_i
-        dx = radius * np.cos(phase_D_rel_C)
-        dy = radius * float(squash_ratio) * np.sin(phase_D_rel_C)
-        D_trajectory[i] = point_C + np.array([dx, dy])
-    return truncated_path, D_trajectory
+    cum = truncated_path.cumulative_length
+    L = path_length
+    s_start = start_ratio * L
+    s_end = (1.0 - end_ratio) * L
+    idx_spiral_start = np.searchsorted(cum, s_start, side="left")
+    idx_spiral_start = min(idx_spiral_start, num_steps - 2)
+    idx_spiral_end = np.searchsorted(cum, s_end, side="right") - 1
+    idx_spiral_end = max(idx_spiral_end, idx_spiral_start + 1)
+    # 只有一端非零时，螺旋路径延伸到该端顶点，不在该端截断贝塞尔
+    mid_segment = truncated_path.points[idx_spiral_start : idx_spiral_end + 1]
+    if start_ratio == 0 and end_ratio > 0:
+        spiral_path = BasePath(np.vstack([np.atleast_2d(A), mid_segment]))
+    elif start_ratio > 0 and end_ratio == 0:
+        spiral_path = BasePath(np.vstack([mid_segment, np.atleast_2d(B)]))
+    else:
+        spiral_path = truncated_path.sub_path(idx_spiral_start, idx_spiral_end)
+    P1 = np.asarray(spiral_path[0])
+    P2 = np.asarray(spiral_path[-1])
 
+    # 螺旋段两端（P1/P2 或顶点）同样按半径 R 的圆截断，使螺旋首尾落在这两点上；
+    # 交点在折线线段上精确求解，求不出时才退回逐点扫描
+    inner_start = spiral_path.circle_intersection(P1, radius)
+    inner_end = spiral_path.circle_intersection(P1 if loop else P2, radius, from_end=True)
+    inner_intersections = None if inner_start is None or inner_end is None else (inner_start, inner_end)
+    inner_path, inner_vec_start, inner_vec_end = _trim_path_to_vertex_circles(
+        spiral_path, radius, loop, inner_intersections)
+    if len(inner_path) < 2:
+        full_inner = inner_path.points
+    else:
+        full_inner = _helix_along_path(inner_path, inner_vec_start, inner_vec_end, *helix_args)
 
-def generate_gluon_helix(line):
+    parts = []
+    if start_ratio > 0:
+        parts.append(np.atleast_2d(A))
+        parts.append(np.atleast_2d(P1))
+    else:
+        parts.append(np.atleast_2d(A))
+    parts.append(full_inner)
+    if end_ratio > 0:
+        parts.append(np.atleast_2d(P2))
+        parts.append(np.atleast_2d(B))
+    elif end_ratio == 0:
+        # 末端未设直线比例时仍要连到顶点 B
+        parts.append(np.atleast_2d(B))
+    full_trajectory = BasePath(np.vstack(parts))
+    return truncated_path, full_trajectory
+
+
+def gluon_helix_template_key(line, points: int) -> tuple:
+    """
+    胶子线在以起点为原点的坐标系中的形状参数（相对终点与角度或自环参数、螺旋参数、采样点数），
+    作为 helix_template_cache 的键；只差一个平移的两条胶子线得到相同的键。
+    """
+    if line.loop:
+        shape = (True, float(line.angular_direction), float(line.a), float(line.b))
+    else:
+        shape = (False,
+                 float(line.v_end.x) - float(line.v_start.x), float(line.v_end.y) - float(line.v_start.y),
+                 float(line.angleOut), float(line.angleIn), float(line.bezier_offset))
+    return shape + (
+        float(line.amplitude), float(line.n_cycles), float(line.wavelength),
+        bool(getattr(line, "clockwise", False)), float(getattr(line, "squash_ratio", 1.0)),
+        float(getattr(line, "start_straight_ratio", 0.0)), float(getattr(line, "end_straight_ratio", 0.0)),
+        int(points),
+    )
+
+
+def place_helix_template(template, line):
+    """把以原点为起点的模板平移到线条起点，返回 (truncated_path, full_trajectory)。"""
+    offset = (float(line.v_start.x), float(line.v_start.y))
+    return tuple(path.translated(offset) for path in template)
+
+
+def generate_gluon_helix(line, points: int = 2000):
     from feynplot.core.line import GluonLine
     if not isinstance(line, GluonLine):
         raise TypeError("line must be a GluonLine instance")
+    template = helix_template_cache.get_or_compute(
+        gluon_helix_template_key(line, points), lambda: gluon_helix_template(line, points)
+    )
+    return place_helix_template(template, line)
+
+
+def gluon_helix_template(line, points: int = 2000, bezier_samples=None):
+    """
+    以线条起点为原点生成胶子线，返回 (truncated_path, full_trajectory)。
+    bezier_samples 为可选的 (控制点, 采样点, 切向量)，批量生成时由调用方一次性算好。
+    """
     R = line.amplitude
     n_cycles = line.n_cycles
     v = line.wavelength
@@ -137,19 +242,27 @@ def generate_gluon_helix(line):
 
     if line.loop:
         base_path = oval_circle(
-            start_point=(line.v_start.x, line.v_start.y),
+            start_point=(0.0, 0.0),
             angular_direction=line.angular_direction,
             a=line.a,
             b=line.b,
-            points=2000
+            points=points
         )
-    else:
-        base_path = generate_bezier_path(
-            line.v_start, line.v_end,
-            line.angleOut, line.angleIn,
-            offset_ratio=line.bezier_offset,
-            loop=line.loop
+        intersections = oval_circle_intersections(
+            (0.0, 0.0), line.angular_direction, line.a, line.b, R, points
         )
+    else:
+        if bezier_samples is None:
+            P = bezier_control_points(
+                (0.0, 0.0),
+                (float(line.v_end.x) - float(line.v_start.x), float(line.v_end.y) - float(line.v_start.y)),
+                line.angleOut, line.angleIn, line.bezier_offset,
+            )
+            positions, tangents = bezier_arc_length_samples(P, points)
+        else:
+            P, positions, tangents = bezier_samples
+        base_path = BasePath(positions, tangents=tangents)
+        intersections = bezier_vertex_circle_intersections(P, R, points)
 
     start_straight_ratio = getattr(line, "start_straight_ratio", 0.0)
     end_straight_ratio = getattr(line, "end_straight_ratio", 0.0)
@@ -163,6 +276,7 @@ def generate_gluon_helix(line):
         squash_ratio=squash_ratio,
         start_straight_ratio=start_straight_ratio,
         end_straight_ratio=end_straight_ratio,
+        intersections=intersections,
     )
     return truncated_path, full_trajectory
 
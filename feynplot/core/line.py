@@ -4,6 +4,8 @@ from matplotlib.pyplot import get_plot_commands
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from feynplot_gui.debug_utils import cout
+from feynplot.core.base_path import BasePath
+from feynplot.core.geometry_cache import LINE_GEOMETRY_ATTRS, line_geometry_stamp
 
 import enum 
 
@@ -19,6 +21,8 @@ class LineStyle(enum.Enum):
 class Line:
     # Counter for generating unique IDs
     _line_counter_global = 1
+    # 修改后需要重新生成绘制路径的属性（端点顶点本身的移动由顶点的版本号记录）
+    _GEOMETRY_ATTRS = frozenset(LINE_GEOMETRY_ATTRS) | {'_angleOut', '_angleIn', 'v_start', 'v_end'}
 
     def __init__(self, v_start, v_end,
                  label: str = '',
@@ -50,6 +54,7 @@ class Line:
         self.v_end = v_end
 
         self.plot_points: List[Tuple[float, float]] = []
+        self.plot_path: Optional[BasePath] = None  # 绘制路径及其缓存的弧长/切线等几何量
 
 
         # Line style (now a direct attribute)
@@ -154,6 +159,12 @@ class Line:
     def show_label(self):
         self.hidden_label = False
 
+    def __setattr__(self, name, value):
+        # 几何相关属性变化时递增几何版本号，未变化的线条在渲染时直接复用上次的路径
+        if name in self._GEOMETRY_ATTRS:
+            self.__dict__['geometry_version'] = self.__dict__.get('geometry_version', 0) + 1
+        super().__setattr__(name, value)
+
     def set_vertices(self, v_start, v_end):
         # IMPORTANT: v_start and v_end must be Vertex-like objects, not their IDs.
         # Ensure we're assigning objects, not re-calculating from IDs.
@@ -199,9 +210,55 @@ class Line:
             return self.plot_points
     
     def set_plot_points(self, xs, ys):
-        self.plot_points = np.array(list(zip(xs, ys)))
+        self.set_plot_path(BasePath(np.column_stack((xs, ys))))
         # print(type(self.plot_points))
 
+    def set_plot_path(self, path: BasePath):
+        """保存绘制路径，plot_points 同步为其坐标数组。"""
+        self.plot_path = path
+        self.plot_points = path.points
+
+    def get_label_anchor(self):
+        """标签锚点：绘制路径按弧长计算的中点，不随采样点数变化。"""
+        path = self.plot_path if self.plot_path is not None else BasePath(self.plot_points)
+        return path.point_at_fraction(0.5)
+
+    def distance_to(self, x: float, y: float) -> float:
+        """点 (x, y) 到绘制路径的最短距离，用于点击检测；贝塞尔路径按控制点解析计算。"""
+        path = self.plot_path if self.plot_path is not None else BasePath(self.plot_points)
+        return path.distance_to((x, y))
+
+    def decoration_extent(self) -> Tuple[float, float]:
+        """波形/螺旋相对基础曲线在 x、y 方向上的最大外扩，用于包围盒；没有装饰的线为 0。"""
+        return 0.0, 0.0
+
+    def bounding_box(self) -> Tuple[float, float, float, float]:
+        """
+        线条的解析包围盒 (xmin, ymin, xmax, ymax)：贝塞尔曲线在导数零点处取极值，自环取椭圆的闭式范围，
+        再按 decoration_extent 外扩。结果按几何版本号缓存，线条或端点修改后自动重新计算。
+        """
+        from feynplot.core.bezier import bezier_control_points, bezier_bbox
+        from feynplot.core.circle import oval_circle_bbox
+
+        stamp = line_geometry_stamp(self)
+        cached = self.__dict__.get('_bbox_cache')
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        if self.loop:
+            xmin, ymin, xmax, ymax = oval_circle_bbox(
+                (self.v_start.x, self.v_start.y), self.angular_direction, self.a, self.b
+            )
+        else:
+            xmin, ymin, xmax, ymax = bezier_bbox(bezier_control_points(
+                (self.v_start.x, self.v_start.y), (self.v_end.x, self.v_end.y),
+                self.angleOut, self.angleIn, self.bezier_offset,
+            ))
+        ex, ey = self.decoration_extent()
+        bbox = (xmin - ex, ymin - ey, xmax + ex, ymax + ey)
+        self._bbox_cache = (stamp, bbox)
+        return bbox
+
     @staticmethod
     def _calc_angle(p1, p2):
         dx = p2.x - p1.x
@@ -463,6 +520,11 @@ class BosonLine(Line):
         # 它会继承 Line 的 STRAIGHT 默认 style
         super().__init__(v_start=v_start, v_end=v_end, **kwargs)
 
+    def decoration_extent(self) -> Tuple[float, float]:
+        # W/Z 线的波浪/折线振幅；光子、胶子在子类中按各自的振幅覆盖
+        amplitude = abs(float(getattr(self, 'zigzag_amplitude', 0.0) or 0.0))
+        return amplitude, amplitude
+
 # -------------------------
 # Fermion Examples - Handle default label in the most specific subclass
 # -------------------------
@@ -542,6 +604,10 @@ class PhotonLine(BosonLine):
         self.wavelength = wavelength
         self.initial_phase = initial_phase
 
+    def decoration_extent(self) -> Tuple[float, float]:
+        amplitude = abs(float(self.amplitude))
+        return amplitude, amplitude
+
 class GluonLine(BosonLine):
     def __init__(
         self,
@@ -570,12 +636,18 @@ class GluonLine(BosonLine):
         self.start_straight_ratio = start_straight_ratio
         self.end_straight_ratio = end_straight_ratio
 
-    def get_plot_path(self):
+    def decoration_extent(self) -> Tuple[float, float]:
+        # 螺旋点 D = C + R·(cos φ, squash·sin φ)
+        radius = abs(float(self.amplitude))
+        return radius, radius * abs(float(self.squash_ratio))
+
+    def get_plot_path(self, points: int = 2000):
         # Assuming feynplot.core.gluon_methods exists and is available
         from feynplot.core.gluon_methods import generate_gluon_helix
+        from feynplot.core.geometry_cache import cached_line_geometry
         if self.v_start is None or self.v_end is None:
             raise ValueError("v_start 和 v_end 必须先设置")
-        return generate_gluon_helix(self)
+        return cached_line_geometry(self, generate_gluon_helix, points=points)
 
 class WPlusLine(BosonLine):
     def __init__(self, v_start, v_end, 
@@ -1,10 +1,11 @@
 import numpy as np
 import math
 from feynplot.core.circle import oval_circle
-from feynplot.core.bezier import cubic_bezier, bezier_tangent
+from feynplot.core.bezier import cubic_bezier_with_tangents
+from feynplot.core.base_path import BasePath
 from feynplot.core.line import Line, PhotonLine
 
-def generate_photon_wave(line, loop=False):
+def generate_photon_wave(line, loop=False, points: int = 2000):
     """
     根据 PhotonLine 实例生成光子波浪线的路径点，
     并确保波浪线在起点和终点处与指定相位对齐。
@@ -14,9 +15,10 @@ def generate_photon_wave(line, loop=False):
               以及可选的 amplitude, wavelength, initial_phase, final_phase 属性。
         loop: 布尔值，指示是否生成环形路径。
               如果为 True，将使用 oval_circle 生成环形路径。
+        points: 采样点数，通常由 feynplot.core.sampling.line_sample_count 给出。
               
     返回:
-        一个 NumPy 数组 (N, 2)，包含光子波浪线的 (x, y) 坐标点序列。
+        BasePath，包含光子波浪线的 (x, y) 坐标点序列 (N, 2)。
         
     异常:
         TypeError: 如果传入的 'line' 不是 Line 实例。
@@ -36,11 +38,6 @@ def generate_photon_wave(line, loop=False):
     initial_phase_deg = getattr(line, 'initial_phase', 0)
     final_phase_deg = getattr(line, 'final_phase', 0)
 
-    initial_phase_rad = np.deg2rad(initial_phase_deg)
-    final_phase_rad = np.deg2rad(final_phase_deg)
-
-    points = 2000
-    
     # --- 完善 loop 和 not loop 两种情况的路径生成 ---
     if not loop:
         # 非环形路径：使用贝塞尔曲线
@@ -51,12 +48,11 @@ def generate_photon_wave(line, loop=False):
         A = np.array(start_point_coords)
         B = np.array(end_point_coords)
 
-        xs_bezier, ys_bezier = cubic_bezier(A, B, angle_out, angle_in, points=points, offset_ratio=bezier_offset)
-        bezier_coords = np.column_stack((xs_bezier, ys_bezier))
-
-        # 计算贝塞尔曲线的切线向量 (dx/dt, dy/dt)
-        t = np.linspace(0, 1, points)
-        dxdt, dydt = bezier_tangent(A, B, angle_out, angle_in, t, offset_ratio=bezier_offset)
+        # 弧长等间距的采样点，以及这些点所对应参数处的精确切线向量 (dx/dt, dy/dt)
+        xs_bezier, ys_bezier, dxdt, dydt = cubic_bezier_with_tangents(
+            A, B, angle_out, angle_in, offset_ratio=bezier_offset, points=points
+        )
+        base_path = BasePath(np.column_stack((xs_bezier, ys_bezier)), tangents=np.column_stack((dxdt, dydt)))
         
     else:
         # 环形路径：使用 oval_circle
@@ -72,49 +68,55 @@ def generate_photon_wave(line, loop=False):
         except ValueError as e:
             raise ValueError(f"生成环形路径失败: {e}")
 
-        # 对于非贝塞尔曲线，通过前后点差值来近似切线
-        # dxdt 和 dydt 的长度比 bezier_coords 短 1
-        dxdt = np.diff(bezier_coords[:, 0], prepend=bezier_coords[0, 0])
-        dydt = np.diff(bezier_coords[:, 1], prepend=bezier_coords[0, 1])
+        # 对于非贝塞尔曲线，切线由 BasePath 通过前后点差值近似
+        base_path = BasePath(bezier_coords)
 
     # --- 后续计算波浪的通用部分 ---
 
-    # 计算切线长度，并避免除以零
-    tangent_len = np.sqrt(dxdt**2 + dydt**2)
-    tangent_len[tangent_len == 0] = 1e-10 
-    
-    # 计算法线方向（垂直于切线）的单位向量：顺时针旋转90度
-    nx = dydt / tangent_len
-    ny = -dxdt / tangent_len
-    
-    # 计算沿曲线的近似弧长
-    dx_segments = np.diff(bezier_coords[:, 0], prepend=bezier_coords[0, 0])
-    dy_segments = np.diff(bezier_coords[:, 1], prepend=bezier_coords[0, 1])
-    seg_len = np.sqrt(dx_segments**2 + dy_segments**2)
-    arc_len = np.cumsum(seg_len)
+    # 沿曲线的弧长
+    arc_len = base_path.cumulative_length
+
+    # 根据初始和最终相位调整波长，计算波浪位移
+    wave_displacement = photon_wave_displacement(
+        arc_len, amplitude, nominal_wavelength, initial_phase_deg, final_phase_deg
+    )
     
-    total_arc_length = arc_len[-1]
+    # 波浪线坐标 = 曲线坐标 + 法线方向（切线顺时针旋转 90 度）* 波浪位移
+    return BasePath(base_path.offset(wave_displacement))
 
-    # 根据初始和最终相位调整波长
-    if nominal_wavelength <= 0 or total_arc_length == 0:
-        wave_displacement = np.zeros(points)
-    else:
-        phase_difference_rad = (final_phase_rad - initial_phase_rad) % (2 * np.pi)
-        if abs(phase_difference_rad) < 1e-9 or abs(phase_difference_rad - 2 * np.pi) < 1e-9:
-            target_half_cycles = round(total_arc_length * 2 / nominal_wavelength / 2.0) * 2.0 
-        else:
-            target_half_cycles = round((total_arc_length * 2 / nominal_wavelength - 1) / 2.0) * 2.0 + 1.0
-            
-        if target_half_cycles < 0.5:
-            target_half_cycles = 0.5
 
+def photon_wave_displacement(arc_len, amplitude, nominal_wavelength, initial_phase_deg=0.0, final_phase_deg=0.0):
+    """
+    光子波浪线沿法线方向的位移。波长会被微调，使整条线上的半周期数与起止相位相符。
+
+    参数:
+        arc_len: 累积弧长 (..., N)，最后一个值为总弧长。
+        amplitude, nominal_wavelength, initial_phase_deg, final_phase_deg:
+            标量，或可与 arc_len 广播的 (..., 1) 数组（批量计算时每条线一个值）。
+
+    返回:
+        与 arc_len 同形状的位移数组；波长非正或总弧长为零的线位移为零。
+    """
+    arc_len = np.asarray(arc_len, dtype=float)
+    total_arc_length = arc_len[..., -1:]
+    amplitude = np.asarray(amplitude, dtype=float)
+    nominal_wavelength = np.asarray(nominal_wavelength, dtype=float)
+    initial_phase_rad = np.deg2rad(initial_phase_deg)
+    final_phase_rad = np.deg2rad(final_phase_deg)
+
+    phase_difference_rad = (final_phase_rad - initial_phase_rad) % (2 * np.pi)
+    same_phase = (np.abs(phase_difference_rad) < 1e-9) | (np.abs(phase_difference_rad - 2 * np.pi) < 1e-9)
+    valid = (nominal_wavelength > 0) & (total_arc_length != 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        half_cycle_ratio = total_arc_length * 2 / nominal_wavelength
+        target_half_cycles = np.where(
+            same_phase,
+            np.round(half_cycle_ratio / 2.0) * 2.0,
+            np.round((half_cycle_ratio - 1) / 2.0) * 2.0 + 1.0,
+        )
+        target_half_cycles = np.maximum(target_half_cycles, 0.5)
         effective_wavelength = total_arc_length / (target_half_cycles / 2.0)
-        
-        # 计算波浪位移
         wave_displacement = amplitude * np.sin(2 * np.pi * arc_len / effective_wavelength + initial_phase_rad)
-    
-    # 波浪线坐标 = 曲线坐标 + 法线方向 * 波浪位移
-    xs_wave = bezier_coords[:, 0] + nx * wave_displacement
-    ys_wave = bezier_coords[:, 1] + ny * wave_displacement
-    
-    return np.column_stack((xs_wave, ys_wave))
\ No newline at end of file
+
+    return np.where(valid, wave_displacement, 0.0)
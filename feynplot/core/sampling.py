@@ -0,0 +1,189 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from feynplot.core.bezier import bezier_control_points, bezier_straight_mask
+from feynplot.default_settings.default_settings import renderer_default_settings
+
+# 未提供像素比例时（例如脱离 Axes 直接调用生成函数）使用的固定点数
+DEFAULT_POINTS = 2000
+# 每个波动周期 / 胶子圈至少的采样点数，保证波形不退化为折线
+MIN_POINTS_PER_CYCLE = 8
+# 点数向上取到 2 的 1/4 次幂阶梯（相邻档位相差约 19%），
+# 使长度相近的线使用相同点数，可以批量生成，缩放时也更容易命中几何缓存
+POINT_COUNT_STEPS_PER_OCTAVE = 4
+# 细节层级（LOD）：粗、中、细
+LOD_COARSE, LOD_MEDIUM, LOD_FINE = 0, 1, 2
+
+
+def estimate_bezier_length(control_points: np.ndarray) -> float:
+    """用弦长与控制多边形长度的平均值估计三次贝塞尔曲线的弧长。"""
+    P = np.asarray(control_points, dtype=float)
+    chord = float(np.linalg.norm(P[-1] - P[0]))
+    polygon = float(np.linalg.norm(np.diff(P, axis=0), axis=1).sum())
+    return 0.5 * (chord + polygon)
+
+
+def control_polygon_turning(control_points: np.ndarray) -> float:
+    """控制多边形的总转角（弧度），作为贝塞尔曲线总转角的上界。"""
+    legs = np.diff(np.asarray(control_points, dtype=float), axis=0)
+    legs = legs[np.linalg.norm(legs, axis=1) > 1e-12]
+    if len(legs) < 2:
+        return 0.0
+    angles = np.arctan2(legs[:, 1], legs[:, 0])
+    turns = np.diff(angles)
+    turns = (turns + np.pi) % (2 * np.pi) - np.pi
+    return float(np.abs(turns).sum())
+
+
+def estimate_ellipse_perimeter(a: float, b: float) -> float:
+    """Ramanujan 第二近似公式计算椭圆周长。"""
+    a, b = abs(float(a)), abs(float(b))
+    if a + b == 0:
+        return 0.0
+    h = ((a - b) / (a + b)) ** 2
+    return math.pi * (a + b) * (1 + 3 * h / (10 + math.sqrt(4 - 3 * h)))
+
+
+def points_per_cycle(amplitude_px: float, tolerance: float) -> float:
+    """
+    正弦波 / 胶子圈每个周期所需的点数。
+    波峰处曲率半径 R 与弦高误差 tol 满足 弦长 = sqrt(8 R tol)，
+    对正弦波和半径为振幅的圆都化简为 2π·sqrt(A / (8 tol))。
+    """
+    if amplitude_px <= 0:
+        return MIN_POINTS_PER_CYCLE
+    return max(MIN_POINTS_PER_CYCLE, 2 * math.pi * math.sqrt(amplitude_px / (8 * tolerance)))
+
+
+def adaptive_point_count(
+    length_px: float,
+    turning: float = 0.0,
+    cycles: float = 0.0,
+    per_cycle: float = 0.0,
+    tolerance: Optional[float] = None,
+    min_points: Optional[int] = None,
+    max_points: Optional[int] = None,
+) -> int:
+    """
+    根据屏幕上的弧长、基础曲线总转角以及波动周期数计算采样点数。
+
+    参数:
+        length_px: 路径在屏幕上的长度（像素）。
+        turning: 基础曲线的总转角（弧度）；弯曲部分按 sqrt(Θ·L / (8 tol)) 取点。
+        cycles: 路径上的波动周期数（光子/W/Z 波数，胶子圈数）。
+        per_cycle: 每个周期需要的点数，通常由 points_per_cycle 给出。
+        tolerance: 允许的最大偏差（像素），默认取 SAMPLING_TOLERANCE_PX。
+    """
+    tol = tolerance if tolerance else renderer_default_settings['SAMPLING_TOLERANCE_PX']
+    lo = min_points if min_points is not None else renderer_default_settings['SAMPLING_MIN_POINTS']
+    hi = max_points if max_points is not None else renderer_default_settings['SAMPLING_MAX_POINTS']
+
+    n_curve = math.sqrt(max(turning, 0.0) * max(length_px, 0.0) / (8 * tol))
+    n_wave = max(cycles, 0.0) * per_cycle
+    n = int(math.ceil(n_curve + n_wave)) + 1
+    return int(min(max(n, lo), hi))
+
+
+def quantize_point_count(n: int, max_points: Optional[int] = None) -> int:
+    """把点数向上取整到阶梯值 round(2^(k/4))，不超过 max_points。"""
+    hi = max_points if max_points is not None else renderer_default_settings['SAMPLING_MAX_POINTS']
+    if n <= 2:
+        return int(min(max(n, 2), hi))
+    k = math.ceil(math.log2(n) * POINT_COUNT_STEPS_PER_OCTAVE - 1e-9)
+    step = round(2 ** (k / POINT_COUNT_STEPS_PER_OCTAVE))
+    while step < n:
+        k += 1
+        step = round(2 ** (k / POINT_COUNT_STEPS_PER_OCTAVE))
+    return int(min(step, hi))
+
+
+def lod_level(length_px: float) -> int:
+    """按线条的屏幕长度（像素）选择细节层级 LOD_COARSE / LOD_MEDIUM / LOD_FINE。"""
+    if length_px <= renderer_default_settings['LOD_COARSE_MAX_PX']:
+        return LOD_COARSE
+    if length_px <= renderer_default_settings['LOD_MEDIUM_MAX_PX']:
+        return LOD_MEDIUM
+    return LOD_FINE
+
+
+def _lod_max_px(level: int) -> Optional[float]:
+    """层级对应的屏幕长度上限；细层级没有上限，返回 None。"""
+    if level == LOD_COARSE:
+        return renderer_default_settings['LOD_COARSE_MAX_PX']
+    if level == LOD_MEDIUM:
+        return renderer_default_settings['LOD_MEDIUM_MAX_PX']
+    return None
+
+
+def line_sample_count(line, px_per_data: Optional[float], tolerance: Optional[float] = None, lod: bool = True) -> int:
+    """
+    为线条选择采样点数：没有波形装饰的直线段只需 2 个点，长胶子线按圈数与半径取点。
+    px_per_data 为 None 或无效时回退到 DEFAULT_POINTS。
+
+    lod 为 True 时按屏幕长度选择细节层级：粗/中等层级按该层级的长度上限采样，
+    同一层级内缩放得到相同点数、直接复用已生成的路径，且不会低于实际长度所需的点数；
+    细层级按实际长度采样，放大时才逐步生成更密的路径。
+    """
+    from feynplot.core.line import GluonLine, PhotonLine, WPlusLine, WMinusLine, ZBosonLine
+
+    decorated = isinstance(line, (GluonLine, PhotonLine, WPlusLine, WMinusLine, ZBosonLine))
+    if not decorated and not getattr(line, 'loop', False):
+        P = bezier_control_points(
+            (line.v_start.x, line.v_start.y), (line.v_end.x, line.v_end.y),
+            line.angleOut, line.angleIn, getattr(line, 'bezier_offset', 0.0),
+        )
+        if bezier_straight_mask(P):
+            return 2
+
+    if px_per_data is None or not np.isfinite(px_per_data) or px_per_data <= 0:
+        return DEFAULT_POINTS
+    tol = tolerance if tolerance else renderer_default_settings['SAMPLING_TOLERANCE_PX']
+
+    if getattr(line, 'loop', False):
+        a, b = abs(float(line.a)), abs(float(line.b))
+        length = estimate_ellipse_perimeter(a, b)
+        # 椭圆最小曲率半径为 短轴² / 长轴，按整圈 2π 的转角折算成等效总转角
+        r_min = min(a, b) ** 2 / max(a, b) if max(a, b) > 0 else 0.0
+        turning = length / r_min if r_min > 0 else 0.0
+    else:
+        P = bezier_control_points(
+            (line.v_start.x, line.v_start.y), (line.v_end.x, line.v_end.y),
+            line.angleOut, line.angleIn, getattr(line, 'bezier_offset', 0.0),
+        )
+        length = estimate_bezier_length(P)
+        turning = control_polygon_turning(P)
+
+    level_max_px = _lod_max_px(lod_level(length * px_per_data)) if lod else None
+    if level_max_px is not None and length > 0:
+        px_per_data = level_max_px / length
+    length_px = length * px_per_data
+    cycles, per_cycle, min_points = 0.0, 0.0, None
+
+    if isinstance(line, GluonLine):
+        squash = abs(float(getattr(line, 'squash_ratio', 1.0))) or 1.0
+        radius = abs(float(line.amplitude)) * min(1.0, squash)
+        cycles = abs(float(line.n_cycles)) + 1
+        per_cycle = points_per_cycle(radius * px_per_data, tol)
+        # 两端按顶点圆的解析交点截断，与采样间距无关；设置了直线段比例时，
+        # 螺旋段仍由采样点与圆的最近点截断，此时采样间距直接决定端点误差
+        if getattr(line, 'start_straight_ratio', 0.0) or getattr(line, 'end_straight_ratio', 0.0):
+            min_points = int(math.ceil(length_px / (4 * tol)))
+    elif isinstance(line, PhotonLine):
+        wavelength = float(getattr(line, 'wavelength', 0.5))
+        if wavelength > 0:
+            cycles = length / wavelength + 1
+            per_cycle = points_per_cycle(abs(float(line.amplitude)) * px_per_data, tol)
+    elif isinstance(line, (WPlusLine, WMinusLine, ZBosonLine)):
+        amplitude_px = abs(float(getattr(line, 'zigzag_amplitude', 0.2))) * px_per_data
+        cycles = abs(float(getattr(line, 'zigzag_frequency', 2.0))) * length + 1
+        per_cycle = points_per_cycle(amplitude_px, tol)
+        if not getattr(line, 'wz_use_wavy', True):
+            # 折线拐角处的截角误差约为 斜率·间距/2，斜率 = 4A/λ
+            per_cycle = max(per_cycle, 2 * amplitude_px / tol)
+
+    n = adaptive_point_count(length_px, turning, cycles, per_cycle, tolerance=tol)
+    if min_points is not None:
+        n = min(max(n, min_points), renderer_default_settings['SAMPLING_MAX_POINTS'])
+    return quantize_point_count(n)
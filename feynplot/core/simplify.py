@@ -0,0 +1,70 @@
+import numpy as np
+
+# 初始区间长度：先按固定间隔把折线切成若干区间再做 RDP，限制迭代轮数
+# （单个区间从整条线开始时，波浪线每一轮只能剥掉一个波峰）
+RDP_INITIAL_SPAN = 32
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """各点到对应线段 a-b 的距离（线段退化为一点时即到该点的距离）。"""
+    ab = b - a
+    ap = points - a
+    ab_len_sq = np.sum(ab**2, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        w = np.where(ab_len_sq > 0, np.sum(ap * ab, axis=1) / ab_len_sq, 0.0)
+    closest = a + np.clip(w, 0.0, 1.0)[:, None] * ab
+    return np.sqrt(np.sum((points - closest)**2, axis=1))
+
+
+def rdp_mask(points, tolerance: float) -> np.ndarray:
+    """
+    Ramer–Douglas–Peucker 折线简化，返回保留点的布尔掩码。
+    每一轮同时处理所有待细分的区间：对区间内部点求到弦的距离，
+    最大距离超过 tolerance 的区间在该点处一分为二，直到所有区间都满足容差。
+    初始区间为每 RDP_INITIAL_SPAN 个点一段，这些分段点总是保留。
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    if n < 3 or not tolerance > 0:
+        keep[:] = True
+        return keep
+
+    bounds = np.unique(np.append(np.arange(0, n - 1, RDP_INITIAL_SPAN), n - 1))
+    keep[bounds] = True
+    starts, ends = bounds[:-1], bounds[1:]
+    while len(starts):
+        counts = ends - starts - 1
+        has_interior = counts > 0
+        starts, ends, counts = starts[has_interior], ends[has_interior], counts[has_interior]
+        if len(starts) == 0:
+            break
+
+        # 把所有区间的内部点展开成一个数组，interval 记录每个点所属的区间
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        interval = np.repeat(np.arange(len(starts)), counts)
+        interior = starts[interval] + 1 + (np.arange(counts.sum()) - offsets[interval])
+        distances = _segment_distances(points[interior], points[starts[interval]], points[ends[interval]])
+
+        # 每个区间的最大距离及其位置（取第一个最大值）
+        max_distance = np.maximum.reduceat(distances, offsets)
+        is_max = distances == max_distance[interval]
+        first = np.flatnonzero(is_max)
+        owner = interval[first]
+        first = first[np.concatenate(([True], owner[1:] != owner[:-1]))]
+        pivots = interior[first]
+
+        split = max_distance > tolerance
+        pivots = pivots[split]
+        keep[pivots] = True
+        starts, ends = np.concatenate((starts[split], pivots)), np.concatenate((pivots, ends[split]))
+    return keep
+
+
+def simplify_polyline(points, tolerance: float) -> np.ndarray:
+    """按 tolerance（与 points 相同的单位）用 RDP 简化折线，保留首尾点。"""
+    points = np.asarray(points, dtype=float)
+    return points[rdp_mask(points, tolerance)]
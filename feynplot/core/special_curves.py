@@ -40,4 +40,4 @@ def compute_path_length(path):
     """
     diffs = np.diff(path, axis=0)
     segment_lengths = np.linalg.norm(diffs, axis=1)
-    return np.sum(segment_lengths)
\ No newline at end of file
+    return np.sum(segment_lengths)
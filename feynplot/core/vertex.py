@@ -19,6 +19,8 @@ class VertexType(Enum):
 class Vertex:
     # 用于生成唯一ID的计数器
     _vertex_counter_global = 0
+    # 修改后相连线条需要重新生成几何的属性
+    _GEOMETRY_ATTRS = frozenset({'x', 'y'})
 
     def __init__(self, x, y, vertex_type=VertexType.ELECTROMAGNETIC, label="",
                  coupling_constant=1.0, symmetry_factor=1,
@@ -93,6 +95,12 @@ class Vertex:
 
         # self.scatterConfig: Dict[str, Any] = kwargs
 
+    def __setattr__(self, name, value):
+        # 位置变化时递增几何版本号，渲染时只重新生成端点版本号变化的线条
+        if name in self._GEOMETRY_ATTRS:
+            self.__dict__['geometry_version'] = self.__dict__.get('geometry_version', 0) + 1
+        super().__setattr__(name, value)
+
     def position(self):
         return (self.x, self.y)
 
@@ -1,3 +1,34 @@
 renderer_default_settings = {
     "DEFAULT_SCALE_FACTOR": 1.08,
-}
\ No newline at end of file
+    # 线条几何缓存最多保留的路径条目数（LRU 淘汰）
+    "GEOMETRY_CACHE_SIZE": 1024,
+    # 胶子螺旋模板缓存的最大条目数（以起点为原点的形状，只差平移的胶子线共享）
+    "HELIX_TEMPLATE_CACHE_SIZE": 256,
+    # 标签、文本尺寸缓存的最大条目数（键为渲染后的字符串、字体、字号与 dpi）
+    "TEXT_METRICS_CACHE_SIZE": 1024,
+    # mathtext 解析缓存的最大条目数（Matplotlib 默认只有 50 条，标签多于此数时每帧都要重新解析）
+    "MATHTEXT_CACHE_SIZE": 1024,
+    # 并行生成线条几何：工作线程数（0 表示按 CPU 核数，最多 4；1 表示始终串行），
+    # 线条数达到 GEOMETRY_PARALLEL_MIN_LINES 才并行，小图串行；批量导出可改用进程池
+    "GEOMETRY_WORKERS": 0,
+    "GEOMETRY_PARALLEL_MIN_LINES": 64,
+    "GEOMETRY_USE_PROCESSES": False,
+    # 自适应采样：折线与理想曲线之间允许的最大偏差（像素）
+    "SAMPLING_TOLERANCE_PX": 0.25,
+    # 自适应采样的点数上下限
+    "SAMPLING_MIN_POINTS": 16,
+    "SAMPLING_MAX_POINTS": 2000,
+    # 细节层级：屏幕长度不超过这些像素数的线条分别使用粗/中等层级（按该长度采样，缩放时不必重新生成），
+    # 更长的线条使用细层级，按实际长度自适应采样
+    "LOD_COARSE_MAX_PX": 64,
+    "LOD_MEDIUM_MAX_PX": 256,
+    # 费米子线（单条三次贝塞尔曲线）直接绘制为 CURVE4 路径，而不是采样后的折线
+    "NATIVE_BEZIER_PATHS": True,
+    # 折线简化（RDP）的容差（像素）；屏幕显示与导出分别开关，导出默认保留完整分辨率
+    "SIMPLIFY_TOLERANCE_PX": 0.2,
+    "SIMPLIFY_SCREEN": True,
+    "SIMPLIFY_EXPORT": False,
+    # 合并绘制：同样式的散点顶点、折线与贝塞尔曲线各自并入一个共享的 collection，
+    # artist 数量与绘制时间随样式组而不是图元数量增长
+    "BATCH_ARTISTS": True,
+}
@@ -0,0 +1,228 @@
+import weakref
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import Collection, LineCollection, PathCollection
+from matplotlib.transforms import IdentityTransform
+
+# 共享 collection -> 所属的批次，供导出前重新简化折线、拾取时反查图元使用
+_collection_batches = weakref.WeakKeyDictionary()
+
+
+def collection_batch(collection) -> Optional["ArtistBatch"]:
+    """collection 所属的批次；不是批次创建的 collection 返回 None。"""
+    try:
+        return _collection_batches.get(collection)
+    except TypeError:
+        return None
+
+
+class BatchMember:
+    """
+    图元在共享 collection 中的一项（散点中的一个点、LineCollection 中的一条折线或 PathCollection 中的一条路径），
+    在 artist 注册表中代替该图元原来的独立 artist：remove() 从批次中删除这一项，set_data() 就地更新其位置。
+    """
+
+    __slots__ = ('batch', 'key')
+
+    def __init__(self, batch: "ArtistBatch", key: Hashable):
+        self.batch = batch
+        self.key = key
+
+    @property
+    def axes(self) -> Axes:
+        return self.batch.ax
+
+    @property
+    def collection(self) -> Optional[Collection]:
+        return self.batch.collection
+
+    def set_data(self, data, full=None):
+        self.batch.update(self.key, data, full)
+
+    def remove(self):
+        self.batch.remove(self.key, self)
+
+
+class ArtistBatch:
+    """
+    同一样式组的图元共用的一个 collection。各项的位置与颜色、线宽等逐项属性保存在 items 中，
+    增删或更新后标记为 dirty，在 sync() 时一次性写入 collection（没有成员时从 Axes 上移除）。
+    """
+
+    def __init__(self, ax: Axes, shared: Dict[str, Any]):
+        self.ax = ax
+        self.shared = shared  # 同组共享的属性（zorder、线型、端点样式等）
+        self.items: Dict[Hashable, Dict[str, Any]] = {}
+        self._members: Dict[Hashable, BatchMember] = {}
+        self.collection: Optional[Collection] = None
+        self.dirty = False
+
+    def add(self, key: Hashable, item: Dict[str, Any]) -> BatchMember:
+        self.items[key] = item
+        member = self._members[key] = BatchMember(self, key)
+        self.dirty = True
+        return member
+
+    def update(self, key: Hashable, data, full=None):
+        item = self.items.get(key)
+        if item is not None:
+            item['data'] = data
+            if full is not None:
+                item['full'] = full
+            self.dirty = True
+
+    def remove(self, key: Hashable, member: Optional[BatchMember] = None):
+        """删除一项；给出 member 时只在该项仍属于它时删除（图元重新绘制时新成员可能先以同一键加入）。"""
+        if member is not None and self._members.get(key) is not member:
+            return
+        if self.items.pop(key, None) is not None:
+            self._members.pop(key, None)
+            self.dirty = True
+
+    def key_at(self, index: int) -> Optional[Hashable]:
+        """collection 中第 index 项对应的成员键。"""
+        keys = list(self.items)
+        return keys[index] if 0 <= index < len(keys) else None
+
+    def sync(self, rank: Optional[Callable[[Hashable], Any]] = None) -> bool:
+        """
+        把成员写入 collection。rank 给出时按其排序成员，使叠放次序与逐个绘制时一致。
+        返回 collection 是否发生了变化。
+        """
+        if not self.dirty:
+            return False
+        self.dirty = False
+        if rank is not None:
+            self.items = dict(sorted(self.items.items(), key=lambda kv: rank(kv[0])))
+        if not self.items:
+            if self.collection is not None:
+                self.collection.remove()
+                self.collection = None
+            return True
+        items = list(self.items.values())
+        if self.collection is None:
+            self.collection = self._create(items)
+            self.ax.add_collection(self.collection, autolim=False)
+            _collection_batches[self.collection] = self
+        else:
+            self._update(items)
+        return True
+
+    def _create(self, items: List[Dict[str, Any]]) -> Collection:
+        raise NotImplementedError
+
+    def _update(self, items: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+
+class PointBatch(ArtistBatch):
+    """
+    同一标记形状的散点顶点：一个 PathCollection，逐点给出位置、大小、填充色、边框色与边框宽度。
+    所有点的某项属性相同时只给出一个值：大小、颜色与线宽都只有一个值时 Matplotlib 用 draw_markers
+    绘制（标记只光栅化一次并对齐像素），与逐个 ax.scatter 的结果一致。
+    """
+
+    def _create(self, items):
+        return PathCollection(
+            [self.shared['marker']], sizes=self._values(items, 'size'),
+            offsets=[item['data'] for item in items],
+            offset_transform=self.ax.transData, transform=IdentityTransform(),
+            facecolors=self._values(items, 'facecolor'), edgecolors=self._values(items, 'edgecolor'),
+            linewidths=self._values(items, 'linewidth'), zorder=self.shared['zorder'],
+        )
+
+    def _update(self, items):
+        self.collection.set_offsets([item['data'] for item in items])
+        self.collection.set_sizes(np.array(self._values(items, 'size')))
+        self.collection.set_facecolor(self._values(items, 'facecolor'))
+        self.collection.set_edgecolor(self._values(items, 'edgecolor'))
+        self.collection.set_linewidth(self._values(items, 'linewidth'))
+
+    @staticmethod
+    def _values(items, name: str) -> list:
+        # 相对单位换算出的线宽、大小带有浮点舍入误差，按相对误差比较
+        values = [item[name] for item in items]
+        return values[:1] if np.allclose(values, values[0], rtol=1e-9, atol=0) else values
+
+
+class PolylineBatch(ArtistBatch):
+    """同一线型、zorder 与端点样式的折线：一个 LineCollection，逐条给出颜色与线宽。"""
+
+    def _create(self, items):
+        return LineCollection(
+            [item['data'] for item in items],
+            colors=[item['color'] for item in items],
+            linewidths=[item['linewidth'] for item in items],
+            linestyles=self.shared['linestyle'], capstyle=self.shared['capstyle'],
+            joinstyle=self.shared['joinstyle'], zorder=self.shared['zorder'],
+        )
+
+    def _update(self, items):
+        self.collection.set_segments([item['data'] for item in items])
+        self.collection.set_edgecolor([item['color'] for item in items])
+        self.collection.set_linewidth([item['linewidth'] for item in items])
+
+    def resimplify(self, simplify: Callable[[np.ndarray], np.ndarray]):
+        """按 simplify 由完整点集重新生成各折线（导出前后切换折线简化设置时使用）。"""
+        for item in self.items.values():
+            if item.get('full') is not None:
+                item['data'] = simplify(item['full'])
+        if self.collection is not None:
+            self.collection.set_segments([item['data'] for item in self.items.values()])
+
+
+class CurveBatch(ArtistBatch):
+    """同一线型、zorder 与端点样式的原生贝塞尔曲线：一个不填充的 PathCollection（数据坐标），保留 CURVE4 路径。"""
+
+    def _create(self, items):
+        return PathCollection(
+            [item['data'] for item in items], facecolors='none',
+            edgecolors=[item['color'] for item in items],
+            linewidths=[item['linewidth'] for item in items],
+            linestyles=self.shared['linestyle'], capstyle=self.shared['capstyle'],
+            joinstyle=self.shared['joinstyle'], zorder=self.shared['zorder'],
+            transform=self.ax.transData,
+        )
+
+    def _update(self, items):
+        self.collection.set_paths([item['data'] for item in items])
+        self.collection.set_edgecolor([item['color'] for item in items])
+        self.collection.set_linewidth([item['linewidth'] for item in items])
+
+
+class ArtistBatches:
+    """
+    一个 Axes 上全部的样式组。样式组的键由批次类型与共享属性组成，
+    绘制时间与 artist 数量随样式组的数量而不是图元数量增长。
+    """
+
+    def __init__(self):
+        self._batches: Dict[Tuple, ArtistBatch] = {}
+
+    def __len__(self):
+        return len(self._batches)
+
+    def add(self, ax: Axes, batch_type: type, style: Hashable, shared: Dict[str, Any], key: Hashable,
+            item: Dict[str, Any]) -> BatchMember:
+        """
+        把一项加入样式组，返回代表这一项的 BatchMember。
+        style 是共享属性 shared 的可哈希签名（例如标记路径用其顶点数据表示），相同 style 的项合并到同一个 collection。
+        """
+        group = (batch_type, id(ax), style)
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = batch_type(ax, shared)
+        return batch.add(key, item)
+
+    def sync(self, rank: Optional[Callable[[Hashable], Any]] = None) -> List[ArtistBatch]:
+        """把所有 dirty 的样式组写入各自的 collection，删除没有成员的组，返回发生变化的组。"""
+        changed = [batch for batch in self._batches.values() if batch.sync(rank)]
+        for group, batch in list(self._batches.items()):
+            if not batch.items:
+                del self._batches[group]
+        return changed
+
+    def collections(self) -> List[Collection]:
+        return [batch.collection for batch in self._batches.values() if batch.collection is not None]
@@ -0,0 +1,165 @@
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.text import Annotation, Text
+
+from feynplot.core.geometry_cache import _hashable
+from feynplot.drawing.artist_batches import BatchMember
+
+
+def element_key(element) -> Hashable:
+    """图元在注册表中的键：优先使用 element.id，没有 id 的图元（例如未分配 id 的文本）使用对象标识。"""
+    return getattr(element, 'id', None) or id(element)
+
+
+def state_signature(element, exclude: FrozenSet[str] = frozenset()) -> Tuple:
+    """
+    图元公开属性组成的可比较元组（numpy 数组等转换为元组），用于判断样式是否变化。
+    exclude 中的属性（位置、几何参数等）不参与比较，它们的变化通过就地更新处理。
+    """
+    return tuple((name, _hashable(value)) for name, value in vars(element).items()
+                 if not name.startswith('_') and name not in exclude)
+
+
+class ElementArtists:
+    """
+    一个图元（顶点、线条或文本）在 Axes 上的全部 artist，
+    以及绘制时的样式签名 style_key 与位置签名 position_key。
+    """
+
+    __slots__ = ('element', 'artists', 'style_key', 'position_key')
+
+    def __init__(self, element, artists: List[Artist], style_key: Any, position_key: Any):
+        self.element = element
+        self.artists = artists
+        self.style_key = style_key
+        self.position_key = position_key
+
+    @property
+    def label(self) -> Optional[Text]:
+        """图元的标签 Text（箭头 Annotation 也是 Text 的子类，这里排除）。"""
+        for artist in self.artists:
+            if isinstance(artist, Text) and not isinstance(artist, Annotation):
+                return artist
+        return None
+
+    def remove(self):
+        """从 Axes 上移除全部 artist。"""
+        for artist in self.artists:
+            try:
+                artist.remove()
+            except (ValueError, NotImplementedError):
+                # 已经被移除（例如 Axes 被外部清空）
+                pass
+        self.artists = []
+
+
+class ArtistRegistry:
+    """
+    retained 模式渲染的 artist 注册表：按 (类别, 图元 id) 保存每个图元当前的 artist，
+    渲染时未变化的图元直接保留，只对新增、删除或变化的图元增删 artist。
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Hashable], ElementArtists] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, kind: str, key: Hashable) -> Optional[ElementArtists]:
+        return self._entries.get((kind, key))
+
+    def put(self, kind: str, key: Hashable, entry: ElementArtists):
+        """登记图元的 artist；同一键原有的 artist 会先从 Axes 上移除。"""
+        old = self._entries.get((kind, key))
+        if old is not None and old is not entry:
+            old.remove()
+        self._entries[(kind, key)] = entry
+
+    def discard(self, kind: str, key: Hashable):
+        entry = self._entries.pop((kind, key), None)
+        if entry is not None:
+            entry.remove()
+
+    def prune(self, kind: str, live_keys) -> List[Hashable]:
+        """移除 kind 类别中不在 live_keys 里的图元（已从图中删除），返回被移除图元的键。"""
+        stale = [key for (entry_kind, key) in self._entries if entry_kind == kind and key not in live_keys]
+        for key in stale:
+            self.discard(kind, key)
+        return stale
+
+    def entries(self, kind: str) -> Iterator[ElementArtists]:
+        return (entry for (entry_kind, _), entry in self._entries.items() if entry_kind == kind)
+
+    def clear(self):
+        """移除全部 artist（视图比例等全局状态变化时整体重建）。"""
+        for entry in self._entries.values():
+            entry.remove()
+        self._entries.clear()
+
+
+# collect_new_artists 的收集列表栈（嵌套时栈顶为当前列表）；artist 只在绘图线程中添加
+_collectors: List[List[Artist]] = []
+# restore_draw_order 调整前各 artist 的 zorder
+_base_zorders: "weakref.WeakKeyDictionary[Artist, float]" = weakref.WeakKeyDictionary()
+# restore_draw_order 对 zorder 的总偏移量：远小于图元之间 zorder 的差值
+_ZORDER_SPAN = 1e-6
+
+
+def track_artist(artist):
+    """
+    登记绘图函数刚添加到 Axes 上的 artist（ax.plot / ax.text / ax.add_patch 等的返回值），返回 artist 本身。
+    处于 collect_new_artists 的 with 块中时记入当前的收集列表，否则什么也不做。
+    """
+    if _collectors and artist is not None:
+        _collectors[-1].append(artist)
+    return artist
+
+
+@contextmanager
+def collect_new_artists(ax: Axes) -> Iterator[List[Artist]]:
+    """
+    收集 with 块中经 track_artist 登记、添加到 ax 的 artist（按添加顺序）。
+    块内抛出异常时移除已添加的 artist，避免在 Axes 上留下不受注册表管理的残留。
+    """
+    new: List[Artist] = []
+    _collectors.append(new)
+    try:
+        yield new
+    except BaseException:
+        for artist in new:
+            if artist.axes is ax:
+                artist.remove()
+        raise
+    finally:
+        _collectors.pop()
+
+
+def restore_draw_order(ax: Axes, ordered_entries: Sequence[ElementArtists]):
+    """
+    按图元顺序微调 artist 的 zorder，使 zorder 相同的 artist 的叠放次序与整体重新绘制时一致
+    （Matplotlib 按 zorder 稳定排序后绘制，整体绘制时即按添加顺序）。
+    第 i 个（共 n 个）artist 的 zorder 为其原值减去 (n - i)·_ZORDER_SPAN/(n + 1)：原 zorder 不同的 artist 先后不变，
+    并且仍排在 zorder 相同的坐标轴、网格等不属于任何图元的 artist 之前。
+    合并绘制的图元以共享 collection 代替，collection 排在其第一个成员所属图元的位置。
+    """
+    ordered = []
+    managed = set()
+    for entry in ordered_entries:
+        for artist in entry.artists:
+            if isinstance(artist, BatchMember):
+                artist = artist.collection
+            if artist is not None and artist.axes is ax and id(artist) not in managed:
+                ordered.append(artist)
+                managed.add(id(artist))
+    step = _ZORDER_SPAN / (len(ordered) + 1)
+    for index, artist in enumerate(ordered):
+        base = _base_zorders.get(artist)
+        if base is None:
+            base = _base_zorders[artist] = artist.get_zorder()
+        zorder = base - (len(ordered) - index) * step
+        if artist.get_zorder() != zorder:
+            artist.set_zorder(zorder)
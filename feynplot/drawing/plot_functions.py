@@ -1,6 +1,10 @@
+import weakref
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.lines import Line2D
+import matplotlib.text as mtext
 import matplotlib.patches as mpatches
 from feynplot_gui.debug_utils import cout
 from feynplot.shared.common_functions import str2latex
@@ -10,7 +14,11 @@ from matplotlib.text import Text
 from matplotlib.axes import Axes
 from feynplot.default_settings.default_settings import renderer_default_settings
 from typing import Union
-from feynplot.drawing.styles.arrow_styles import FishtailArrow
+from feynplot.drawing.styles.arrow_styles import fishtail_arrow
+from feynplot.drawing.artist_batches import (
+    ArtistBatches, BatchMember, CurveBatch, PointBatch, PolylineBatch, collection_batch
+)
+from feynplot.drawing.artist_registry import track_artist
 
 scaling_factor = renderer_default_settings["DEFAULT_SCALE_FACTOR"]
 
@@ -24,6 +32,11 @@ from feynplot.core.gluon_methods import generate_gluon_helix
 from feynplot.core.photon_methods import generate_photon_wave
 from feynplot.core.WZ_methods import generate_WZ_zigzag
 from feynplot.core.fermion_methods import generate_fermion_line
+from feynplot.core.geometry_cache import cached_line_geometry
+from feynplot.core.sampling import line_sample_count
+from feynplot.core.batch_paths import prefetch_line_geometry
+from feynplot.core.base_path import BasePath, BezierPath
+from feynplot.core.simplify import simplify_polyline
 import mplhep as hep
 
 from feynplot.drawing.fontSettings import *
@@ -35,8 +48,12 @@ highlight_color = 'red'
 _RENDER_KWARGS_KEYS = frozenset({
     'selected_label_id', 'pre_render', 'zoom_times', 'use_relative_unit',
     'target_xlim', 'target_ylim', 'auto_scale', 'skip_navigation_bar',
+    'sampling_tolerance', 'sample_counts', 'native_bezier', 'simplify', 'batch_artists',
 })
 
+# ax.plot 绘制的折线 artist -> 完整分辨率的路径点，导出时按导出设置重新简化
+_polyline_full_points = weakref.WeakKeyDictionary()
+
 
 def _pop_render_kwargs(kwargs: dict) -> None:
     """从 kwargs 中移除 renderer 专用参数，避免传入 matplotlib 导致错误。"""
@@ -44,6 +61,47 @@ def _pop_render_kwargs(kwargs: dict) -> None:
         kwargs.pop(k, None)
 
 
+def _sample_count(ax: plt.Axes, line: Line, kwargs: dict) -> int:
+    """
+    根据当前 Axes 的像素比例与 sampling_tolerance（像素）确定线条的采样点数；
+    若 kwargs 中带有 prepare_line_geometry 预先算好的 sample_counts，则直接使用。
+    """
+    sample_counts = kwargs.get('sample_counts')
+    if sample_counts and id(line) in sample_counts:
+        return sample_counts[id(line)]
+    return line_sample_count(line, get_px_per_data(ax), kwargs.get('sampling_tolerance'))
+
+
+def prepare_line_geometry(ax: plt.Axes, lines: List[Line], **kwargs) -> Dict[int, int]:
+    """
+    逐条绘制前调用：确定所有线条的采样点数，并把缓存中缺失的几何按风格批量生成、写入几何缓存。
+    返回 id(line) -> 采样点数，作为 sample_counts 传给各绘制函数，保证绘制时使用同一点数并命中缓存。
+    """
+    px_per_data = get_px_per_data(ax)
+    tolerance = kwargs.get('sampling_tolerance')
+    sample_counts = {id(line): line_sample_count(line, px_per_data, tolerance) for line in lines}
+    prefetch_line_geometry(lines, sample_counts)
+    return sample_counts
+
+
+def prepare_export_line_geometry(ax: plt.Axes, lines: List[Line], scale: Optional[float], **kwargs) -> Dict[int, int]:
+    """
+    导出前调用：按导出分辨率确定采样点数并批量生成几何，返回值的用法同 prepare_line_geometry。
+    scale 为导出像素与屏幕像素之比（例如以 600 dpi 保存 100 dpi 的图时为 6）；
+    scale 为 None 时（矢量格式，查看时可以任意放大）弯曲的线回退到固定点数 DEFAULT_POINTS。
+    细节层级按屏幕长度选择，粗/中层级的点数在导出分辨率下会显出折角，导出时一律按细层级（lod=False）采样。
+    """
+    px_per_data = get_px_per_data(ax)
+    if scale is not None and px_per_data is not None:
+        px_per_data *= scale
+    else:
+        px_per_data = None
+    tolerance = kwargs.get('sampling_tolerance')
+    sample_counts = {id(line): line_sample_count(line, px_per_data, tolerance, lod=False) for line in lines}
+    prefetch_line_geometry(lines, sample_counts)
+    return sample_counts
+
+
 def draw_photon_wave(ax, line: PhotonLine, line_plot_options: dict, label_text_options: dict,  use_relative_unit: bool = True, **kwargs):
     # 复制字典以避免修改原始对象内部的配置
     current_line_plot_options = line_plot_options.copy()
@@ -64,11 +122,10 @@ def draw_photon_wave(ax, line: PhotonLine, line_plot_options: dict, label_text_o
         current_label_text_options['zorder'] = original_zorder + 11
 
     # 获取光子波的路径点
-    wave_path = generate_photon_wave(line, loop=line.loop)
-    x_wave, y_wave = wave_path[:, 0], wave_path[:, 1]
+    wave_path = cached_line_geometry(line, generate_photon_wave, loop=line.loop, points=_sample_count(ax, line, kwargs))
 
     # 绘制光子波的路径，使用调整后的属性
-    line.set_plot_points(x_wave, y_wave)
+    line.set_plot_path(wave_path)
     drawn_line = draw_line(ax, line=line, line_plot_options=current_line_plot_options, use_relative_unit=use_relative_unit, **kwargs)
     drawn_text = draw_line_label(ax, line, label_text_options,  **kwargs) # 绘制标签
     return drawn_line, drawn_text
@@ -93,12 +150,11 @@ def draw_gluon_line(ax, line: GluonLine, line_plot_options: dict, label_text_opt
         current_label_text_options['zorder'] = original_zorder + 11
 
     # 获取胶子线的路径点
-    bezire_path, helix_path = line.get_plot_path()
-    x_helix, y_helix = helix_path[:, 0], helix_path[:, 1]
+    bezire_path, helix_path = line.get_plot_path(points=_sample_count(ax, line, kwargs))
 
     # 绘制胶子线的路径
-    line.set_plot_points(x_helix, y_helix)
-    drawn_line = draw_line(ax, line, current_line_plot_options)
+    line.set_plot_path(helix_path)
+    drawn_line = draw_line(ax, line, current_line_plot_options, **_line_render_flags(kwargs))
 
     drawn_text = draw_line_label(ax, line, label_text_options, **kwargs) # 绘制标签
     return drawn_line, drawn_text 
@@ -113,7 +169,7 @@ def draw_WZ_zigzag_line(ax, line: Line, line_plot_options: dict, label_text_opti
     original_zorder = current_line_plot_options.get('zorder', 1)
 
     # 调用 generate_WZ_zigzag 获取所有路径
-    zigzag_path, base_path = generate_WZ_zigzag(line) 
+    zigzag_path, base_path = cached_line_geometry(line, generate_WZ_zigzag, points=_sample_count(ax, line, kwargs))
 
     # --- 绘制高分辨率贝塞尔曲线 (背景线) ---
     high_res_bezier_plot_options = current_line_plot_options.copy() # 基于当前线条属性复制
@@ -134,9 +190,8 @@ def draw_WZ_zigzag_line(ax, line: Line, line_plot_options: dict, label_text_opti
         current_label_text_options['zorder'] = original_zorder + 11 # 标签的高亮 Z-order
 
     # --- 绘制锯齿路径 (主要线条) ---
-    x_zig, y_zig = zigzag_path[:, 0], zigzag_path[:, 1]
-    line.set_plot_points(x_zig, y_zig)
-    drawn_line = draw_line(ax, line, current_line_plot_options)
+    line.set_plot_path(zigzag_path)
+    drawn_line = draw_line(ax, line, current_line_plot_options, **_line_render_flags(kwargs))
      
 
     drawn_text = draw_line_label(ax, line, label_text_options, use_relative_unit=use_relative_unit, **kwargs) # 绘制标签
@@ -164,48 +219,24 @@ def draw_fermion_line(ax, line: FermionLine, line_plot_options: dict, label_text
         current_label_text_options['zorder'] = original_zorder + 11
 
     # 获取费米子线路径
-    fermion_path = generate_fermion_line(line)
-    x, y = fermion_path[:, 0], fermion_path[:, 1]
+    fermion_path = cached_line_geometry(line, generate_fermion_line, points=_sample_count(ax, line, kwargs))
 
     # 绘制费米子线本身
-    line.set_plot_points(x, y)
+    line.set_plot_path(fermion_path)
     # print(f"DEBUG: 绘制费米子线: {line}, 绘制选项: {current_line_plot_options}")
-    drawn_line = draw_line(ax, line, current_line_plot_options)
+    drawn_line = draw_line(ax, line, current_line_plot_options, **_line_render_flags(kwargs))
     # from pprint import pprint
     # points = line.get_line_plot_points()[:10]
     # formatted_points = [f"({x:.3f}, {y:.3f})" for (x, y) in points]
     # pprint(f"fermion_path: {formatted_points}")
     # print(f"DEBUG, 绘制费米子线: {line}, arrow={line.arrow}"    )
     # --- 绘制箭头 ---
-    if line.arrow and len(x) > 1:
+    if line.arrow and len(fermion_path) > 1:
         arrow_filled = getattr(line, 'arrow_filled', False)
-        arrow_position = getattr(line, 'arrow_position', 0.5)
         arrow_size = getattr(line, 'arrow_size', 1.0)
         arrow_line_width = getattr(line, 'arrow_line_width', None)
-        arrow_reversed = getattr(line, 'arrow_reversed', False)
 
-        if len(x) < 2:
-            return
-
-        idx_tip = int(round(arrow_position * (len(x) - 1)))
-
-        if idx_tip == 0:
-            idx_base = 1
-        elif idx_tip >= len(x) - 1:
-            idx_base = len(x) - 2
-        else:
-            idx_base = idx_tip - 1
-
-
-        p_tip = (x[idx_tip], y[idx_tip])
-        p_base = (x[idx_base], y[idx_base])
-
-        if arrow_reversed:
-            xy = p_base
-            xytext = p_tip
-        else:
-            xy = p_tip
-            xytext = p_base
+        xy, xytext = _fermion_arrow_points(line, fermion_path)
 
         arrow_style_str = line.get_arrow_properties()
 
@@ -247,6 +278,31 @@ def draw_fermion_line(ax, line: FermionLine, line_plot_options: dict, label_text
     return drawn_line, drawn_text, drawn_arrow
 
 
+# 箭头方向点到箭头尖端的距离（占线长的比例），与原先 2000 点采样的相邻点间距一致
+_ARROW_BASE_FRACTION = 1 / 1999
+
+
+def _point_and_base_at_fraction(path: BasePath, fraction: float) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    返回路径上弧长比例 fraction 处的点，以及沿切线向后极短距离的一个点（用于确定箭头方向）。
+    """
+    s = float(np.clip(fraction, 0.0, 1.0)) * path.length
+    tip = path.point_at_length(s)
+    base = tip - path.tangent_at_length(s) * path.length * _ARROW_BASE_FRACTION
+    return (tip[0], tip[1]), (base[0], base[1])
+
+
+def _fermion_arrow_points(line: Line, path: BasePath) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    箭头的 (xy, xytext)，即 draw_arrow 的 start / end：
+    采样点数随缩放自适应变化，箭头位置按弧长插值而不是按索引取点；arrow_reversed 时两点互换。
+    """
+    p_tip, p_base = _point_and_base_at_fraction(path, getattr(line, 'arrow_position', 0.5))
+    if getattr(line, 'arrow_reversed', False):
+        return p_base, p_tip
+    return p_tip, p_base
+
+
 def draw_point_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: bool = True, **kwargs):
     # 复制字典以避免修改原始对象内部的配置
     drawn_vertex, drawn_text = None, None
@@ -294,7 +350,7 @@ def draw_point_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: bool = T
     _pop_render_kwargs(kwargs)  # 移除 zoom_times 等，避免传入 ax.scatter 报错
     if not vertex.hidden_vertex or vertex.is_selected:
         cout(current_scatter_props)
-        drawn_vertex = ax.scatter(vertex.x, vertex.y, **current_scatter_props, **kwargs)
+        drawn_vertex = track_artist(ax.scatter(vertex.x, vertex.y, **current_scatter_props, **kwargs))
 
     # 绘制标签（selected_label_id 仅用于 label 高亮，不传给 scatter）
     drawn_text = draw_vertex_label(ax, vertex, current_label_props, use_relative_unit=use_relative_unit, selected_label_id=selected_label_id, **kwargs)
@@ -315,7 +371,7 @@ def draw_structured_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: boo
     original_zorder = current_circle_props.get('zorder_structured', 10)
 
     if vertex.hidden_vertex and not vertex.is_selected:
-        return
+        return None, None
 
     current_circle_props = convert_props_from_data(ax, current_circle_props, use_relative_unit=use_relative_unit)
 
@@ -354,10 +410,10 @@ def draw_structured_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: boo
             (vertex.x, vertex.y),
             **current_circle_props
         )
-        drawn_vertex = ax.add_patch(circle)
+        drawn_vertex = track_artist(ax.add_patch(circle))
     else:
         # 如果圆圈不可见，则其阴影线和标签也不需要绘制
-        return
+        return None, None
 
 
     # 2. 绘制阴影线 (如果使用自定义模式)
@@ -367,36 +423,19 @@ def draw_structured_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: boo
         hatch_line_angle_deg = current_custom_hatch_props['hatch_line_angle_deg']
         hatch_spacing_ratio = current_custom_hatch_props['hatch_spacing_ratio']
 
-        radius = vertex.structured_radius
-        center_x = vertex.x
-        center_y = vertex.y
         zorder_hatch = current_circle_props['zorder'] + 0.5 # 阴影线在圆圈之上，但仍低于标签
-
-        angle_rad = np.deg2rad(hatch_line_angle_deg)
-        spacing = radius * hatch_spacing_ratio
-        max_dist = np.sqrt(2 * radius**2) * 1.5
-
-        for i in np.arange(-max_dist, max_dist, spacing):
-            p1 = np.array([-max_dist, i])
-            p2 = np.array([max_dist, i])
-
-            cos_theta = np.cos(angle_rad)
-            sin_theta = np.sin(angle_rad)
-
-            rotated_p1_x = center_x + p1[0] * cos_theta - p1[1] * sin_theta
-            rotated_p1_y = center_y + p1[0] * sin_theta + p1[1] * cos_theta
-
-            rotated_p2_x = center_x + p2[0] * cos_theta - p2[1] * sin_theta
-            rotated_p2_y = center_y + p2[0] * sin_theta + p2[1] * cos_theta
-
-            line_artist, = ax.plot(
-                [rotated_p1_x, rotated_p2_x],
-                [rotated_p1_y, rotated_p2_y],
-                color=hatch_line_color,
-                linewidth=hatch_line_width,
-                zorder=zorder_hatch,
-            )
-            line_artist.set_clip_path(circle) # 确保阴影线被裁剪在圆内
+        segments = circle_hatch_segments(
+            (vertex.x, vertex.y), vertex.structured_radius, hatch_line_angle_deg,
+            vertex.structured_radius * hatch_spacing_ratio,
+        )
+        # 线段已经解析地截在圆内，不需要裁剪路径；端点用平头，避免线帽伸出圆外
+        track_artist(ax.add_collection(LineCollection(
+            segments,
+            colors=hatch_line_color,
+            linewidths=hatch_line_width,
+            capstyle='butt',
+            zorder=zorder_hatch,
+        ), autolim=False))
 
     # 3. 绘制标签（selected_label_id 仅用于 label 高亮）
     drawn_text = draw_vertex_label(ax=ax, vertex=vertex, current_label_props=current_label_props, use_relative_unit=use_relative_unit, selected_label_id=selected_label_id, **kwargs)
@@ -406,6 +445,26 @@ def draw_structured_vertex(ax: plt.Axes, vertex: Vertex,  use_relative_unit: boo
 
 
 
+def circle_hatch_segments(center, radius: float, angle_deg: float, spacing: float) -> np.ndarray:
+    """
+    圆内自定义阴影线的线段 (n, 2, 2)：方向为 angle_deg 的一组平行线，间距 spacing，
+    每条线按到圆心的距离 d 截为半长 sqrt(r² - d²) 的弦，一次性向量化计算。
+    """
+    if radius <= 0 or spacing <= 0:
+        return np.empty((0, 2, 2))
+    # 与原先逐条绘制时的平行线位置一致：从 -1.5·√2·r 起每隔 spacing 一条，只保留穿过圆的部分
+    max_dist = np.sqrt(2 * radius**2) * 1.5
+    offsets = np.arange(-max_dist, max_dist, spacing)
+    offsets = offsets[np.abs(offsets) < radius]
+    half = np.sqrt(radius**2 - offsets**2)
+
+    angle_rad = np.deg2rad(angle_deg)
+    direction = np.array([np.cos(angle_rad), np.sin(angle_rad)])
+    normal = np.array([-direction[1], direction[0]])
+    mid = np.asarray(center, dtype=float) + offsets[:, None] * normal
+    return np.stack((mid - half[:, None] * direction, mid + half[:, None] * direction), axis=1)
+
+
 def draw_line_label(ax : plt.Axes, line : Line, current_label_text_options, use_relative_unit : bool = True, **kwargs):
     if not line.label or line.hidden_label:
         if not line.label:            # print(f"Line {line.id} has no label, skipping")
@@ -421,10 +480,9 @@ def draw_line_label(ax : plt.Axes, line : Line, current_label_text_options, use_
 
     # 绘制光子线的标签
     if line.label and not line.hidden_label:
-        plot_points = line.plot_points
-        mid_idx = len(plot_points) // 2
-        label_x = (plot_points[mid_idx] + line.label_offset[0])[0]
-        label_y = (plot_points[mid_idx] + line.label_offset[1])[1]
+        anchor = line.get_label_anchor()
+        label_x = anchor[0] + line.label_offset[0]
+        label_y = anchor[1] + line.label_offset[1]
 
         # --- 新增的可见性检查 ---
         # xlim = ax.get_xlim()
@@ -453,10 +511,10 @@ def draw_line_label(ax : plt.Axes, line : Line, current_label_text_options, use_
         label_in_latex = str2latex(line.label)
         current_label_text_options = convert_props_from_data(ax, current_label_text_options, use_relative_unit=use_relative_unit)
         _pop_render_kwargs(kwargs)  # 移除 zoom_times 等，避免传入 ax.text 报错
-        drawn_text = ax.text(label_x,
+        drawn_text = track_artist(ax.text(label_x,
                 label_y,
                 label_in_latex,
-                **current_label_text_options, **kwargs)
+                **current_label_text_options, **kwargs))
         return drawn_text
 
 
@@ -485,13 +543,13 @@ def draw_vertex_label(ax :plt.Axes, vertex : Vertex, current_label_props,  use_r
         current_label_props = convert_props_from_data(ax, current_label_props, use_relative_unit=use_relative_unit)
         label_in_latex = str2latex(vertex.label)
         _pop_render_kwargs(kwargs)  # 移除 zoom_times 等，避免传入 ax.text 报错
-        drawn_text = ax.text(
+        drawn_text = track_artist(ax.text(
             label_x,
             label_y,
             label_in_latex ,
             **current_label_props, # 使用调整后的标签属性
             **kwargs
-        )
+        ))
         return drawn_text
 
 
@@ -521,12 +579,33 @@ def draw_text_element(ax: plt.Axes, text_element: TextElement, use_relative_unit
         # 如果有缩放倍数，调整字体大小
         current_text_props = get_highlighted_props(current_text_props)
 
-    drawn_text = ax.text(alpha=alpha, **current_text_props)
+    drawn_text = track_artist(ax.text(alpha=alpha, **current_text_props))
     return drawn_text
 
 
 
 
+def get_px_per_data(ax: plt.Axes) -> Optional[float]:
+    """
+    每个数据单位对应的像素数（按 x 方向计算，Axes 使用等比例坐标）。
+    Figure 不存在或 x 范围为零时返回 None。
+    """
+    fig = ax.figure
+    if fig is None:
+        return None
+
+    bbox = ax.get_position()
+    fig_width_inch, _ = fig.get_size_inches()
+    ax_width_px = bbox.width * fig_width_inch * fig.dpi
+    xlim = ax.get_xlim()
+    data_range_x = xlim[1] - xlim[0]
+
+    # 避免除以零的错误
+    if data_range_x == 0:
+        return None
+    return ax_width_px / data_range_x
+
+
 def convert_props_from_data(ax: plt.Axes, props: Union[Dict[str, Any], float, int], prop_name : Optional[str] = None, use_relative_unit: bool = True) -> Union[Dict[str, Any], float, int]:
     """
     自动将指定的尺寸属性从数据单位转换为 Matplotlib 的绘图单位。
@@ -547,23 +626,10 @@ def convert_props_from_data(ax: plt.Axes, props: Union[Dict[str, Any], float, in
     is_dict = isinstance(props, dict)
     
     # 获取转换因子（每数据单位对应的像素数）
-    fig = ax.figure
-    if fig is None:
+    px_per_data = get_px_per_data(ax)
+    if px_per_data is None:
         return props
-    
-    bbox = ax.get_position()
-    fig_width_inch, _ = fig.get_size_inches()
-    dpi = fig.dpi
-    ax_width_px = bbox.width * fig_width_inch * dpi
-    xlim = ax.get_xlim()
-    data_range_x = xlim[1] - xlim[0]
-    # print(f"ax_width_px: {ax_width_px}, data_range_x: {data_range_x}, dpi: {dpi}")
-    
-    # 避免除以零的错误
-    if data_range_x == 0:
-        return props
-        
-    px_per_data = ax_width_px / data_range_x
+    dpi = ax.figure.dpi
     scale_factor = px_per_data / dpi  # 每数据单位对应的像素数除以 DPI 得到每数据单位对应的 pt
     # print(f"px_per_data: {px_per_data}, dpi: {dpi}")
 
@@ -686,40 +752,105 @@ def draw_arrow(ax: plt.Axes, start: Tuple[float, float], end: Tuple[float, float
         tail_angle = kwargs.get('arrow_tail_angle', 60)
         offset_ratio = kwargs.get('arrow_offset_ratio', 0.0)
         # print(f"DEBUG: draw_arrow() arrow_angle: {arrow_angle}, tail_angle: {tail_angle}, offset_ratio: {offset_ratio}")
-
-        drawn_arrow = ax.annotate(
+        try:
+            arrowstyle = fishtail_arrow(arrow_angle, tail_angle, offset_ratio)
+        except ValueError as error:
+            # 角度组合构不成箭头（例如两角相等）：不绘制箭头，线条其余部分照常绘制
+            cout(f"draw_arrow(): {error}")
+            return None
+
+        drawn_arrow = track_artist(ax.annotate(
             '', xy=end, xytext=start, zorder=zorder,
             ha='center', va='center',
             arrowprops=dict(
-                arrowstyle=FishtailArrow(
-                    arrow_angle=arrow_angle,
-                    tail_angle=tail_angle,
-                    offset_ratio=offset_ratio
-                ),
+                arrowstyle=arrowstyle,
                 facecolor=facecolor,
                 edgecolor=edgecolor,
                 mutation_scale=mutation_scale, 
                 shrinkA=0,  # 关闭起点收缩
                 shrinkB=0   # 关闭终点收缩
             )
-        )
+        ))
     return drawn_arrow
     
         
 
+def _line_render_flags(kwargs: dict) -> Dict[str, bool]:
+    """从 renderer 的 kwargs 中取出线条绘制开关（未给出时使用默认设置）。"""
+    return {
+        'native_bezier': kwargs.get('native_bezier', renderer_default_settings['NATIVE_BEZIER_PATHS']),
+        'simplify': kwargs.get('simplify', renderer_default_settings['SIMPLIFY_SCREEN']),
+    }
+
+
+def _simplified_points(ax: plt.Axes, points: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """
+    按像素容差 SIMPLIFY_TOLERANCE_PX 简化折线。容差通过当前 Axes 的像素/数据比换算为数据单位，
+    scale 为输出像素与屏幕像素之比（例如以更高 dpi 导出时大于 1，容差相应变小）。
+    """
+    px_per_data = get_px_per_data(ax)
+    if not px_per_data:
+        return points
+    return simplify_polyline(points, renderer_default_settings['SIMPLIFY_TOLERANCE_PX'] / (px_per_data * scale))
+
+
+def resimplify_polylines(ax: plt.Axes, simplify: bool, scale: float = 1.0) -> None:
+    """
+    按 simplify 开关重新设置 ax 上折线 artist 的数据：关闭时恢复完整分辨率，
+    开启时按 scale 对应的输出分辨率重新简化。供导出前后切换屏幕/导出设置使用。
+    """
+    current = set(ax.get_lines())
+    for artist, points in list(_polyline_full_points.items()):
+        if artist in current:
+            points = _simplified_points(ax, points, scale) if simplify else points
+            artist.set_data(points[:, 0], points[:, 1])
+    for collection in ax.collections:
+        batch = collection_batch(collection)
+        if isinstance(batch, PolylineBatch):
+            batch.resimplify(lambda points: _simplified_points(ax, points, scale) if simplify else points)
+
+
+def _plot_line_path(ax: plt.Axes, line: Line, native_bezier: bool, simplify: bool = False, **plot_options):
+    """
+    绘制 line.plot_path。路径为 BezierPath 且 native_bezier 为 True 时，
+    以 MOVETO + CURVE4 路径的 PathPatch 绘制（导出 PDF/SVG 时只写入 4 个控制点），否则用 ax.plot 绘制折线；
+    simplify 为 True 时折线先按像素容差做 RDP 简化（完整点集仍保留，供导出时重新简化）。
+    返回绘制出的 artist。
+    """
+    path = line.plot_path
+    if native_bezier and isinstance(path, BezierPath):
+        # 与 Line2D 的默认端点/连接样式保持一致
+        solid = plot_options.get('linestyle', '-') in ('-', 'solid')
+        patch = mpatches.PathPatch(
+            path.to_mpl_path(), fill=False,
+            capstyle=plt.rcParams['lines.solid_capstyle' if solid else 'lines.dash_capstyle'],
+            joinstyle=plt.rcParams['lines.solid_joinstyle' if solid else 'lines.dash_joinstyle'],
+            **plot_options,
+        )
+        track_artist(ax.add_patch(patch))
+        return patch
+    points = np.asarray(line.plot_points)
+    drawn = points if not simplify else _simplified_points(ax, points)
+    artist = track_artist(ax.plot(drawn[:, 0], drawn[:, 1], **plot_options)[0])
+    _polyline_full_points[artist] = points
+    return artist
+
+
 def draw_line(ax: plt.Axes, line : Line, line_plot_options: dict, use_relative_unit: bool = True, **kwargs):
+    flags = _line_render_flags(kwargs)
     _pop_render_kwargs(kwargs)
     line_plot_options = convert_props_from_data(ax, line_plot_options, use_relative_unit=use_relative_unit)
     # print(f"DEBUG : line_plot_options: {line_plot_options}")
     if line.linestyle == "Hollow" or line.linestyle == 'hollow':
         # 绘制空心线条
-        draw_hollow_line(ax, line, line_plot_options, line_plot_options, **kwargs)
+        return draw_hollow_line(ax, line, line_plot_options, line_plot_options, **flags, **kwargs)
     elif line.linestyle in ['-', '--', '-.', ':']:
         # 绘制实线、虚线等
         # print(f"DEBUG : draw_line() : line_plot_options: {line_plot_options}")
-        ax.plot(line.plot_points[:, 0], line.plot_points[:, 1], **line_plot_options)
+        return _plot_line_path(ax, line, **flags, **line_plot_options)
 
 def draw_hollow_line(ax: plt.Axes, line: Line, line_plot_options: dict, use_relative_unit: bool = True, **kwargs):
+    flags = _line_render_flags(kwargs)
     _pop_render_kwargs(kwargs)
     if not line.hollow_line_initialized:
         line._init_hollow_line(**kwargs)
@@ -740,11 +871,177 @@ def draw_hollow_line(ax: plt.Axes, line: Line, line_plot_options: dict, use_rela
         outer_linewidth *= 1.5 
         inner_line_zorder += 10
         outer_line_zorder += 10
-    inner_line = ax.plot(line.plot_points[:, 0], line.plot_points[:, 1],
+    inner_line = _plot_line_path(ax, line, **flags,
             color=inner_color, linewidth=inner_linewidth, linestyle='-', zorder=inner_line_zorder, alpha=alpha, **kwargs)
 
     # 绘制外层线条
-    outer_line = ax.plot(line.plot_points[:, 0], line.plot_points[:, 1],
+    outer_line = _plot_line_path(ax, line, **flags,
             color=outer_color, linewidth=outer_linewidth, linestyle='-', zorder=outer_line_zorder, alpha=alpha, **kwargs)
 
-    return (inner_line[0], outer_line[0])
\ No newline at end of file
+    return (inner_line, outer_line)
+
+# --- retained 模式：图元只移动（样式与视图比例不变）时就地更新已有的 artist ---
+
+def line_plot_path(ax: plt.Axes, line: Line, **kwargs) -> Optional[BasePath]:
+    """
+    与各 draw_* 函数相同地生成线条的绘制路径（胶子螺旋、光子波浪、W/Z 波形或费米子曲线）；
+    没有对应生成函数的线条返回 None。
+    """
+    points = _sample_count(ax, line, kwargs)
+    if isinstance(line, GluonLine):
+        return line.get_plot_path(points=points)[1]
+    if isinstance(line, PhotonLine):
+        return cached_line_geometry(line, generate_photon_wave, loop=line.loop, points=points)
+    if isinstance(line, (WPlusLine, WMinusLine, ZBosonLine)):
+        return cached_line_geometry(line, generate_WZ_zigzag, points=points)[0]
+    if isinstance(line, (FermionLine, AntiFermionLine)):
+        return cached_line_geometry(line, generate_fermion_line, points=points)
+    return None
+
+
+def update_line_artists(ax: plt.Axes, line: Line, artists: List[Any], **kwargs) -> bool:
+    """
+    线条几何或标签偏移变化、样式不变时，就地更新其 artist：折线 set_data、贝塞尔 PathPatch set_path、
+    箭头与标签移动到新位置。遇到无法就地更新的 artist（例如路径类型改变）时返回 False，由调用方重新绘制。
+    """
+    path = line_plot_path(ax, line, **kwargs)
+    if path is None:
+        return False
+    line.set_plot_path(path)
+    flags = _line_render_flags(kwargs)
+    native = flags['native_bezier'] and isinstance(path, BezierPath)
+    for artist in artists:
+        if isinstance(artist, mtext.Annotation):
+            xy, xytext = _fermion_arrow_points(line, path)
+            # draw_arrow(ax, start, end) 以 end 为 xy、start 为 xytext 调用 annotate
+            artist.xy = xytext
+            artist.xyann = xy
+        elif isinstance(artist, Text):
+            anchor = line.get_label_anchor()
+            artist.set_position((anchor[0] + line.label_offset[0], anchor[1] + line.label_offset[1]))
+        elif isinstance(artist, mpatches.PathPatch) and native:
+            artist.set_path(path.to_mpl_path())
+        elif isinstance(artist, Line2D) and not native:
+            points = np.asarray(path.points)
+            drawn = points if not flags['simplify'] else _simplified_points(ax, points)
+            artist.set_data(drawn[:, 0], drawn[:, 1])
+            _polyline_full_points[artist] = points
+        elif isinstance(artist, BatchMember) and isinstance(artist.batch, CurveBatch) and native:
+            artist.set_data(path.to_mpl_path())
+        elif isinstance(artist, BatchMember) and isinstance(artist.batch, PolylineBatch) and not native:
+            points = np.asarray(path.points)
+            artist.set_data(points if not flags['simplify'] else _simplified_points(ax, points), full=points)
+        else:
+            return False
+    return True
+
+
+def update_vertex_artists(ax: plt.Axes, vertex: Vertex, artists: List[Any]) -> bool:
+    """
+    顶点或其标签移动、样式不变时就地更新：散点 set_offsets、结构顶点的圆 set_center、
+    阴影线重新计算线段、标签 set_position。遇到无法就地更新的 artist 时返回 False。
+    """
+    for artist in artists:
+        if isinstance(artist, Text):
+            artist.set_position((vertex.x + vertex.label_offset[0], vertex.y + vertex.label_offset[1]))
+        elif isinstance(artist, PathCollection):
+            artist.set_offsets([[vertex.x, vertex.y]])
+        elif isinstance(artist, BatchMember) and isinstance(artist.batch, PointBatch):
+            artist.set_data((vertex.x, vertex.y))
+        elif isinstance(artist, Circle):
+            artist.set_center((vertex.x, vertex.y))
+        elif isinstance(artist, LineCollection):
+            hatch = vertex.get_custom_hatch_properties()
+            artist.set_segments(circle_hatch_segments(
+                (vertex.x, vertex.y), vertex.structured_radius, hatch['hatch_line_angle_deg'],
+                vertex.structured_radius * hatch['hatch_spacing_ratio'],
+            ))
+        else:
+            return False
+    return True
+
+
+def update_text_artists(text_element: TextElement, artists: List[Any]) -> bool:
+    """额外文本移动、样式不变时就地 set_position。"""
+    for artist in artists:
+        if not isinstance(artist, Text):
+            return False
+        artist.set_position((text_element.x, text_element.y))
+    return True
+
+
+# --- 合并绘制：同样式的散点顶点与线条并入共享的 collection ---
+
+def batch_artists(batches: ArtistBatches, ax: plt.Axes, key, artists: List[Any]) -> List[Any]:
+    """
+    把一个图元新绘制的 artist 中可以合并的（单点散点、折线、原生贝塞尔曲线）并入 batches 中同样式的共享 collection，
+    从 Axes 上移除原 artist 并以 BatchMember 代替；其余 artist（标签、箭头、结构顶点等）原样返回。
+    key 标识图元，与 artist 的序号一起组成成员键，用于排序与拾取时反查图元。
+    """
+    result = []
+    for index, artist in enumerate(artists):
+        member = _batch_member(batches, ax, (key, index), artist)
+        if member is None:
+            result.append(artist)
+        else:
+            artist.remove()
+            _polyline_full_points.pop(artist, None)
+            result.append(member)
+    return result
+
+
+def _batch_member(batches: ArtistBatches, ax: plt.Axes, key, artist) -> Optional[BatchMember]:
+    if not artist.get_visible() or artist.get_path_effects():
+        return None
+    zorder = artist.get_zorder()
+    if isinstance(artist, PathCollection):
+        # 散点顶点：单个点、实线边框、未使用颜色映射
+        if (len(artist.get_offsets()) != 1 or len(artist.get_paths()) != 1 or artist.get_array() is not None
+                or artist.get_hatch() or artist.get_offset_transform() is not ax.transData
+                or any(dashes is not None for _, dashes in artist.get_linestyle())):
+            return None
+        marker = artist.get_paths()[0]
+        style = (marker.vertices.tobytes(), None if marker.codes is None else marker.codes.tobytes(), zorder)
+        return batches.add(ax, PointBatch, style, {'marker': marker, 'zorder': zorder}, key, {
+            'data': tuple(artist.get_offsets()[0]),
+            'size': artist.get_sizes()[0],
+            'facecolor': _first_color(artist.get_facecolors()),
+            'edgecolor': _first_color(artist.get_edgecolors()),
+            'linewidth': artist.get_linewidths()[0],
+        })
+    if isinstance(artist, Line2D):
+        linestyle = artist.get_linestyle()
+        if (linestyle not in ('-', '--', '-.', ':') or artist.get_marker() not in ('None', None, '', ' ')
+                or artist.get_drawstyle() != 'default' or artist.get_gapcolor() is not None
+                or artist.get_transform() is not ax.transData):
+            return None
+        solid = linestyle == '-'
+        shared = {
+            'zorder': zorder, 'linestyle': linestyle,
+            'capstyle': artist.get_solid_capstyle() if solid else artist.get_dash_capstyle(),
+            'joinstyle': artist.get_solid_joinstyle() if solid else artist.get_dash_joinstyle(),
+        }
+        return batches.add(ax, PolylineBatch, tuple(sorted(shared.items())), shared, key, {
+            'data': artist.get_xydata(),
+            'full': _polyline_full_points.get(artist),
+            'color': mcolors.to_rgba(artist.get_color(), artist.get_alpha()),
+            'linewidth': artist.get_linewidth(),
+        })
+    if isinstance(artist, mpatches.PathPatch):
+        if artist.get_fill() or artist.get_hatch() or artist.get_data_transform() is not ax.transData:
+            return None
+        shared = {
+            'zorder': zorder, 'linestyle': artist.get_linestyle(),
+            'capstyle': artist.get_capstyle(), 'joinstyle': artist.get_joinstyle(),
+        }
+        return batches.add(ax, CurveBatch, tuple(sorted(shared.items())), shared, key, {
+            'data': artist.get_path(),
+            'color': artist.get_edgecolor(),
+            'linewidth': artist.get_linewidth(),
+        })
+    return None
+
+
+def _first_color(colors) -> Tuple[float, float, float, float]:
+    """collection 的第一项颜色；颜色为 'none'（空数组）时为全透明。"""
+    return tuple(colors[0]) if len(colors) else (0.0, 0.0, 0.0, 0.0)
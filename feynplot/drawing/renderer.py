@@ -10,13 +10,22 @@ from feynplot.drawing.fontSettings import *
 from feynplot.core.extra_text_element import TextElement
 from matplotlib.text import Text # 导入正确的类型
 from matplotlib.lines import Line2D
-from matplotlib.collections import PathCollection
+from matplotlib.collections import Collection, PathCollection
 from feynplot.default_settings.default_settings import renderer_default_settings
+from feynplot.core.geometry_cache import geometry_cache
+import os
 import numpy as np
 from matplotlib.transforms import Bbox
 import matplotlib.patches as mpatches
 import feynplot.drawing.styles.arrow_styles
 from contextlib import contextmanager
+from feynplot.core.geometry_cache import LINE_GEOMETRY_ATTRS, line_geometry_stamp, _hashable
+from feynplot.drawing.artist_registry import (
+    ArtistRegistry, ElementArtists, collect_new_artists, element_key, restore_draw_order, state_signature,
+    track_artist,
+)
+from feynplot.drawing.artist_batches import ArtistBatches, BatchMember, collection_batch
+from feynplot.drawing.text_metrics import text_metrics_cache, mathtext_cache, text_data_extent, use_mathtext_cache
 
 scale_factor = renderer_default_settings['DEFAULT_SCALE_FACTOR']
 
@@ -32,8 +41,22 @@ from feynplot.core.line import (
 from feynplot.drawing.plot_functions import (
     draw_structured_vertex, draw_point_vertex,
     draw_gluon_line, draw_photon_wave, draw_WZ_zigzag_line, draw_fermion_line,
-    draw_text_element
+    draw_text_element, prepare_line_geometry, prepare_export_line_geometry, resimplify_polylines, get_px_per_data,
+    update_line_artists, update_vertex_artists, update_text_artists, batch_artists
 )
+
+# 只影响位置、可以就地更新的属性（不参与样式签名）；线条几何的变化由几何版本号判断
+_LINE_POSITION_ATTRS = frozenset(LINE_GEOMETRY_ATTRS) | {
+    'label_offset', 'plot_path', 'plot_points', 'geometry_version', 'v_start', 'v_end'
+}
+_VERTEX_POSITION_ATTRS = frozenset({'x', 'y', 'label_offset', 'geometry_version'})
+_TEXT_POSITION_ATTRS = frozenset({'x', 'y'})
+# render 参数中与绘制结果无关（或由各图元单独处理）的键
+# 矢量导出格式：查看时可以任意放大，线条采样不按导出分辨率计算
+_VECTOR_FORMATS = frozenset({'pdf', 'svg', 'svgz', 'eps', 'ps', 'pgf'})
+_VIEW_INDEPENDENT_KWARGS = frozenset({
+    'target_xlim', 'target_ylim', 'auto_scale', 'skip_navigation_bar', 'zoom_times', 'selected_label_id'
+})
 class FeynmanDiagramCanvas:
     _render_call_count = 0 # Class-level counter for render calls
 
@@ -54,17 +77,35 @@ class FeynmanDiagramCanvas:
         self._current_target_xlim = None  # 用于存储当前目标 x 轴限制
         self._current_target_ylim = None  # 用于存储当前目标 y 轴限制
         self._transparent_background = None  # 是否使用透明背景
+        self._background_image = None  # 透明背景时绘制的棋盘格图像
+        # retained 模式：各图元的 artist 注册表，以及这些 artist 绘制时的视图比例与渲染参数
+        self._artists = ArtistRegistry()
+        self._drawn_view_key = None
+        # 合并绘制：同样式的散点顶点与线条共用的 collection
+        self._batches = ArtistBatches()
+        self._label_view_limits = None  # 上一轮判断标签可见性时的视图范围
+        # blit 模式（拖动期间）：移动中图元的 (类别, 键)、不含它们的静态背景，以及背景对应的布局状态
+        self._blit_keys = None
+        self._blit_background = None
+        self._blit_layout = None
+        self._blit_draw_cid = None
+        self._layout_key = None  # 上一次 tight_layout 时的布局状态，未变化时沿用已计算的 Axes 位置
 
         # 重置实例计数器（虽然是类变量，但对于测试场景下的多个实例很有用）
         FeynmanDiagramCanvas._render_call_count = 0 
         
         self.ax.set_aspect('equal', adjustable='box')
         self.ax.set_axis_off()
-        self.fig.tight_layout()
+        self._update_layout()
+        use_mathtext_cache(self.fig.canvas)
 
         # 用于存储渲染参数的实例属性
         self._current_target_xlim: Optional[Tuple[float, float]] = None
         self._current_target_ylim: Optional[Tuple[float, float]] = None
+        # 屏幕显示时是否简化折线（导出时按 SIMPLIFY_EXPORT 临时切换，导出后恢复）
+        self._simplify_on_screen: bool = renderer_default_settings['SIMPLIFY_SCREEN']
+        # 上一次 render 的参数，导出时按导出分辨率重新生成线条路径需要与绘制时一致
+        self._render_kwargs: Dict[str, Any] = {}
 
     def get_axes_limits(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
         if self._current_target_xlim and self._current_target_ylim:
@@ -109,7 +150,10 @@ class FeynmanDiagramCanvas:
         
         # 调用 _update_render_parameters 来处理 kwargs
         self._update_render_parameters(**kwargs)
-        self.ax.clear() 
+        self._simplify_on_screen = kwargs.get('simplify', renderer_default_settings['SIMPLIFY_SCREEN'])
+        self._render_kwargs = dict(kwargs)
+        # 画布尺寸或 dpi 变化后渲染器会重建，每轮重新接入 mathtext 解析缓存
+        use_mathtext_cache(self.fig.canvas)
 
         self.ax.set_aspect('equal', adjustable='box')
 
@@ -141,67 +185,159 @@ class FeynmanDiagramCanvas:
         # print(f"当前视图限制: xlim={current_xlim}, ylim={current_ylim}")
         # print(f"\n\n\n\n***************************DEBUG : 正式渲染 ***************************")
         # -------------------
-        # 第 2 步：正式绘制所有对象，并根据视图限制决定标签的可见性
+        # 第 2 步：retained 模式更新 artist。视图比例（线宽、字号随之换算）或渲染参数变化时全部重建；
+        # 否则未变化的图元保留原有 artist，只移动的图元就地更新，样式变化或新增的图元重新绘制，已删除的图元移除
         # -------------------
-        
-        # 顶点/线条 label 的 artist 表，用于命中检测与拖动（每轮渲染前清空）
-        self._vertex_label_artists.clear()
-        self._line_label_artists.clear()
-        # 绘制线，不进行可见性检查，因为线可能部分可见
+        view_key = self._view_key(use_relative_unit, kwargs)
+        if view_key != self._drawn_view_key:
+            self._artists.clear()
+            self._drawn_view_key = view_key
+        selected_label_id = kwargs.get('selected_label_id')
+        batch = kwargs.get('batch_artists', renderer_default_settings['BATCH_ARTISTS'])
+        redrawn = False
+        changed = set()  # 本轮更新、重绘或移除了 artist 的图元 (类别, 键)，用于判断 blit 帧是否只涉及移动中的图元
+
+        # 线条：先分出需要就地更新与重新绘制的线，只为它们准备几何
+        line_work = []
+        line_keys = set()
         for line in lines:
+            key = self._unique_key(element_key(line), line_keys)
+            entry = self._artists.get('line', key)
+            style_key = (state_signature(line, _LINE_POSITION_ATTRS), selected_label_id == f"llabel:{line.id}",
+                         self._batched('line', key, batch))
+            position_key = (line_geometry_stamp(line), _hashable(line.label_offset))
+            if entry is not None and entry.element is line and entry.style_key == style_key:
+                if entry.position_key != position_key:
+                    line_work.append((line, key, entry, position_key))
+            else:
+                line_work.append((line, key, None, position_key))
+        sample_counts = prepare_line_geometry(self.ax, [work[0] for work in line_work], **kwargs)
+        for line, key, entry, position_key in line_work:
+            if entry is not None and update_line_artists(self.ax, line, entry.artists, sample_counts=sample_counts, **kwargs):
+                entry.position_key = position_key
+                changed.add(('line', key))
+                continue
             # print(f"\n********************DEBUG :渲染线条: {line}*********************************")
-            drawn_line, drawn_text = self._draw_line(line, use_relative_unit=use_relative_unit, **kwargs)
-            # 这里你需要根据 draw_line 的返回类型进行处理，如果你修改了它
-            # 你的 _draw_line 函数现在返回 (drawn_line, drawn_text)，所以我们直接使用
-            if drawn_line:
-                self._drawn_lines.append(drawn_line)
-            if drawn_text:
-                # 对于线上的标签，检查其中心点是否在视图内
-                bbox = drawn_text.get_window_extent().transformed(self.ax.transData.inverted())
-                center_x = (bbox.x0 + bbox.x1) / 2
-                center_y = (bbox.y0 + bbox.y1) / 2
-                if not (current_xlim[0] <= center_x <= current_xlim[1] and current_ylim[0] <= center_y <= current_ylim[1]):
-                    drawn_text.set_visible(False) # 如果不在范围内，隐藏标签
-                self._drawn_texts.append(drawn_text)
-                self._line_label_artists[line.id] = drawn_text
-
-        # 绘制顶点
+            with collect_new_artists(self.ax) as artists:
+                self._draw_line(line, use_relative_unit=use_relative_unit, sample_counts=sample_counts, **kwargs)
+            if self._batched('line', key, batch):
+                artists = batch_artists(self._batches, self.ax, ('line', key), artists)
+            # 样式签名在绘制之后计算：绘制过程中初始化的属性（如空心线参数）不会导致下一轮重复重建
+            style_key = (state_signature(line, _LINE_POSITION_ATTRS), selected_label_id == f"llabel:{line.id}",
+                         self._batched('line', key, batch))
+            self._artists.put('line', key, ElementArtists(line, artists, style_key, position_key))
+            changed.add(('line', key))
+            redrawn = True
+        removed = self._artists.prune('line', line_keys)
+        changed.update(('line', key) for key in removed)
+        redrawn |= bool(removed)
+
+        # 顶点
+        vertex_keys = set()
         for vertex in vertices:
             # print(f"\n********************DEBUG :渲染顶点: {vertex}*********************************")
-            drawn_vertex, drawn_text = self._draw_vertex(vertex, use_relative_unit=use_relative_unit, **kwargs)
-            if drawn_vertex:
-                self._drawn_vertices.append(drawn_vertex)
-            if drawn_text:
-                # 对于顶点的标签，检查其中心点是否在视图内
-                bbox = drawn_text.get_window_extent().transformed(self.ax.transData.inverted())
-                center_x = (bbox.x0 + bbox.x1) / 2
-                center_y = (bbox.y0 + bbox.y1) / 2
-                if not (current_xlim[0] <= center_x <= current_xlim[1] and current_ylim[0] <= center_y <= current_ylim[1]):
-                    drawn_text.set_visible(False) # 如果不在范围内，隐藏标签
-                self._drawn_texts.append(drawn_text)
-                self._vertex_label_artists[vertex.id] = drawn_text
-
-        # 如果有额外的文本，也进行绘制，并保存 artist 以便命中检测使用真实边界
-        self._extra_text_artists.clear()
-        if texts:
-            for text in texts:
-                drawn_text = self._draw_text(text, use_relative_unit=use_relative_unit, **kwargs)
-                if drawn_text is not None and getattr(text, 'id', None):
-                    self._extra_text_artists[text.id] = drawn_text
+            key = self._unique_key(element_key(vertex), vertex_keys)
+            entry = self._artists.get('vertex', key)
+            style_key = (self._vertex_style_key(vertex, current_xlim, current_ylim, selected_label_id),
+                         self._batched('vertex', key, batch))
+            position_key = (vertex.x, vertex.y, _hashable(vertex.label_offset))
+            if entry is not None and entry.element is vertex and entry.style_key == style_key:
+                if entry.position_key == position_key:
+                    continue
+                if update_vertex_artists(self.ax, vertex, entry.artists):
+                    entry.position_key = position_key
+                    changed.add(('vertex', key))
+                    continue
+            with collect_new_artists(self.ax) as artists:
+                self._draw_vertex(vertex, use_relative_unit=use_relative_unit, **kwargs)
+            if self._batched('vertex', key, batch):
+                artists = batch_artists(self._batches, self.ax, ('vertex', key), artists)
+            self._artists.put('vertex', key, ElementArtists(vertex, artists, style_key, position_key))
+            changed.add(('vertex', key))
+            redrawn = True
+        removed = self._artists.prune('vertex', vertex_keys)
+        changed.update(('vertex', key) for key in removed)
+        redrawn |= bool(removed)
+
+        # 额外的文本
+        text_keys = set()
+        for text in texts or []:
+            key = self._unique_key(element_key(text), text_keys)
+            entry = self._artists.get('text', key)
+            style_key = state_signature(text, _TEXT_POSITION_ATTRS)
+            position_key = (text.x, text.y)
+            if entry is not None and entry.element is text and entry.style_key == style_key:
+                if entry.position_key == position_key:
+                    continue
+                if update_text_artists(text, entry.artists):
+                    entry.position_key = position_key
+                    changed.add(('text', key))
+                    continue
+            with collect_new_artists(self.ax) as artists:
+                self._draw_text(text, use_relative_unit=use_relative_unit, **kwargs)
+            self._artists.put('text', key, ElementArtists(text, artists, style_key, position_key))
+            changed.add(('text', key))
+            redrawn = True
+        removed = self._artists.prune('text', text_keys)
+        changed.update(('text', key) for key in removed)
+        redrawn |= bool(removed)
+
+        line_order = self._ordered_keys(lines)
+        vertex_order = self._ordered_keys(vertices)
+        # 把本轮增删或移动的成员写入共享 collection；成员按线条、顶点各自的列表顺序排列
+        rank = {kind_key: index for index, kind_key in enumerate(
+            [('line', key) for key in line_order] + [('vertex', key) for key in vertex_order])}
+        if self._batches.sync(lambda member_key: (rank.get(member_key[0], len(rank)), member_key[1])):
+            # 共享 collection 中也有不在移动中的图元，blit 时需要重新缓存背景
+            changed.add(('batch', None))
+        line_entries = [self._artists.get('line', key) for key in line_order]
+        vertex_entries = [self._artists.get('vertex', key) for key in vertex_order]
+        text_entries = [self._artists.get('text', key) for key in self._ordered_keys(texts or [])]
+        if redrawn:
+            # 重新绘制的图元追加在最后；恢复整体绘制时的叠放顺序（线条、顶点、文本，各自按列表顺序）
+            restore_draw_order(self.ax, line_entries + vertex_entries + text_entries)
+
+        # 记录当前的 artist，并根据视图限制决定线条/顶点标签的可见性（标签中心不在视图内时隐藏）
+        self._drawn_lines = self._entry_artists(line_entries, (Line2D, mpatches.PathPatch, Collection))
+        self._drawn_vertices = self._entry_artists(vertex_entries, (PathCollection, mpatches.Patch, Collection))
+        self._drawn_texts = []
+        # 视图范围未变时只有本轮变化的图元需要重新判断（拖动时每帧的开销与图元总数无关）
+        label_changed = None if (current_xlim, current_ylim) != self._label_view_limits else changed
+        self._label_view_limits = (current_xlim, current_ylim)
+        self._line_label_artists = self._visible_labels(
+            lines, line_entries, [('line', key) for key in line_order], current_xlim, current_ylim, label_changed)
+        self._vertex_label_artists = self._visible_labels(
+            vertices, vertex_entries, [('vertex', key) for key in vertex_order], current_xlim, current_ylim, label_changed)
+        # 额外文本的 artist，用于命中检测时取真实边界
+        self._extra_text_artists = {
+            text.id: entry.artists[0]
+            for text, entry in zip(texts or [], text_entries)
+            if entry.artists and getattr(text, 'id', None)
+        }
 
         # 保持网格等其他设置
         if self.grid_on:
             self.ax.grid(True, zorder=-99)
             self.ax.axis('on')
         else:
+            self.ax.grid(False)
             self.ax.axis('off')
+        # 棋盘格背景随视图范围变化，每轮重新生成
+        if self._background_image is not None:
+            self._background_image.remove()
+            self._background_image = None
+            self.ax.patch.set_alpha(None)
         if self._transparent_background:
             self._plot_chessboard_background()
             # self.fig.patch.set_alpha(0.0)
             # self.ax.patch.set_alpha(0.0)
             # # 将 zorder 设置为 0 或更小，以确保背景图层在最下方
             # self.ax.set_zorder(-1)
-        self.fig.tight_layout()
+        if self._blit_keys is not None:
+            # 拖动中：布局保持拖动开始时的状态，只重绘移动中的图元
+            self._draw_blit_frame(changed)
+            return
+        self._update_layout()
         self.fig.canvas.draw_idle()
 
     def _draw_line(self, line: Line, use_relative_unit: bool = True, **kwargs):
@@ -227,7 +363,7 @@ class FeynmanDiagramCanvas:
             drawn_line, drawn_texts, drawn_arrow = draw_fermion_line(self.ax, line, line_plot_options, label_text_options, use_relative_unit=use_relative_unit, **kwargs)
         else: # 通用直线 (如果你的 Line 类可以直接绘制直线)
             (x1, y1), (x2, y2) = line.get_coords()
-            self.ax.plot([x1, x2], [y1, y2], **line_plot_options)
+            track_artist(self.ax.plot([x1, x2], [y1, y2], **line_plot_options)[0])
         # print(f"渲染线条: {line}, 绘制的线对象: {drawn_line}, 绘制的文本对象: {drawn_texts}")
         return drawn_line, drawn_texts 
 
@@ -247,6 +383,233 @@ class FeynmanDiagramCanvas:
         drawn_text = draw_text_element(self.ax, text, use_relative_unit=use_relative_unit, alpha=alpha, **kwargs)
         return drawn_text
 
+    def _view_key(self, use_relative_unit: bool, kwargs: Dict[str, Any]) -> Tuple:
+        """
+        影响所有图元绘制结果的全局状态：每数据单位像素数（相对单位下线宽、字号与采样点数都随之变化）、
+        dpi 以及 render 的参数。视图范围与选中的标签不在其中，分别由平移时保留 artist、各图元的样式签名处理。
+        """
+        px_per_data = get_px_per_data(self.ax)
+        # 平移时范围宽度会有浮点舍入误差，按有效数字比较
+        px_per_data = None if px_per_data is None else float(f"{px_per_data:.9g}")
+        options = tuple(sorted((name, _hashable(value)) for name, value in kwargs.items()
+                               if name not in _VIEW_INDEPENDENT_KWARGS))
+        return px_per_data, self.fig.dpi, use_relative_unit, options
+
+    @staticmethod
+    def _vertex_style_key(vertex: Vertex, xlim, ylim, selected_label_id) -> Tuple:
+        """顶点的样式签名；绘制时的视图裁剪结果（标签位置、结构顶点的圆是否在视图内）也包含在内。"""
+        label_x = vertex.x + vertex.label_offset[0]
+        label_y = vertex.y + vertex.label_offset[1]
+        label_in_view = xlim[0] <= label_x <= xlim[1] and ylim[0] <= label_y <= ylim[1]
+        circle_in_view = None
+        if vertex.is_structured:
+            r = vertex.structured_radius
+            circle_in_view = (vertex.x + r > xlim[0] and vertex.x - r < xlim[1]
+                              and vertex.y + r > ylim[0] and vertex.y - r < ylim[1])
+        return (state_signature(vertex, _VERTEX_POSITION_ATTRS), selected_label_id == f"vlabel:{vertex.id}",
+                label_in_view, circle_in_view)
+
+    def _batched(self, kind: str, key, batch: bool) -> bool:
+        """图元是否合并到共享 collection 中绘制；blit 拖动中的图元单独绘制，以便只重绘它们。"""
+        return batch and not (self._blit_keys is not None and (kind, key) in self._blit_keys)
+
+    @staticmethod
+    def _entry_artists(entries, types) -> List[Any]:
+        """图元的 artist 中属于 types 的部分；合并绘制的成员以其共享 collection 代替（去重）。"""
+        result = {}
+        for entry in entries:
+            for artist in entry.artists:
+                if isinstance(artist, BatchMember):
+                    artist = artist.collection
+                if isinstance(artist, types):
+                    result[id(artist)] = artist
+        return list(result.values())
+
+    @staticmethod
+    def _unique_key(key, seen: set):
+        """同一轮渲染中 id 重复的图元改用对象标识作为键，避免互相覆盖 artist。"""
+        if key in seen:
+            key = ('dup', key, len(seen))
+        seen.add(key)
+        return key
+
+    @staticmethod
+    def _ordered_keys(elements) -> List:
+        """按 elements 的顺序重新生成 _unique_key 分配的键。"""
+        seen = set()
+        return [FeynmanDiagramCanvas._unique_key(element_key(element), seen) for element in elements]
+
+    def _visible_labels(self, elements, entries, keys, xlim, ylim, changed: Optional[set] = None) -> Dict[str, Text]:
+        """
+        检查各图元标签中心是否在视图内并设置可见性，返回 element.id -> 标签 Text，
+        用于命中检测与拖动。给出 changed 时只重新检查其中的图元，其余标签保持原有可见性。
+        """
+        labels = {}
+        to_data = self.ax.transData.inverted()
+        renderer = None
+        for element, entry, key in zip(elements, entries, keys):
+            drawn_text = entry.label
+            if drawn_text is None:
+                continue
+            self._drawn_texts.append(drawn_text)
+            labels[element.id] = drawn_text
+            if changed is not None and key not in changed:
+                continue
+            if renderer is None:
+                renderer = self.fig.canvas.get_renderer()
+            x0, y0, x1, y1 = text_data_extent(drawn_text, to_data, renderer)
+            center_x = (x0 + x1) / 2
+            center_y = (y0 + y1) / 2
+            drawn_text.set_visible(xlim[0] <= center_x <= xlim[1] and ylim[0] <= center_y <= ylim[1])
+        return labels
+
+    # --- blit 模式 ---
+    def begin_blit(self, vertices=(), lines=(), texts=()):
+        """
+        开始拖动：把移动中的图元（被拖动的顶点及其相连线条、被拖动的文本等）的 artist 标记为 animated，
+        完整绘制一次其余内容并用 copy_from_bbox 缓存为静态背景。
+        之后的 render 只要变化限于这些图元、且视图与布局未变，就恢复背景并只重绘它们，
+        每帧的绘制量与图中其余图元的数量无关。
+        """
+        self.end_blit(redraw=False)
+        self._blit_keys = ({('vertex', element_key(vertex)) for vertex in vertices}
+                           | {('line', element_key(line)) for line in lines}
+                           | {('text', element_key(text)) for text in texts})
+        # 任何完整绘制（包括窗口缩放等外部触发的）之后都重新缓存背景
+        self._blit_draw_cid = self.fig.canvas.mpl_connect('draw_event', self._on_blit_draw)
+        merged = any(isinstance(artist, BatchMember)
+                     for kind, key in self._blit_keys if self._artists.get(kind, key) is not None
+                     for artist in self._artists.get(kind, key).artists)
+        if not merged:
+            self._capture_blit_background()
+        # 否则这些图元还在共享 collection 中：下一次 render 把它们单独绘制后再缓存背景
+
+    def end_blit(self, redraw: bool = True):
+        """结束拖动：恢复 artist 的 animated 标记并丢弃缓存的背景，redraw 为 True 时安排一次完整重绘。"""
+        if self._blit_keys is None:
+            return
+        for artist in self._blit_artists():
+            artist.set_animated(False)
+        if self._blit_draw_cid is not None:
+            self.fig.canvas.mpl_disconnect(self._blit_draw_cid)
+        self._blit_keys = None
+        self._blit_background = None
+        self._blit_layout = None
+        self._blit_draw_cid = None
+        if redraw:
+            self.fig.canvas.draw_idle()
+
+    @property
+    def is_blitting(self) -> bool:
+        return self._blit_keys is not None
+
+    def _blit_artists(self) -> List[Any]:
+        """移动中图元当前的 artist，按整体绘制时的顺序排列（restore_draw_order 已把图元顺序写入 zorder）。"""
+        artists = []
+        for kind, key in self._blit_keys or ():
+            entry = self._artists.get(kind, key)
+            if entry is not None:
+                artists.extend(artist for artist in entry.artists
+                               if not isinstance(artist, BatchMember) and artist.axes is self.ax)
+        return sorted(artists, key=lambda artist: artist.get_zorder())
+
+    def _layout_key_state(self) -> Tuple:
+        """
+        决定 tight_layout 结果的状态：画布尺寸、dpi、网格与坐标轴开关；
+        坐标轴显示时还包括刻度标签的最大字符数（平移、缩放使刻度标签变宽时需要重新留出边距）。
+        """
+        key = (tuple(self.fig.get_size_inches()), self.fig.dpi, getattr(self, 'grid_on', False), self.ax.axison)
+        if self.ax.axison:
+            key += tuple(
+                max((len(label) for label in axis.get_major_formatter().format_ticks(axis.get_majorticklocs())),
+                    default=0)
+                for axis in (self.ax.xaxis, self.ax.yaxis)
+            )
+        return key
+
+    def _update_layout(self):
+        """布局状态变化时才重新 tight_layout；编辑过程中 Axes 位置基本不变，不必每帧测量整张图的文本。"""
+        if self._layout_key_state() == self._layout_key:
+            return
+        self.fig.tight_layout()
+        # 布局改变 Axes 尺寸后刻度可能随之变化，按布局后的状态记录
+        self._layout_key = self._layout_key_state()
+
+    def _layout_state(self) -> Tuple:
+        """缓存的背景有效所需的状态：Axes 位置、视图范围、dpi、画布尺寸与网格/坐标轴开关。"""
+        return (tuple(self.ax.get_position().bounds), tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim()),
+                self.fig.dpi, tuple(self.fig.bbox.size), self.grid_on, self._transparent_background)
+
+    def _capture_blit_background(self):
+        for artist in self._blit_artists():
+            artist.set_animated(True)
+        # 完整绘制（跳过 animated 的 artist），背景在 draw_event 中缓存
+        self.fig.canvas.draw()
+
+    def _on_blit_draw(self, event):
+        canvas = self.fig.canvas
+        self._blit_background = canvas.copy_from_bbox(self.fig.bbox)
+        self._blit_layout = self._layout_state()
+        for artist in self._blit_artists():
+            self.ax.draw_artist(artist)
+
+    def _draw_blit_frame(self, changed: set):
+        """
+        changed 只包含移动中的图元且布局未变时，恢复背景、重绘移动中的 artist 并 blit；
+        否则（其余图元也变化了，或视图、布局变化）重新缓存背景。
+        """
+        if (self._blit_background is None or not changed <= self._blit_keys
+                or self._layout_state() != self._blit_layout):
+            self._capture_blit_background()
+            return
+        canvas = self.fig.canvas
+        canvas.restore_region(self._blit_background)
+        for artist in self._blit_artists():
+            # 样式变化后重新绘制的 artist 也需要标记
+            artist.set_animated(True)
+            self.ax.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+    def invalidate_artists(self):
+        """
+        移除全部已绘制的 artist，下一次 render 时整体重新绘制。
+        rcParams（字体等）等不属于图元状态的设置变化后调用；字体解析结果可能改变，同时清空文本尺寸与 mathtext 解析缓存。
+        """
+        text_metrics_cache.clear()
+        mathtext_cache.clear()
+        self._artists.clear()
+        self._batches.sync()
+        self._drawn_view_key = None
+
+    def get_artist_element_id(self, artist, index: Optional[int] = None) -> Optional[str]:
+        """
+        artist 所属图元的 id，用于拾取与选中；合并绘制的共享 collection 需给出项的序号 index
+        （例如 collection.contains(event) 返回的 ind）。找不到时返回 None。
+        """
+        batch = collection_batch(artist)
+        if batch is not None:
+            member_key = batch.key_at(index) if index is not None else None
+            if member_key is None:
+                return None
+            entry = self._artists.get(*member_key[0])
+            return getattr(entry.element, 'id', None) if entry is not None else None
+        for kind in ('line', 'vertex', 'text'):
+            for entry in self._artists.entries(kind):
+                if any(candidate is artist for candidate in entry.artists):
+                    return getattr(entry.element, 'id', None)
+        return None
+
+    def get_geometry_cache_stats(self) -> Dict[str, Any]:
+        """
+        返回线条几何缓存的统计信息（hits / misses / size / maxsize / hit_rate），
+        用于确认平移、缩放或切换选中时未变化线条的路径是否被复用。
+        """
+        return geometry_cache.stats()
+
+    def get_text_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """返回文本尺寸缓存与 mathtext 解析缓存的统计信息，用于确认重复的标签是否复用了排版结果。"""
+        return {'metrics': text_metrics_cache.stats(), 'mathtext': mathtext_cache.stats()}
+
     def get_extra_text_bboxes(self) -> Dict[str, Tuple[float, float, float, float]]:
         """
         返回当前绘制的「其余文本」在数据坐标系下的边界框，用于命中检测与真实显示范围一致。
@@ -259,13 +622,12 @@ class FeynmanDiagramCanvas:
             renderer = self.fig.canvas.get_renderer()
         except Exception:
             return result
+        to_data = self.ax.transData.inverted()
         for text_id, artist in self._extra_text_artists.items():
             try:
                 if not artist.get_visible():
                     continue
-                bbox_display = artist.get_window_extent(renderer)
-                bbox_data = bbox_display.transformed(self.ax.transData.inverted())
-                result[text_id] = (bbox_data.x0, bbox_data.y0, bbox_data.x1, bbox_data.y1)
+                result[text_id] = text_data_extent(artist, to_data, renderer)
             except Exception:
                 continue
         return result
@@ -280,14 +642,13 @@ class FeynmanDiagramCanvas:
             renderer = self.fig.canvas.get_renderer()
         except Exception:
             return result
+        to_data = self.ax.transData.inverted()
         for prefix, mapping in [("vlabel:", self._vertex_label_artists), ("llabel:", self._line_label_artists)]:
             for elem_id, artist in mapping.items():
                 try:
                     if not artist.get_visible():
                         continue
-                    bbox_display = artist.get_window_extent(renderer)
-                    bbox_data = bbox_display.transformed(self.ax.transData.inverted())
-                    result[prefix + elem_id] = (bbox_data.x0, bbox_data.y0, bbox_data.x1, bbox_data.y1)
+                    result[prefix + elem_id] = text_data_extent(artist, to_data, renderer)
                 except Exception:
                     continue
         return result
@@ -323,12 +684,50 @@ class FeynmanDiagramCanvas:
         # 从 kwargs 中提取 zorder_min 参数，如果不存在则使用默认值 0
         if self._transparent_background:
             kwargs['transparent'] = True
-        with self._temporary_hide_artists(self.ax):
-            # 在这里执行保存操作
-            self.fig.savefig(filename, **kwargs)
+        # 屏幕上的采样点数按屏幕像素比例确定，导出前按导出分辨率重新生成全部线条路径（矢量格式回退到固定点数）；
+        # 折线简化与屏幕显示分别控制：按导出分辨率重新简化（或保留完整点集）。导出后恢复屏幕上的路径
+        simplify = kwargs.pop('simplify', renderer_default_settings['SIMPLIFY_EXPORT'])
+        scale = self._export_pixel_scale(filename, kwargs)
+        lines = [entry.element for entry in self._artists.entries('line')]
+        try:
+            self._regenerate_line_paths(prepare_export_line_geometry(
+                self.ax, lines, None if self._export_is_vector(filename, kwargs) else scale, **self._render_kwargs))
+            resimplify_polylines(self.ax, simplify, scale)
+            with self._temporary_hide_artists(self.ax):
+                # 在这里执行保存操作
+                self.fig.savefig(filename, **kwargs)
+        finally:
+            self._regenerate_line_paths(prepare_line_geometry(self.ax, lines, **self._render_kwargs))
+            resimplify_polylines(self.ax, self._simplify_on_screen)
         # 上下文管理器退出后，所有元素都会自动恢复
         self.fig.canvas.draw()
 
+    def _regenerate_line_paths(self, sample_counts: Dict[int, int]):
+        """按 sample_counts 重新生成已绘制线条的路径并就地更新其 artist（不改变样式与叠放顺序）。"""
+        kwargs = dict(self._render_kwargs, sample_counts=sample_counts)
+        for entry in self._artists.entries('line'):
+            update_line_artists(self.ax, entry.element, entry.artists, **kwargs)
+        self._batches.sync()
+
+    @staticmethod
+    def _export_format(filename, savefig_kwargs: Dict[str, Any]) -> str:
+        fmt = savefig_kwargs.get('format')
+        if fmt is None and isinstance(filename, (str, os.PathLike)):
+            fmt = os.path.splitext(os.fspath(filename))[1].lstrip('.')
+        return (fmt or plt.rcParams['savefig.format']).lower()
+
+    def _export_is_vector(self, filename, savefig_kwargs: Dict[str, Any]) -> bool:
+        return self._export_format(filename, savefig_kwargs) in _VECTOR_FORMATS
+
+    def _export_pixel_scale(self, filename, savefig_kwargs: Dict[str, Any]) -> float:
+        """导出像素与屏幕像素之比：位图按导出 dpi 计算，矢量格式按 72 点/英寸计算。"""
+        if self._export_is_vector(filename, savefig_kwargs):
+            return 72.0 / self.fig.dpi
+        dpi = savefig_kwargs.get('dpi', plt.rcParams['savefig.dpi'])
+        if dpi == 'figure':
+            return 1.0
+        return float(dpi) / self.fig.dpi
+
     def show(self):
         plt.show()
 
@@ -340,7 +739,8 @@ class FeynmanDiagramCanvas:
     def _calculate_content_bounds(self, vertices, lines, texts, use_relative_unit : bool = True):
         """
         纯数据计算边界，不进行预绘制，避免 get_window_extent 返回无效 bbox。
-        收集顶点、顶点标签、线条端点、线条标签（近似中点）、自环路径点、其余文本的位置。
+        收集顶点、顶点标签、线条的解析包围盒（含贝塞尔外凸、波形振幅与自环椭圆）、
+        线条标签（近似中点）、其余文本的位置。
         """
         xs, ys = [], []
         for v in vertices:
@@ -351,29 +751,11 @@ class FeynmanDiagramCanvas:
             ys.append(v.y + float(lo[1]))
         for line in lines:
             if line.v_start and line.v_end:
-                if getattr(line, 'loop', False):
-                    # 自环：使用椭圆路径点纳入边界，否则仅顶点会漏掉环体
-                    try:
-                        from feynplot.core.circle import oval_circle
-                        start_point = (line.v_start.x, line.v_start.y)
-                        path = oval_circle(
-                            start_point,
-                            getattr(line, 'angular_direction', 90.0),
-                            getattr(line, 'a', 1.0),
-                            getattr(line, 'b', 1.0),
-                            points=64
-                        )
-                        xs.extend(path[:, 0].tolist())
-                        ys.extend(path[:, 1].tolist())
-                        # 胶子/光子等自环可能有螺旋外扩，加入振幅
-                        amp = getattr(line, 'amplitude', 0) or getattr(line, 'R', 0)
-                        if amp > 0:
-                            xs.extend([line.v_start.x - amp, line.v_start.x + amp])
-                            ys.extend([line.v_start.y - amp, line.v_start.y + amp])
-                    except Exception:
-                        xs.extend([line.v_start.x, line.v_end.x])
-                        ys.extend([line.v_start.y, line.v_end.y])
-                else:
+                try:
+                    x_lo, y_lo, x_hi, y_hi = line.bounding_box()
+                    xs.extend([x_lo, x_hi])
+                    ys.extend([y_lo, y_hi])
+                except (TypeError, ValueError):
                     xs.extend([line.v_start.x, line.v_end.x])
                     ys.extend([line.v_start.y, line.v_end.y])
                 mid_x = (line.v_start.x + line.v_end.x) / 2
@@ -445,7 +827,7 @@ class FeynmanDiagramCanvas:
         
         # origin='lower' 确保 (0,0) 索引在左下角，符合笛卡尔坐标系
         # interpolation='nearest' 确保格子边缘清晰，没有模糊
-        self.ax.imshow(image, origin='lower', extent=extent, 
+        self._background_image = self.ax.imshow(image, origin='lower', extent=extent,
                     interpolation='nearest', zorder=-100)
 
         # 重新设置坐标轴范围，因为 imshow 可能会轻微改变它
@@ -2,6 +2,31 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.path import Path
 import math
+from functools import lru_cache
+
+import numpy as np
+
+@lru_cache(maxsize=64)
+def fishtail_template(arrow_angle: float, tail_angle: float, offset_ratio: float) -> np.ndarray:
+    """
+    返回沿 +x 方向、主轴长度为 1、尖端在原点的鱼尾箭头顶点 (5, 2)（角度为弧度，offset_ratio 为百分比）。
+    按 (arrow_angle, tail_angle, offset_ratio) 缓存，绘制时只需旋转、缩放并平移。
+    """
+    third_angle = tail_angle - arrow_angle
+    # 两个角度相等时鱼尾边平行于主轴，长度为无穷大（与原先一样得到不绘制的退化路径，而不是抛出异常）
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tail_length = np.sin(arrow_angle) / np.sin(third_angle)
+    verts = np.array([
+        (0.0, 0.0),
+        (tail_length * math.cos(math.pi - tail_angle), tail_length * math.sin(math.pi - tail_angle)),
+        (1.0, 0.0),
+        (tail_length * math.cos(tail_angle - math.pi), tail_length * math.sin(tail_angle - math.pi)),
+        (0.0, 0.0),
+    ])
+    verts[:, 0] += offset_ratio / 100
+    verts.setflags(write=False)
+    return verts
+
 
 class FishtailArrow(mpatches.ArrowStyle._Base):
     """
@@ -11,6 +36,8 @@ class FishtailArrow(mpatches.ArrowStyle._Base):
     - arrow_angle: 箭头尖端的一半角度 (弧度或度数)。
     - tail_angle: 鱼尾部分的一半角度 (弧度或度数)。
     """
+    _CODES = [Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY]
+
     def __init__(self, arrow_angle=20, tail_angle=60, offset_ratio : float = 0, use_degrees=True, **kwargs):
         # print(f"初始化 FishtailArrow: arrow_angle={arrow_angle}, tail_angle={tail_angle}, offset_ratio={offset_ratio}")
         super().__init__()
@@ -22,41 +49,34 @@ class FishtailArrow(mpatches.ArrowStyle._Base):
             self.tail_angle = float(tail_angle)
         
         self.offset_ratio = float(offset_ratio)
+        self.third_angle = self.tail_angle - self.arrow_angle
+        if abs(math.sin(self.third_angle)) < 1e-12:
+            # 尾部两边与主轴平行，尾部顶点在无穷远处，无法构成箭头
+            raise ValueError(
+                "FishtailArrow: arrow_angle ({}) and tail_angle ({}) must differ "
+                "(and not by a multiple of 180 degrees).".format(arrow_angle, tail_angle)
+            )
 
     def transmute(self, path, mutation_size=1, offset_ratio=0):
         x0, y0 = path.vertices[-1]  # 箭头起点 (xytext)
         x1, y1 = path.vertices[0]   # 箭头终点 (xy)
-        offset_ratio = self.offset_ratio
 
-        dx, dy = x1 - x0, y1 - y0
-        standard_length = 1
-        
-        standard_length *= mutation_size / 10
-        offset_ratio /= 100
-        self.axis_length = standard_length
-        # if axis_length == 0:
-        #     return Path([(x1, y1), (x1, y1)], [Path.MOVETO, Path.LINETO]), True
-
-        angle = math.atan2(dy, dx)
-        self.third_angle = self.tail_angle - self.arrow_angle
-        tail_length = math.sin(self.arrow_angle) * self.axis_length / math.sin(self.third_angle)
+        # 主轴长度随 mutation_size 缩放；单位模板旋转到 起点->终点 方向后平移到起点
+        standard_length = mutation_size / 10
+        angle = math.atan2(y1 - y0, x1 - x0)
+        c, s = standard_length * math.cos(angle), standard_length * math.sin(angle)
+        template = fishtail_template(self.arrow_angle, self.tail_angle, self.offset_ratio)
+        with np.errstate(invalid='ignore'):
+            verts = template @ np.array([[c, s], [-s, c]]) + (x0, y0)
+        return Path(verts, self._CODES), True
 
-        verts = [
-            (0, 0),
-            (tail_length * math.cos(math.pi - self.tail_angle + angle), tail_length * math.sin(math.pi - self.tail_angle + angle)),
-            (standard_length * math.cos(angle), standard_length * math.sin(angle)),
-            (tail_length * math.cos(angle - math.pi + self.tail_angle), tail_length * math.sin(angle - math.pi + self.tail_angle)),
-            (0, 0),
-        ]
 
-        main_axis = (standard_length * math.cos(angle), standard_length * math.sin(angle))
-        final_verts = []
-        
-        for x, y in verts:
-            final_verts.append((x + x0 + offset_ratio * main_axis[0], y + y0 + offset_ratio * main_axis[1]))
-
-        codes = [Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY]
-        return Path(final_verts, codes), True
+def fishtail_arrow(arrow_angle=20, tail_angle=60, offset_ratio: float = 0) -> FishtailArrow:
+    """
+    按角度（度数）与偏移比例创建 FishtailArrow。每次返回新的样式对象，调用方可以自行修改；
+    箭头路径的模板由 fishtail_template 按参数缓存，设置相同的箭头仍共用同一份顶点。
+    """
+    return FishtailArrow(arrow_angle=arrow_angle, tail_angle=tail_angle, offset_ratio=offset_ratio)
 
 # 注册你的自定义箭头样式
 mpatches.ArrowStyle.register("fishtail", FishtailArrow)
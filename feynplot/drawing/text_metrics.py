@@ -0,0 +1,110 @@
+from typing import Tuple
+
+from matplotlib import rcParams
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+from feynplot.core.geometry_cache import GeometryCache
+from feynplot.default_settings.default_settings import renderer_default_settings
+
+# 文本尺寸缓存：键为渲染后的字符串、字体属性、字号（磅）与 dpi 等，值为相对锚点的显示坐标范围。
+# 字体族等通过 rcParams 解析，rcParams 字体设置变化后需要 clear()（见 FeynmanDiagramCanvas.invalidate_artists）
+text_metrics_cache = GeometryCache(renderer_default_settings['TEXT_METRICS_CACHE_SIZE'])
+# mathtext 解析缓存，供 CachedMathTextParser 使用；同样需要在 rcParams 字体设置变化后 clear()
+mathtext_cache = GeometryCache(renderer_default_settings['MATHTEXT_CACHE_SIZE'])
+
+
+def text_metrics_key(text: Text, dpi: float) -> Tuple:
+    """决定文本排版尺寸的全部输入；与位置、颜色、可见性无关。"""
+    prop = text.get_fontproperties()
+    return (
+        text.get_text(),
+        tuple(prop.get_family()), prop.get_style(), prop.get_variant(), prop.get_weight(), prop.get_stretch(),
+        prop.get_file(), prop.get_math_fontfamily(), float(prop.get_size_in_points()), float(dpi),
+        float(text.get_rotation()), text.get_rotation_mode(),
+        text.get_horizontalalignment(), text.get_verticalalignment(), getattr(text, '_multialignment', None),
+        text.get_linespacing(), text.get_usetex(), text.get_parse_math(),
+    )
+
+
+def _measure(text: Text, renderer) -> Tuple[float, float, float, float]:
+    """一次完整的文本排版（含 mathtext 解析），得到相对锚点的 (x0, y0, x1, y1)。"""
+    if text.get_text() == '':
+        return (0.0, 0.0, 0.0, 0.0)
+    get_layout = getattr(text, '_get_layout', None)
+    if get_layout is not None:
+        # 不经过 get_window_extent：隐藏的文本在那里只返回单位框
+        bbox, _, _ = get_layout(renderer)
+        return (bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+    # 没有私有的 _get_layout 时退回公开接口：临时显示隐藏的文本，再减去锚点位置
+    visible, stale = text.get_visible(), text.stale
+    text.set_visible(True)
+    try:
+        bbox = text.get_window_extent(renderer)
+    finally:
+        text.set_visible(visible)
+        text.stale = stale
+    x, y = text.get_transform().transform(text.get_unitless_position())
+    return (bbox.x0 - x, bbox.y0 - y, bbox.x1 - x, bbox.y1 - y)
+
+
+def text_window_extent(text: Text, renderer=None) -> Bbox:
+    """
+    文本在显示坐标系下的边界框，等同于 get_window_extent()（忽略可见性）。
+    同一键只排版一次，之后只需把缓存的范围平移到当前锚点。
+    """
+    fig = text.figure
+    if renderer is None:
+        renderer = fig.canvas.get_renderer()
+    offsets = text_metrics_cache.get_or_compute(
+        text_metrics_key(text, fig.dpi), lambda: _measure(text, renderer))
+    x, y = text.get_transform().transform(text.get_unitless_position())
+    x0, y0, x1, y1 = offsets
+    return Bbox.from_extents(x + x0, y + y0, x + x1, y + y1)
+
+
+def text_data_extent(text: Text, inverse_transform, renderer=None) -> Tuple[float, float, float, float]:
+    """文本边界框经 inverse_transform（通常为 ax.transData.inverted()）换算后的 (x0, y0, x1, y1)。"""
+    bbox = text_window_extent(text, renderer).transformed(inverse_transform)
+    return (bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+
+
+class CachedMathTextParser:
+    """
+    包装渲染器的 mathtext 解析器，解析结果保存在 feynplot 自己的 mathtext_cache 中。
+    Matplotlib 自带的解析缓存只有 50 条，标签数超过 50 时每帧都被挤空，每个标签的排版与绘制都要重新解析；
+    这里按 (渲染器类型, 字符串, dpi, 字体属性, 抗锯齿与 hinting 设置) 缓存，在各帧、各图元之间复用。
+    只替换 feynplot 画布所用渲染器的 mathtext_parser（见 use_mathtext_cache），不影响进程中的其他图。
+    """
+
+    def __init__(self, parser, renderer_type: type):
+        self._parser = parser
+        self._renderer_type = renderer_type
+
+    def parse(self, s, dpi=72, prop=None, *, antialiased=None):
+        # 字体属性是可变对象，与 Matplotlib 一样用副本组成缓存键
+        prop = prop.copy() if prop is not None else None
+        if antialiased is None:
+            antialiased = rcParams['text.antialiased']
+        key = (self._renderer_type, s, dpi, prop, antialiased,
+               rcParams['text.hinting'], rcParams['text.hinting_factor'])
+        return mathtext_cache.get_or_compute(
+            key, lambda: self._parser.parse(s, dpi, prop, antialiased=antialiased))
+
+    def __getattr__(self, name):
+        return getattr(self._parser, name)
+
+
+def use_mathtext_cache(canvas):
+    """
+    让 canvas 当前的渲染器通过 mathtext_cache 解析 mathtext。
+    Agg 画布在尺寸或 dpi 变化时会重建渲染器，因此每次 render 前调用；没有 get_renderer 的画布保持原样。
+    """
+    get_renderer = getattr(canvas, 'get_renderer', None)
+    if get_renderer is None:
+        return
+    renderer = get_renderer()
+    parser = getattr(renderer, 'mathtext_parser', None)
+    if parser is None or isinstance(parser, CachedMathTextParser):
+        return
+    renderer.mathtext_parser = CachedMathTextParser(parser, type(renderer))
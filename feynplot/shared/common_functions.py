@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 # from sympy import im
 from feynplot_gui.debug_utils import cout
@@ -16,12 +17,21 @@ def str2latex(label: str) -> str:
     Returns:
         str: 转换为 LaTeX 格式的标签字符串。
     """
-    cout("Calling str2latex()")
-    cout("label:", label)
     if not isinstance(label, str):
         # 如果不是字符串，直接返回其字符串表示，或者抛出错误，取决于你的需求
         # 这里为了兼容性，直接返回字符串形式
         label = str(label)
+    return _str2latex(label)
+
+
+@lru_cache(maxsize=1024)
+def _str2latex(label: str) -> str:
+    """
+    str2latex 的实际转换。结果只取决于字符串本身，按字符串缓存：
+    同一标签在各帧、各图元之间只做一次正则匹配（调试输出也只在首次转换时打印）。
+    """
+    cout("Calling str2latex()")
+    cout("label:", label)
 
     stripped_label = label.strip()
 
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from feynplot.core.base_path import BasePath
+from feynplot.core.bezier import (
+    bezier_arc_length_at, bezier_bbox, bezier_circle_intersection, bezier_eval,
+)
+
+CURVES = [
+    np.array([(0.0, 0.0), (1.0, 2.0), (3.0, -1.0), (4.0, 1.0)]),  # S 形
+    np.array([(0.0, 0.0), (2.0, 3.0), (-1.0, 3.0), (1.0, 0.0)]),  # 回折
+    np.array([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (3.0, 0.0)]),   # 直线
+]
+
+
+def _dense_polyline(P, n=200001):
+    t = np.linspace(0.0, 1.0, n)
+    return t, bezier_eval(P, t)
+
+
+@pytest.mark.parametrize("P", CURVES)
+def test_arc_length_matches_dense_polyline(P):
+    t, points = _dense_polyline(P)
+    cum = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    queries = np.array([0.0, 0.1, 0.37, 0.5, 0.82, 1.0])
+    expected = np.interp(queries, t, cum)
+    np.testing.assert_allclose(bezier_arc_length_at(P, queries), expected, rtol=1e-6, atol=1e-9)
+
+
+@pytest.mark.parametrize("P", CURVES)
+@pytest.mark.parametrize("radius", [0.3, 0.8])
+def test_circle_intersection_matches_scan(P, radius):
+    t, points = _dense_polyline(P)
+    for center, from_end in ((P[0], False), (P[3], True)):
+        distance = np.linalg.norm(points - center, axis=1)
+        crossings = np.flatnonzero(np.diff(np.sign(distance - radius)) != 0)
+        expected = t[crossings[-1] if from_end else crossings[0]]
+        result = bezier_circle_intersection(P, center, radius, from_end=from_end)
+        assert result == pytest.approx(expected, abs=1e-4)
+        assert np.linalg.norm(bezier_eval(P, [result])[0] - center) == pytest.approx(radius, abs=1e-9)
+
+
+def test_circle_intersection_without_crossing():
+    assert bezier_circle_intersection(CURVES[0], (0.0, 0.0), 100.0) is None
+
+
+@pytest.mark.parametrize("P", CURVES)
+def test_bbox_contains_dense_samples(P):
+    _, points = _dense_polyline(P, 20001)
+    xmin, ymin, xmax, ymax = bezier_bbox(P)
+    np.testing.assert_allclose((xmin, ymin), points.min(axis=0), atol=1e-6)
+    np.testing.assert_allclose((xmax, ymax), points.max(axis=0), atol=1e-6)
+
+
+def test_polyline_circle_intersection():
+    t = np.linspace(0.0, np.pi, 500)
+    path = BasePath(np.column_stack((3 * np.cos(t), 3 * np.sin(t))))
+    for center, from_end in ((path[0], False), (path[-1], True)):
+        pos, point = path.circle_intersection(center, 1.0, from_end=from_end)
+        assert np.linalg.norm(point - center) == pytest.approx(1.0)
+        # 小数索引与交点一致：按索引插值得到同一个点
+        np.testing.assert_allclose(path.between(pos, pos).points[0], point, atol=1e-12)
+    assert path.circle_intersection(path[0], 100.0) is None
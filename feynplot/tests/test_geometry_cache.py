@@ -0,0 +1,77 @@
+import contextlib
+import io
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from feynplot.core.geometry_cache import GeometryCache, geometry_cache
+from feynplot.core.line import FermionLine, GluonLine, PhotonLine, WPlusLine
+from feynplot.core.vertex import Vertex
+from feynplot.drawing.renderer import FeynmanDiagramCanvas
+
+
+def test_lru_eviction_and_stats():
+    cache = GeometryCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1     # a 变为最近使用
+    cache.put('c', 3)              # 挤出 b
+    assert 'b' not in cache and 'a' in cache and len(cache) == 2
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 2)
+    cache.reset_stats()
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+
+
+def test_get_or_compute_computes_once():
+    cache = GeometryCache(4)
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute('k', lambda: calls.append(1) or np.arange(3))
+    assert len(calls) == 1
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 1)
+    # 缓存的数组为只读
+    with pytest.raises(ValueError):
+        cache.get('k')[0] = 5
+
+
+def _diagram():
+    rng = np.random.default_rng(0)
+    vertices = [Vertex(float(x), float(y)) for x, y in rng.uniform(0, 10, (12, 2))]
+    kinds = [GluonLine, PhotonLine, FermionLine, WPlusLine]
+    lines = [kinds[i % 4](vertices[i % 12], vertices[(i * 5 + 3) % 12]) for i in range(16)]
+    return vertices, lines
+
+
+def test_cache_counts_across_renders():
+    vertices, lines = _diagram()
+    fig, ax = plt.subplots()
+    with contextlib.redirect_stdout(io.StringIO()):
+        canvas = FeynmanDiagramCanvas(fig, ax)
+        geometry_cache.clear()
+        geometry_cache.reset_stats()
+        canvas.render(vertices, lines, [], auto_scale=True)
+        cold = geometry_cache.stats()
+        # auto_scale 之后的第一轮布局可能改变视图与采样点数，先渲染一次使视图稳定
+        canvas.render(vertices, lines, [])
+        geometry_cache.reset_stats()
+        canvas.render(vertices, lines, [])
+        idle = geometry_cache.stats()
+        # 丢弃全部 artist 后重新绘制：几何未变化，逐条复用线条自己的结果
+        canvas.invalidate_artists()
+        geometry_cache.reset_stats()
+        canvas.render(vertices, lines, [])
+        warm = geometry_cache.stats()
+    plt.close(fig)
+    # 首次渲染：每条线的几何都要生成一次（预取计为未命中）
+    assert cold['misses'] == len(lines)
+    assert cold['memo_hits'] == 0
+    # 没有变化的图元保留原来的 artist，不需要几何
+    assert idle['hits'] == idle['misses'] == idle['memo_hits'] == 0
+    # 几何未变化：直接复用线条自己的结果，不再查找缓存
+    assert warm['hits'] == warm['misses'] == 0
+    assert warm['memo_hits'] == len(lines) and warm['memo_misses'] == 0
@@ -0,0 +1,90 @@
+import contextlib
+import io
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from feynplot.core.extra_text_element import TextElement
+from feynplot.core.line import FermionLine, GluonLine, PhotonLine, WPlusLine
+from feynplot.core.vertex import Vertex
+from feynplot.drawing.renderer import FeynmanDiagramCanvas
+from feynplot.drawing.styles.arrow_styles import fishtail_arrow
+from feynplot.drawing.text_metrics import text_window_extent
+
+
+def _diagram():
+    vertices = [Vertex(0.0, 0.0, label='a'), Vertex(3.0, 1.0, label='b'),
+                Vertex(5.0, -1.0), Vertex(1.5, 3.0, label='c')]
+    lines = [
+        FermionLine(vertices[0], vertices[1], label='e'),
+        GluonLine(vertices[1], vertices[2], label='g'),
+        PhotonLine(vertices[0], vertices[3]),
+        WPlusLine(vertices[3], vertices[2]),
+    ]
+    texts = [TextElement(x=2.0, y=-1.5, text='$x$')]
+    return vertices, lines, texts
+
+
+def _image(canvas):
+    canvas.fig.canvas.draw()
+    return np.asarray(canvas.fig.canvas.buffer_rgba()).copy()
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_retained_render_matches_full_render(batch):
+    vertices, lines, texts = _diagram()
+    fig, ax = plt.subplots(figsize=(6, 4))
+    with contextlib.redirect_stdout(io.StringIO()):
+        canvas = FeynmanDiagramCanvas(fig, ax)
+        canvas.render(vertices, lines, texts, auto_scale=True, batch_artists=batch)
+        canvas.render(vertices, lines, texts, batch_artists=batch)
+        # 移动顶点、选中线条、删除线条后增量渲染
+        vertices[1].x += 0.4
+        lines[0].is_selected = True
+        del lines[-1]
+        canvas.render(vertices, lines, texts, batch_artists=batch)
+        retained = _image(canvas)
+        canvas.invalidate_artists()
+        canvas.render(vertices, lines, texts, batch_artists=batch)
+        full = _image(canvas)
+    plt.close(fig)
+    np.testing.assert_array_equal(retained, full)
+
+
+def test_unchanged_render_keeps_artists():
+    vertices, lines, texts = _diagram()
+    fig, ax = plt.subplots(figsize=(6, 4))
+    with contextlib.redirect_stdout(io.StringIO()):
+        canvas = FeynmanDiagramCanvas(fig, ax)
+        canvas.render(vertices, lines, texts, auto_scale=True)
+        canvas.render(vertices, lines, texts)
+        before = list(ax.get_children())
+        canvas.render(vertices, lines, texts)
+        after = list(ax.get_children())
+    plt.close(fig)
+    assert len(before) == len(after)
+    assert all(a is b for a, b in zip(before, after))
+
+
+def test_fishtail_arrow_returns_fresh_style():
+    assert fishtail_arrow(20, 60) is not fishtail_arrow(20, 60)
+
+
+@pytest.mark.parametrize("angles", [(30, 30), (20, 200)])
+def test_fishtail_arrow_rejects_parallel_tail(angles):
+    with pytest.raises(ValueError):
+        fishtail_arrow(*angles)
+
+
+@pytest.mark.parametrize("label", ['$e^+e^-$', 'plain', '$\\gamma$\nline 2'])
+def test_text_metrics_match_matplotlib(label):
+    fig, ax = plt.subplots()
+    text = ax.text(0.3, 0.6, label, rotation=25)
+    renderer = fig.canvas.get_renderer()
+    expected = text.get_window_extent(renderer)
+    for _ in range(2):  # 第二次来自缓存
+        np.testing.assert_allclose(text_window_extent(text, renderer).extents, expected.extents, atol=1e-9)
+    plt.close(fig)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from feynplot.core.simplify import _segment_distances, rdp_mask, simplify_polyline
+
+
+def _wave(n=5000):
+    x = np.linspace(0.0, 20.0, n)
+    return np.column_stack((x, np.sin(x) + 0.1 * np.sin(7 * x)))
+
+
+@pytest.mark.parametrize("tolerance", [1e-4, 1e-2, 0.3])
+def test_rdp_mask_keeps_endpoints(tolerance):
+    keep = rdp_mask(_wave(), tolerance)
+    assert keep[0] and keep[-1]
+    assert keep.sum() < len(keep)
+
+
+@pytest.mark.parametrize("tolerance", [1e-3, 5e-2])
+def test_rdp_mask_within_tolerance(tolerance):
+    points = _wave()
+    kept = np.flatnonzero(rdp_mask(points, tolerance))
+    # 被删除的点到其所在保留区间弦的距离不超过容差
+    for a, b in zip(kept[:-1], kept[1:]):
+        if b - a > 1:
+            inner = points[a + 1:b]
+            distances = _segment_distances(inner, np.broadcast_to(points[a], inner.shape),
+                                           np.broadcast_to(points[b], inner.shape))
+            assert distances.max() <= tolerance + 1e-12
+
+
+def test_rdp_mask_degenerate_inputs():
+    assert rdp_mask(np.empty((0, 2)), 0.1).size == 0
+    assert rdp_mask(np.zeros((2, 2)), 0.1).all()
+    assert rdp_mask(_wave(10), 0).all()
+
+
+def test_simplify_polyline_straight_line():
+    points = np.column_stack((np.linspace(0, 1, 1000), np.linspace(0, 2, 1000)))
+    simplified = simplify_polyline(points, 1e-6)
+    np.testing.assert_array_equal(simplified[[0, -1]], points[[0, -1]])
+    assert len(simplified) < 50
@@ -56,6 +56,7 @@ class CanvasController(QObject):
         self.canvas_widget.canvas_panned.connect(self._handle_canvas_panned_start)
         self.canvas_widget.canvas_zoomed.connect(self._handle_canvas_zoomed) # <-- This is where the zoom signal is connected
         self.canvas_widget.mouse_released.connect(self._handle_mouse_released) # <-- This is where the zoom signal is connected
+        self.canvas_widget.drag_started.connect(self._handle_drag_started)
         self.main_controller.toolbox_controller.toggle_grid_visibility_requested.connect(self.toggle_grid_visibility) # Example if MainController forwards it
         self.main_controller.navigation_bar_controller.navigation_bar_widget.toggle_gride_points_mode.connect(self._handle_gride_points_mode_toggled) 
 
@@ -146,7 +147,9 @@ class CanvasController(QObject):
             # 确保 MatplotlibBackend.render 完成后，text controller 拿到的是最新的 ax
             # self.main_controller.other_texts_controller.draw_texts_on_canvas(self._canvaps_instance.ax) 
             # self.get_ax().grid(True)
-            self.canvas_widget.draw_idle_canvas()
+            # 拖动中的 blit 模式由 render 自行 blit，不再排队整体重绘
+            if not self._canvas_instance.is_blitting:
+                self.canvas_widget.draw_idle_canvas()
             if not skip_navigation_bar:
                 self.main_controller._update_canvas_range_on_navigation_bar()
         except Exception as e:
@@ -256,8 +259,7 @@ class CanvasController(QObject):
             line = self._get_item_by_id(self.diagram_model.lines, line_id)
             pts = getattr(line, 'plot_points', None) if line is not None else None
             if line is not None and pts is not None and len(pts) > 0:
-                mid_idx = len(pts) // 2
-                mid = pts[mid_idx]
+                mid = line.get_label_anchor()
                 line.label_offset = np.array([new_pos.x() - mid[0], new_pos.y() - mid[1]])
             self.main_controller.update_canvas_only(canvas_options={
                 'target_xlim': self.get_ax().get_xlim(), 'target_ylim': self.get_ax().get_ylim()
@@ -505,10 +507,35 @@ class CanvasController(QObject):
         self.main_controller.update_all_views(canvas_options={'target_xlim': new_xlim, 'target_ylim': new_ylim})
     
 
+    def _handle_drag_started(self, item_id: str):
+        """
+        对象拖动开始：被拖动的顶点连同相连的线条（及它们的标签）、被拖动的文本或标签所属的图元
+        进入 blit 模式，拖动期间只重绘这些图元，其余内容使用缓存的背景。
+        """
+        vertices, lines, texts = [], [], []
+        if item_id.startswith("vlabel:"):
+            vertices = [v for v in self.diagram_model.vertices if v.id == item_id[len("vlabel:"):]]
+        elif item_id.startswith("llabel:"):
+            lines = [l for l in self.diagram_model.lines if l.id == item_id[len("llabel:"):]]
+        elif any(v.id == item_id for v in self.diagram_model.vertices):
+            vertices = [v for v in self.diagram_model.vertices if v.id == item_id]
+            lines = [l for l in self.diagram_model.lines
+                     if (l.v_start and l.v_start.id == item_id) or (l.v_end and l.v_end.id == item_id)]
+        else:
+            texts = [t for t in self.diagram_model.texts if t.id == item_id]
+        if vertices or lines or texts:
+            self._canvas_instance.begin_blit(vertices=vertices, lines=lines, texts=texts)
+
     def _handle_mouse_released(self):
         """
         处理鼠标释放信号。结束平移/拖动后统一刷新顶点列表与其余文本列表，使坐标显示与模型一致。
         """
+        if self._canvas_instance.is_blitting:
+            # 结束 blit 模式，按正常流程完整绘制一次（恢复布局与叠放顺序）
+            self._canvas_instance.end_blit(redraw=False)
+            self.main_controller.update_canvas_only(canvas_options={
+                'target_xlim': self.get_ax().get_xlim(), 'target_ylim': self.get_ax().get_ylim()
+            })
         self.main_controller.vertex_controller.update_vertex_list()
         self.main_controller.other_texts_controller.update_text_list()
         self.main_controller.picture_model()
@@ -579,50 +606,15 @@ class CanvasController(QObject):
             if not hasattr(line, 'plot_points') or len(line.plot_points) == 0 or len(line.plot_points) < 2:
                 continue # 跳过没有有效绘制路径的线条
 
-            num_plot_points = len(line.plot_points)
-            shorted_points_number = CANVAS_CONTROLLER_DEFAULTS['NUMBER_OF_COMPARISON_POINTS']
-            if num_plot_points <= shorted_points_number:
-                indices_to_check = range(num_plot_points - 1)
-            else:
-                step = max(1, (num_plot_points - 1) // shorted_points_number) 
-                indices_to_check = range(0, num_plot_points - 1, step)
-                indices_to_check = indices_to_check[1:-1] 
-            # --- 优化结束 ---
-
-            # 现在，遍历由 plot_points 定义的各个线段
-            for i in indices_to_check:
-                # 确保 i+1 不超出范围
-                if i + 1 >= num_plot_points:
-                    continue 
-                    
-                p1_coords = np.array(line.plot_points[i])
-                p2_coords = np.array(line.plot_points[i+1])
-
-                line_vec = p2_coords - p1_coords
-                mouse_vec = np.array([x, y]) - p1_coords
-
-                line_len_sq = np.dot(line_vec, line_vec)
-
-                # 如果线段是一个点（p1 == p2），跳过它
-                if line_len_sq == 0:
-                    continue
-
-                # 将鼠标点投影到线段上
-                t = np.dot(mouse_vec, line_vec) / line_len_sq
-                t = max(0, min(1, t)) # 将 t 钳制在 [0, 1] 之间，确保投影在线段上
+            # 到绘制路径的最短距离：折线按线段投影一次性计算，贝塞尔路径按控制点解析求解
+            dist_to_line_sq = line.distance_to(x, y) ** 2
 
-                # 找到线段上离鼠标点击最近的点
-                closest_point = p1_coords + t * line_vec
-
-                # 计算鼠标点击到这个最近点的距离平方
-                dist_to_line_sq = (x - closest_point[0])**2 + (y - closest_point[1])**2
-                
-                # 如果距离小于当前最小距离，且在容忍范围内，则更新最近对象
-                hit_tolerance_line_sq = hit_tolerance_vertex_sq # 线条点击容差
-                if dist_to_line_sq < min_dist_sq and dist_to_line_sq < hit_tolerance_line_sq:
-                    min_dist_sq = dist_to_line_sq
-                    closest_id = line.id
-                    closest_type = "line"
+            # 如果距离小于当前最小距离，且在容忍范围内，则更新最近对象
+            hit_tolerance_line_sq = hit_tolerance_vertex_sq # 线条点击容差
+            if dist_to_line_sq < min_dist_sq and dist_to_line_sq < hit_tolerance_line_sq:
+                min_dist_sq = dist_to_line_sq
+                closest_id = line.id
+                closest_type = "line"
 
         # --- 其余文本：仅当未命中顶点/线条时，用渲染器提供的真实边界框检测（与显示一致）---
         if closest_id is None:
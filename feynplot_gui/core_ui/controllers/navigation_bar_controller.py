@@ -327,6 +327,11 @@ class NavigationBarController(QObject):
                     fig = self.main_controller.canvas_controller.canvas_widget.get_figure()
                     fig.set_size_inches(float(figsize[0]), float(figsize[1]))
 
+            # 渲染器保留已绘制的 artist，字体等 rcParams 变化后需要整体重新绘制
+            canvas = getattr(self.main_controller.canvas_controller, '_canvas_instance', None)
+            if canvas is not None:
+                canvas.invalidate_artists()
+
             if hasattr(self.main_controller, 'update_all_views'):
                 self.main_controller.update_all_views()
                 self.status_message.emit("已通知主控制器更新所有视图以反映新设置。")
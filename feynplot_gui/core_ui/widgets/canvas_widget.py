@@ -26,6 +26,7 @@ class CanvasWidget(QWidget):
     object_edited = Signal(str, str)
     object_deleted = Signal(str, str)
     mouse_released = Signal()
+    drag_started = Signal(str) # 对象拖动超过阈值、开始移动时发出，传递被拖动对象的 ID
     
     add_line_from_vertex_requested = Signal(str) # 传递起始顶点的ID
     # 画布右键菜单触发的通用操作（由 MainController 连接到对应逻辑）
@@ -278,6 +279,9 @@ class CanvasWidget(QWidget):
         if self._mouse_press_pixel_pos and current_mouse_pixel_pos:
             pixel_distance = QLineF(self._mouse_press_pixel_pos, current_mouse_pixel_pos).length()
             if pixel_distance > self.DRAG_THRESHOLD_PIXELS:
+                if not self._is_drag_event and self._is_dragging_object and self._dragged_object_id:
+                    # 拖动开始：通知控制器进入 blit 模式，只重绘移动中的对象
+                    self.drag_started.emit(self._dragged_object_id)
                 self._is_drag_event = True # 标记为拖动事件
 
         current_time = QTime.currentTime().msecsSinceStartOfDay()